@@ -5,22 +5,125 @@ google-genai SDK 사용
 import time
 import logging
 import json
+import hashlib
+import sqlite3
 import textwrap
-from typing import Dict, Any
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
 from google import genai
 from google.genai import types
 from lib.config import Config
+from lib.prompts import get_response_schema
+from lib.rate_limiter import AdaptiveRateLimiter
 
 logger = logging.getLogger(__name__)
 
+DAY = 24 * 3600
+
+# 프롬프트 종류별 캐시 유효 기간 (query_json의 cache_type, 여기 없는 종류는 캐시하지 않음)
+PROMPT_CACHE_TTL = {
+    'artist_songs': 30 * DAY,        # 대표곡
+    'artist_basic_info': 30 * DAY,   # 아티스트 기본 정보
+    'label': 14 * DAY,               # 레이블
+    'concert_genre': 30 * DAY,       # 콘서트 장르
+    'genre_filter': 30 * DAY,        # 제외 장르 판단
+    'korean_name': 90 * DAY,         # "영문 (한국어)" 이름 변환
+    'concert_enrichment': 14 * DAY,  # 통합 보강 (아티스트/소개/레이블/장르/제외 여부)
+}
+# 빈 응답({}/[])은 일시적 실패일 수 있으므로 짧게 보관
+NEGATIVE_CACHE_TTL = 1 * DAY
+
+
+_shared_rate_limiter = None
+_shared_rate_limiter_lock = threading.Lock()
+
+
+def get_gemini_rate_limiter() -> AdaptiveRateLimiter:
+    """프로세스 전체에서 공유하는 Gemini rate limiter (GEMINI_RPM / GEMINI_TPM 기준)"""
+    global _shared_rate_limiter
+    with _shared_rate_limiter_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = AdaptiveRateLimiter(rpm=Config.GEMINI_RPM, tpm=Config.GEMINI_TPM)
+        return _shared_rate_limiter
+
+
+class GeminiResponseCache:
+    """(프롬프트 해시, 모델, 검색 사용 여부) → query_json 결과를 저장하는 SQLite 캐시"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS gemini_responses (
+                key TEXT PRIMARY KEY,
+                prompt_type TEXT NOT NULL,
+                model TEXT NOT NULL,
+                use_search INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                is_empty INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str, model: str, use_search: bool) -> str:
+        raw = f"{model}\n{int(use_search)}\n{prompt}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, prompt_type: str) -> Tuple[bool, Any]:
+        """(적중 여부, 저장된 결과) 반환 - 빈 결과도 적중으로 취급 (negative caching)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data, is_empty, created_at FROM gemini_responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row:
+                ttl = NEGATIVE_CACHE_TTL if row[1] else PROMPT_CACHE_TTL.get(prompt_type, 0)
+                if time.time() - row[2] < ttl:
+                    self.hits += 1
+                    return True, json.loads(row[0])
+
+            self.misses += 1
+            return False, None
+
+    def set(self, key: str, prompt_type: str, model: str, use_search: bool, data: Any):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO gemini_responses "
+                "(key, prompt_type, model, use_search, data, is_empty, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, prompt_type, model, int(use_search), json.dumps(data, ensure_ascii=False),
+                 int(not data), time.time())
+            )
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
+
 
 class GeminiAPI:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, use_cache: bool = None, rate_limiter: AdaptiveRateLimiter = None):
         """Gemini API 클라이언트 초기화"""
         self.api_key = api_key
         self.client = genai.Client(api_key=api_key)
         self.model = 'gemini-2.5-flash' # Gemini 모델 이름
         self._search_logged = False # Google Search grounding 활성화 로그를 한 번만 출력
+        self.rate_limiter = rate_limiter or get_gemini_rate_limiter() # 호출 간격은 여기서만 조절
+
+        # query_json 응답 캐시 (cache_type을 지정한 호출만 사용)
+        if use_cache is None:
+            use_cache = Config.GEMINI_CACHE_ENABLED
+        self.response_cache = GeminiResponseCache(Config.CACHE_DIR / "gemini_responses.sqlite3") if use_cache else None
+        # 호출 스레드별 상태 (디스코드 봇은 asyncio.to_thread로 여러 스레드에서 동시에 호출)
+        self._local = threading.local()
 
         self.generation_config = types.GenerateContentConfig(
             temperature=0.3, # 모험적인 정도
@@ -40,6 +143,13 @@ class GeminiAPI:
         """
         Google Search grounding을 활용한 실시간 웹 검색 쿼리
         """
+        enhanced_prompt = self._with_system_prompt(prompt, search_focus)
+        response = self._generate(enhanced_prompt, self._build_config(search_focus))
+        return response.text if response is not None else ""
+
+    @staticmethod
+    def _with_system_prompt(prompt: str, search_focus: bool) -> str:
+        """검색 사용 여부에 맞는 시스템 지침을 요청 앞에 붙임"""
         if search_focus: # Google Search grounding = True 일 경우
             system_prompt = textwrap.dedent("""\
                 당신은 내한 공연 정보 검색 전문가입니다.
@@ -56,9 +166,10 @@ class GeminiAPI:
                 지식 기반으로 정확한 답변을 제공하세요.
                 한국어로 응답하세요.""")
 
-        enhanced_prompt = f"{system_prompt}\n\n요청사항: {prompt}"
+        return f"{system_prompt}\n\n요청사항: {prompt}"
 
-        # config는 재시도마다 바뀌지 않으므로 루프 밖에서 한 번만 생성
+    def _build_config(self, search_focus: bool, response_schema: Optional[dict] = None) -> types.GenerateContentConfig:
+        """요청 config 생성 (response_schema가 있으면 JSON mime type + 스키마 지정)"""
         config = types.GenerateContentConfig(
             temperature=self.generation_config.temperature,
             top_p=self.generation_config.top_p,
@@ -72,41 +183,145 @@ class GeminiAPI:
                 self._search_logged = True
             config.tools = [types.Tool(google_search=types.GoogleSearch())]
 
+        if response_schema is not None:
+            config.response_mime_type = "application/json"
+            config.response_schema = response_schema
+
+        return config
+
+    def _generate(self, contents: str, config: types.GenerateContentConfig):
+        """generate_content 호출 (rate limit/재시도 포함), 빈 응답이거나 모두 실패하면 None"""
+        estimated_tokens = self._estimate_tokens(contents)
+
         for attempt in range(Config.MAX_RETRIES):  # 재시도 루프, MAX_RETRIES 횟수만큼 시도
             try:
+                # RPM/TPM 예산이 남을 때까지만 대기 (모든 GeminiAPI 인스턴스가 같은 limiter 공유)
+                self.rate_limiter.acquire(estimated_tokens)
 
                 response = self.client.models.generate_content(
                     model=self.model,
-                    contents=enhanced_prompt,
+                    contents=contents,
                     config=config,
                 )
+                self.rate_limiter.on_success()
 
-                response_text = response.text  # 응답에서 텍스트 추출
+                usage = getattr(response, 'usage_metadata', None)
+                self.rate_limiter.record_usage(estimated_tokens, getattr(usage, 'total_token_count', None))
 
-                if response_text:
-                    return response_text
+                if response.text:  # 응답에서 텍스트 추출
+                    return response
                 else:
                     logger.warning(f"빈 응답 (시도 {attempt + 1})")
                     if attempt < Config.MAX_RETRIES - 1:
-                        time.sleep(Config.REQUEST_DELAY)
                         continue
 
             except Exception as e:
                 # API 호출 중 예외 발생 시 에러로그 출력
                 logger.error(f"Gemini API 요청 실패 (시도 {attempt + 1}/{Config.MAX_RETRIES}): {e}")
+                status = getattr(e, 'code', None)
+                if isinstance(status, int) and (status == 429 or status >= 500):
+                    # 한도 초과/서버 오류: 공유 limiter에 백오프 구간 설정 (다음 acquire에서 대기)
+                    delay = self.rate_limiter.on_throttle()
+                    logger.warning(f"Gemini {status} 응답, {delay:.0f}초 백오프")
+                    if attempt < Config.MAX_RETRIES - 1:
+                        continue
+                    logger.error("모든 재시도 실패")
+                    return None
                 if attempt < Config.MAX_RETRIES - 1:
                     time.sleep(Config.REQUEST_DELAY * (attempt + 1))
                 else:
                     logger.error("모든 재시도 실패")
-                    return ""
+                    return None
+
+        return None
 
-        return ""
+    @staticmethod
+    def _estimate_tokens(prompt: str) -> int:
+        """요청 토큰 수 대략 추정 (한글 위주라 2자당 1토큰 + 응답 여유분), 실제 사용량으로 나중에 보정"""
+        return len(prompt) // 2 + 500
 
     def query(self, prompt: str, use_search: bool = True) -> str:
         # 기본 쿼리 메서드
         return self.query_with_search(prompt, search_focus=use_search)
 
-    def query_json(self, prompt: str, retry_on_parse_error: bool = True, use_search: bool = True) -> Dict[str, Any]:
+    def query_json(
+            self,
+            prompt: str,
+            retry_on_parse_error: bool = True,
+            use_search: bool = True,
+            cache_type: Optional[str] = None, # PROMPT_CACHE_TTL의 키 (None이면 캐시 사용 안 함)
+            bypass_cache: bool = False,       # True면 캐시를 읽지 않고 새로 요청 (결과는 다시 저장)
+            schema_type: Optional[str] = None # PROMPT_RESPONSE_SCHEMAS의 키 (None이면 cache_type 사용)
+        ) -> Dict[str, Any]:
+        """JSON 응답을 파싱하여 반환 (cache_type이 있으면 캐시 우선, 스키마가 있으면 구조화 출력)
+
+        호출 간격은 실제 요청(query_with_search)의 rate limiter에서만 조절하므로 캐시 적중은 대기 없이 반환
+        """
+        schema = self._response_schema_for(schema_type or cache_type, use_search)
+        cache = self.response_cache if cache_type in PROMPT_CACHE_TTL else None
+        if cache is None:
+            return self._query_any(prompt, retry_on_parse_error, use_search, schema)
+
+        key = cache.make_key(prompt, self.model, use_search)
+        if not bypass_cache:
+            hit, data = cache.get(key, cache_type)
+            if hit:
+                logger.debug(f"Gemini 캐시 적중 ({cache_type})")
+                return data
+
+        data = self._query_any(prompt, retry_on_parse_error, use_search, schema)
+        # 요청/파싱 실패로 인한 빈 결과는 저장하지 않음 (모델이 실제로 빈 값을 준 경우만 negative caching)
+        if not self._local.query_failed:
+            cache.set(key, cache_type, self.model, use_search, data)
+        return data
+
+    def _query_any(self, prompt: str, retry_on_parse_error: bool, use_search: bool, schema: Optional[dict]) -> Any:
+        if schema is not None:
+            return self._query_structured(prompt, schema, use_search)
+        return self._query_json(prompt, retry_on_parse_error, use_search)
+
+    @staticmethod
+    def _response_schema_for(schema_type: Optional[str], use_search: bool) -> Optional[dict]:
+        """구조화 출력에 쓸 스키마 (모드가 꺼져 있거나 검색과 함께 쓸 수 없으면 None → 텍스트 파싱)"""
+        if not Config.GEMINI_STRUCTURED_OUTPUT:
+            return None
+        # gemini-2.5 계열은 google_search 도구와 JSON mime type을 함께 지정하면 400 오류
+        if use_search and not Config.GEMINI_SCHEMA_WITH_SEARCH:
+            return None
+        return get_response_schema(schema_type)
+
+    def _query_structured(self, prompt: str, schema: dict, use_search: bool) -> Any:
+        """response_schema + JSON mime type으로 요청해서 SDK가 파싱한 결과(dict/list) 반환
+
+        응답이 스키마로 제한되므로 코드펜스 제거/괄호 보정/파싱 재시도가 필요 없음
+        """
+        self._local.query_failed = False
+        response = self._generate(
+            self._with_system_prompt(prompt, use_search),
+            self._build_config(use_search, response_schema=schema)
+        )
+        if response is None:
+            self._local.query_failed = True
+            return {}
+
+        if response.parsed is not None:
+            return response.parsed
+        try:
+            return json.loads(response.text)
+        except (json.JSONDecodeError, TypeError) as e:
+            # 출력 토큰 한도로 잘린 경우 등
+            logger.error(f"구조화 응답 파싱 실패: {e}\n원본 응답:\n{response.text}")
+            self._local.query_failed = True
+            return {}
+
+    def prime_cache(self, prompt: str, data: Any, use_search: bool = True, cache_type: Optional[str] = None):
+        """다른 호출에서 이미 얻은 결과를 해당 프롬프트의 캐시로 저장 (나중에 같은 프롬프트 호출 시 적중)"""
+        if self.response_cache is None or cache_type not in PROMPT_CACHE_TTL or not data:
+            return
+        key = self.response_cache.make_key(prompt, self.model, use_search)
+        self.response_cache.set(key, cache_type, self.model, use_search, data)
+
+    def _query_json(self, prompt: str, retry_on_parse_error: bool = True, use_search: bool = True) -> Dict[str, Any]:
         # JSON 응답을 파싱하여 반환하는 메서드(딕셔너리 변환)
         json_instruction = textwrap.dedent("""\
             중요: 반드시 유효한 JSON 형식으로만 응답하세요.
@@ -116,6 +331,7 @@ class GeminiAPI:
             - Google Search로 찾은 최신 정보를 JSON으로 구성하세요""")
 
         json_prompt = f"{prompt}\n\n{json_instruction}"
+        self._local.query_failed = False
 
         for attempt in range(Config.MAX_RETRIES if retry_on_parse_error else 1):  # 재시도 루프
             try:
@@ -165,10 +381,13 @@ class GeminiAPI:
                     continue
                 else:
                     logger.error(f"JSON 파싱 최종 실패. 원본 응답:\n{response}")
+                    self._local.query_failed = True
                     return {}
             except Exception as e:
                 logger.error(f"예상치 못한 오류: {e}")
+                self._local.query_failed = True
                 return {}
 
+        self._local.query_failed = True
         return {}
 
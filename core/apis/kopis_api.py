@@ -5,11 +5,30 @@ import time
 import logging
 import requests
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any, Optional, Set
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from lib.config import Config
+from lib.rate_limiter import TokenBucket
+from core.apis.kopis_cache import KopisDetailCache
 
 logger = logging.getLogger(__name__)
 
+LIST_PAGE_ROWS = 100  # 목록 API 페이지당 항목 수
+
+# 제목에 포함되면 상세 조회 전에 제외할 키워드 (연주곡/클래식 계열, compare 도구 목록과 동일)
+EXCLUDED_TITLE_KEYWORDS = [
+    '재즈', '클래식',
+    '연주회', '독주회',
+    '기타리스트', '핑거스타일',
+    '앙상블', '챔버', '콰르텟', '트리오',
+    '관현악', '교향',
+    '피아노',
+    '오케스트라', '바이올린',
+]
+
 
 class KopisAPIError(Exception):
     """KOPIS API 400 에러 - 재시도 없이 스킵"""
@@ -17,78 +36,102 @@ class KopisAPIError(Exception):
 
 
 class KopisAPI:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        max_workers: int = None,
+        calls_per_second: float = None,
+        detail_cache: Optional[KopisDetailCache] = None,
+        use_cache: bool = None
+        ):
         self.api_key = api_key
         self.base_url = "http://www.kopis.or.kr/openApi/restful"
         self.request_delay = 0  # Rate limiting은 호출자가 처리
         
+        # fetch_concert_details 병렬 모드 설정 (워커 전체가 하나의 토큰 버킷을 공유)
+        self.max_workers = max_workers if max_workers is not None else Config.KOPIS_MAX_WORKERS
+        self.rate_limiter = TokenBucket(calls_per_second or Config.KOPIS_CALLS_PER_SECOND)
+        
+        # 상세정보 캐시 (use_cache=False면 사용 안 함)
+        if use_cache is None:
+            use_cache = Config.KOPIS_CACHE_ENABLED
+        if detail_cache is None and use_cache:
+            detail_cache = KopisDetailCache(Config.CACHE_DIR / "kopis_details.sqlite3")
+        self.detail_cache = detail_cache if use_cache else None
+        
         # 세션을 사용하여 연결 재사용 및 안정성 향상
         self.session = requests.Session()
         self.session.headers.update({
             'Accept': 'application/xml',
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
+        # 워커 수만큼 커넥션을 유지해야 "Connection pool is full" 경고 없이 재사용됨
+        adapter = HTTPAdapter(pool_maxsize=max(10, self.max_workers))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def fetch_all_concerts(self, start_date: str = None, end_date: str = None) -> List[str]:
         """다양한 상태의 콘서트를 모두 가져오기"""
+        return [record['code'] for record in self.fetch_all_concert_records(start_date, end_date)]
+    
+    def fetch_all_concert_records(self, start_date: str = None, end_date: str = None) -> List[Dict[str, str]]:
+        """다양한 상태의 콘서트 목록 레코드를 모두 가져오기 (코드 기준 중복 제거)"""
         if start_date and end_date:
             logger.info(f"{start_date}~{end_date} 기간의 모든 콘서트 수집...")
-            all_codes = []
-            for state in ["01", "02", "03"]:
-                all_codes.extend(self.fetch_concerts_in_range(start_date, end_date, state))
-            unique_codes = list(set(all_codes))
-            logger.info(f"총 {len(unique_codes)}개의 고유한 공연 수집")
-            return unique_codes
+        
+        all_records = []
+        for query_start, query_end, state in self.list_queries(start_date, end_date):
+            all_records.extend(self.fetch_concert_records_in_range(query_start, query_end, state))
+        
+        unique_records = self._unique_records(all_records)
+        if start_date and end_date:
+            logger.info(f"총 {len(unique_records)}개의 고유한 공연 수집")
+        else:
+            logger.info(f"총 {len(unique_records)}개의 고유한 공연 수집 (과거 30일 ~ 연말)")
+        return unique_records
+    
+    @staticmethod
+    def list_queries(start_date: str = None, end_date: str = None) -> List[Tuple[str, str, str]]:
+        """fetch_all_concert_records가 조회하는 (시작일, 종료일, 상태) 목록"""
+        if start_date and end_date:
+            return [(start_date, end_date, state) for state in ["01", "02", "03"]]
         
         # 날짜 범위가 없으면 기본값 사용
         now = datetime.now()
         today = now.strftime("%Y%m%d")
         one_month_ago = (now - timedelta(days=30)).strftime("%Y%m%d")
         end_of_year = datetime(now.year, 12, 31).strftime("%Y%m%d")
-
-        all_codes = []
-        all_codes.extend(self.fetch_concerts_in_range(one_month_ago, today, "03"))  # 완료
-        all_codes.extend(self.fetch_concerts_in_range(one_month_ago, today, "02"))  # 진행중
-        all_codes.extend(self.fetch_concerts_in_range(today, end_of_year, "01"))    # 예정
-
-        unique_codes = list(set(all_codes))
-        logger.info(f"총 {len(unique_codes)}개의 고유한 공연 수집 (과거 30일 ~ 연말)")
-        return unique_codes
+        return [
+            (one_month_ago, today, "03"),  # 완료
+            (one_month_ago, today, "02"),  # 진행중
+            (today, end_of_year, "01"),    # 예정
+        ]
     
     def fetch_concerts_in_range(self, start_date: str, end_date: str, state: str) -> List[str]:
         """특정 기간과 상태의 콘서트 목록 가져오기"""
+        return [record['code'] for record in self.fetch_concert_records_in_range(start_date, end_date, state)]
+    
+    def fetch_concert_records_in_range(self, start_date: str, end_date: str, state: str) -> List[Dict[str, str]]:
+        """특정 기간과 상태의 콘서트 목록 레코드 가져오기
+        
+        레코드: code, title, start_date, end_date, state (조회에 사용한 상태 코드)
+        """
         page = 1
-        rows = 100
         result = []
         
         while True:
-            url = f"{self.base_url}/pblprfr"
-            params = {
-                'service': self.api_key,
-                'stdate': start_date,
-                'eddate': end_date,
-                'rows': rows,
-                'cpage': page,
-                'shcate': 'CCCD',  # 대중음악
-                'prfstate': state
-            }
-            
             try:
-                response = self.session.get(url, params=params, timeout=15)
+                response = self.session.get(
+                    f"{self.base_url}/pblprfr",
+                    params=self.list_params(start_date, end_date, state, page),
+                    timeout=15
+                )
                 response.raise_for_status()
                 
-                root = ET.fromstring(response.text)
-                items = root.findall('.//db')
-                
-                if not items:
-                    break
-                
-                for item in items:
-                    mt20id = item.find('mt20id')
-                    if mt20id is not None and mt20id.text:
-                        result.append(mt20id.text)
+                records, item_count = self.parse_list_page(response.text, state)
+                result.extend(records)
                 
-                if len(items) < rows:
+                if item_count < LIST_PAGE_ROWS:
                     break
                     
                 page += 1
@@ -99,8 +142,91 @@ class KopisAPI:
         
         return result
     
-    def get_concert_detail(self, code: str) -> Optional[Dict[str, Any]]:
-        """단일 공연의 상세 정보를 가져오기"""
+    def list_params(self, start_date: str, end_date: str, state: str, page: int) -> Dict[str, Any]:
+        """공연 목록 API 요청 파라미터"""
+        return {
+            'service': self.api_key,
+            'stdate': start_date,
+            'eddate': end_date,
+            'rows': LIST_PAGE_ROWS,
+            'cpage': page,
+            'shcate': 'CCCD',  # 대중음악
+            'prfstate': state
+        }
+    
+    def parse_list_page(self, xml_text: str, state: str) -> Tuple[List[Dict[str, str]], int]:
+        """목록 응답 XML 한 페이지를 (레코드, 항목 수)로 변환"""
+        root = ET.fromstring(xml_text)
+        items = root.findall('.//db')
+        
+        records = []
+        for item in items:
+            code = self._get_text(item, 'mt20id')
+            if code:
+                records.append({
+                    'code': code,
+                    'title': self._get_text(item, 'prfnm'),
+                    'start_date': self._get_text(item, 'prfpdfrom'),
+                    'end_date': self._get_text(item, 'prfpdto'),
+                    'state': state,
+                })
+        return records, len(items)
+    
+    def prefilter_records(
+        self,
+        records: List[Dict[str, str]],
+        excluded_keywords: List[str] = None
+        ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """목록 레코드 제목에 제외 키워드가 있으면 상세 조회 전에 걸러냄
+        
+        Returns: (남은 레코드, 제외된 레코드) - 제외된 레코드에는 'excluded_keyword'가 추가됨
+        """
+        if excluded_keywords is None:
+            excluded_keywords = EXCLUDED_TITLE_KEYWORDS
+        
+        kept, dropped = [], []
+        for record in records:
+            title = record.get('title', '')
+            keyword = next((k for k in excluded_keywords if k in title), None)
+            if keyword:
+                dropped.append({**record, 'excluded_keyword': keyword})
+            else:
+                kept.append(record)
+        
+        if dropped:
+            logger.info(f"✂️ 목록 단계 키워드 제외: {len(dropped)}개 (상세 조회 {len(dropped)}회 절약)")
+        return kept, dropped
+    
+    def _unique_records(self, records: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """코드 기준 중복 제거 (먼저 나온 레코드 유지)"""
+        unique = {}
+        for record in records:
+            unique.setdefault(record['code'], record)
+        return list(unique.values())
+    
+    def get_cached_detail(self, code: str, ignore_ttl: bool = False) -> Optional[Dict[str, Any]]:
+        """캐시에 있는 상세정보만 반환 (API 호출 없음)
+        
+        ignore_ttl=True는 목록 지문이 그대로인 공연처럼 캐시를 믿어도 되는 경우에 사용
+        """
+        if not self.detail_cache:
+            return None
+        return self.detail_cache.get(code, ignore_ttl=ignore_ttl)
+    
+    def get_concert_detail(self, code: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """단일 공연의 상세 정보를 가져오기 (캐시 우선, refresh=True면 캐시 조회 생략)"""
+        if not refresh:
+            cached = self.get_cached_detail(code)
+            if cached is not None:
+                return cached
+        
+        detail = self._request_concert_detail(code)
+        if detail and self.detail_cache:
+            self.detail_cache.set(code, detail)
+        return detail
+    
+    def _request_concert_detail(self, code: str) -> Optional[Dict[str, Any]]:
+        """pblprfr/{code} 상세 API 호출 및 파싱"""
         url = f"{self.base_url}/pblprfr/{code}?service={self.api_key}"
 
         try:
@@ -164,9 +290,15 @@ class KopisAPI:
         concert_codes: List[str], 
         existing_codes: Set[str] = None, 
         max_found: int = None,
-        skip_filter: bool = False  # 추가: 내한공연 필터링 스킵 여부
+        skip_filter: bool = False,  # 추가: 내한공연 필터링 스킵 여부
+        max_workers: int = None,    # 동시 요청 수 (None이면 self.max_workers, 1이면 순차 처리)
+        failed_codes: List[str] = None  # 상세 조회에 실패한 코드를 담을 리스트 (증분 모드 기록 제외용)
         ) -> List[Dict[str, Any]]:
-        """공연 상세정보 가져오기 - 모든 내한공연 필터링"""
+        """공연 상세정보 가져오기 - 모든 내한공연 필터링
+        
+        병렬 모드에서도 결과는 concert_codes 순서대로 모으므로
+        max_found 조기 종료 시 순차 처리와 같은 공연들이 반환된다.
+        """
         result = []
     
     # 기존 코드 제외
@@ -181,18 +313,23 @@ class KopisAPI:
             logger.info("처리할 새로운 콘서트가 없습니다.")
             return result
     
+        workers = max_workers if max_workers is not None else self.max_workers
+        workers = max(1, min(workers, len(concert_codes)))
+    
         if skip_filter:
             log_msg = f"공연 상세정보 수집 시작: {len(concert_codes)}개 공연 처리 (필터링 스킵)"
         else:
             log_msg = f"내한공연 필터링 시작: {len(concert_codes)}개 공연 처리"
             if max_found:
                 log_msg += f" (최대 {max_found}개 발견시 중단)"
+        if workers > 1:
+            log_msg += f" [병렬 {workers}개]"
         logger.info(log_msg)
     
-        for i, code in enumerate(concert_codes, 1):
-            detail = self.get_concert_detail(code)
-        
+        for i, code, detail in self._iter_concert_details(concert_codes, workers):
             if detail is None:
+                if failed_codes is not None:
+                    failed_codes.append(code)
                 continue
         
             # 진행 상황 표시
@@ -213,8 +350,57 @@ class KopisAPI:
                     return result
     
         logger.info(f"🏁 처리 완료: {len(concert_codes)}개 처리, {len(result)}개 공연 수집")
+        if self.detail_cache:
+            self.detail_cache.log_stats()
         return result
     
+    def _fetch_detail_limited(self, code: str) -> Optional[Dict[str, Any]]:
+        """토큰 버킷을 거쳐 상세정보 조회 (400 에러 코드는 None으로 스킵)"""
+        # 캐시 적중 시에는 API를 호출하지 않으므로 토큰도 소비하지 않음
+        cached = self.get_cached_detail(code)
+        if cached is not None:
+            return cached
+        
+        self.rate_limiter.acquire()
+        try:
+            return self.get_concert_detail(code, refresh=True)
+        except KopisAPIError:
+            return None
+    
+    def _iter_concert_details(self, concert_codes: List[str], workers: int):
+        """(순번, 코드, 상세정보)를 concert_codes 순서대로 생성
+        
+        병렬 모드는 워커 수의 2배까지만 미리 제출하므로, 호출자가 중간에
+        순회를 멈추면 (max_found 달성) 남은 코드는 요청되지 않는다.
+        """
+        if workers <= 1:
+            for i, code in enumerate(concert_codes, 1):
+                yield i, code, self._fetch_detail_limited(code)
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending = deque()
+        code_iter = enumerate(concert_codes, 1)
+        
+        def submit_next():
+            for i, code in code_iter:
+                pending.append((i, code, executor.submit(self._fetch_detail_limited, code)))
+                return
+        
+        try:
+            for _ in range(workers * 2):
+                submit_next()
+            
+            while pending:
+                i, code, future = pending.popleft()
+                detail = future.result()
+                submit_next()
+                yield i, code, detail
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+    
     def _is_visit_concert(self, detail: Dict[str, Any]) -> bool:
         """내한공연 여부 확인"""
         return (
@@ -0,0 +1,111 @@
+"""
+asyncio 기반 KOPIS 공연 목록 클라이언트
+상태(01/02/03)와 월 단위 기간 조각을 동시에 조회해서 긴 수집 기간의 목록 조회 시간을 단축
+(파싱/파라미터/중복 제거는 KopisAPI와 같은 코드를 사용하므로 결과 레코드는 동기 클라이언트와 동일)
+"""
+import asyncio
+import calendar
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+import aiohttp
+
+from lib.config import Config
+from core.apis.kopis_api import KopisAPI, LIST_PAGE_ROWS
+
+logger = logging.getLogger(__name__)
+
+
+def month_shards(start_date: str, end_date: str) -> List[Tuple[str, str]]:
+    """YYYYMMDD 기간을 달력 월 단위 (시작일, 종료일) 조각으로 분할"""
+    start = datetime.strptime(start_date, "%Y%m%d")
+    end = datetime.strptime(end_date, "%Y%m%d")
+
+    shards = []
+    current = start
+    while current <= end:
+        last_day = calendar.monthrange(current.year, current.month)[1]
+        shard_end = min(current.replace(day=last_day), end)
+        shards.append((current.strftime("%Y%m%d"), shard_end.strftime("%Y%m%d")))
+        current = shard_end + timedelta(days=1)
+    return shards
+
+
+class AsyncKopisAPI:
+    """KOPIS 목록 조회 전용 비동기 클라이언트 (상세 조회는 KopisAPI.fetch_concert_details 사용)"""
+
+    def __init__(self, api_key: str, max_concurrency: int = None):
+        # 요청 파라미터 생성/XML 파싱/중복 제거는 동기 클라이언트 구현을 그대로 사용
+        self.sync_api = KopisAPI(api_key, use_cache=False)
+        self.base_url = self.sync_api.base_url
+        self.max_concurrency = max_concurrency or Config.KOPIS_MAX_WORKERS
+        self.headers = dict(self.sync_api.session.headers)
+
+    def fetch_all_concerts(self, start_date: str = None, end_date: str = None) -> List[str]:
+        """다양한 상태의 콘서트를 모두 가져오기 (동기 호출용)"""
+        return [record['code'] for record in self.fetch_all_concert_records(start_date, end_date)]
+
+    def fetch_all_concert_records(self, start_date: str = None, end_date: str = None) -> List[Dict[str, str]]:
+        """다양한 상태의 콘서트 목록 레코드를 모두 가져오기 (동기 호출용)
+
+        이미 이벤트 루프가 돌고 있는 곳(디스코드 봇 등)에서는
+        fetch_all_concert_records_async를 await 해야 함
+        """
+        return asyncio.run(self.fetch_all_concert_records_async(start_date, end_date))
+
+    async def fetch_all_concert_records_async(self, start_date: str = None, end_date: str = None) -> List[Dict[str, str]]:
+        """상태 × 월 조각을 전역 동시 요청 수 제한 안에서 한꺼번에 조회"""
+        queries = [
+            (shard_start, shard_end, state)
+            for query_start, query_end, state in KopisAPI.list_queries(start_date, end_date)
+            for shard_start, shard_end in month_shards(query_start, query_end)
+        ]
+        logger.info(f"비동기 목록 조회: {len(queries)}개 조각 (동시 요청 최대 {self.max_concurrency}개)")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=15)
+        async with aiohttp.ClientSession(headers=self.headers, timeout=timeout) as session:
+            shard_results = await asyncio.gather(*(
+                self._fetch_shard(session, semaphore, *query) for query in queries
+            ))
+
+        # gather는 입력 순서를 유지하므로 상태 순서 → 기간 순서로 이어 붙인 뒤 중복 제거
+        all_records = [record for records in shard_results for record in records]
+        unique_records = self.sync_api._unique_records(all_records)
+        logger.info(f"총 {len(unique_records)}개의 고유한 공연 수집")
+        return unique_records
+
+    async def _fetch_shard(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        start_date: str,
+        end_date: str,
+        state: str
+    ) -> List[Dict[str, str]]:
+        """한 조각(기간, 상태)의 모든 페이지 조회 - 페이지 수를 모르므로 조각 안에서는 순차"""
+        page = 1
+        result = []
+
+        while True:
+            params = self.sync_api.list_params(start_date, end_date, state, page)
+            try:
+                async with semaphore:
+                    async with session.get(f"{self.base_url}/pblprfr", params=params) as response:
+                        response.raise_for_status()
+                        text = await response.text()
+
+                records, item_count = self.sync_api.parse_list_page(text, state)
+                result.extend(records)
+
+                if item_count < LIST_PAGE_ROWS:
+                    break
+
+                page += 1
+
+            except Exception as e:
+                logger.error(f"공연 목록 가져오기 실패 ({start_date}~{end_date}, state:{state}): {e}")
+                break
+
+        return result
@@ -0,0 +1,98 @@
+"""
+KOPIS 공연 상세정보(pblprfr/{mt20id}) 로컬 캐시
+SQLite 파일에 파싱된 상세정보를 저장하고, 공연 상태(prfstate)별 TTL로 만료 처리
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+
+# 상세 응답의 prfstate는 한글 상태명, 목록 조회 파라미터는 01/02/03 코드라서 둘 다 매핑
+STATUS_TTL_SECONDS = {
+    '공연예정': 12 * HOUR,
+    '01': 12 * HOUR,
+    '공연중': 24 * HOUR,
+    '02': 24 * HOUR,
+    '공연완료': 30 * 24 * HOUR,  # 완료된 공연은 거의 바뀌지 않음
+    '03': 30 * 24 * HOUR,
+}
+DEFAULT_TTL_SECONDS = 6 * HOUR
+
+
+class KopisDetailCache:
+    """mt20id → 상세정보 dict 캐시 (여러 워커 스레드에서 공유 가능)"""
+
+    def __init__(self, db_path: Path, ttl_seconds: Dict[str, int] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds or STATUS_TTL_SECONDS
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS kopis_details (
+                code TEXT PRIMARY KEY,
+                status TEXT,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def ttl_for(self, status: str) -> int:
+        """공연 상태에 해당하는 TTL(초)"""
+        return self.ttl_seconds.get((status or '').strip(), DEFAULT_TTL_SECONDS)
+
+    def get(self, code: str, ignore_ttl: bool = False) -> Optional[Dict[str, Any]]:
+        """만료되지 않은 캐시가 있으면 상세정보 반환, 없으면 None (ignore_ttl=True면 만료 무시)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status, data, fetched_at FROM kopis_details WHERE code = ?",
+                (code,)
+            ).fetchone()
+
+            if row and (ignore_ttl or time.time() - row[2] < self.ttl_for(row[0])):
+                self.hits += 1
+                # 호출자가 dict를 수정해도 캐시에 영향이 없도록 매번 새로 역직렬화
+                return json.loads(row[1])
+
+            self.misses += 1
+            return None
+
+    def set(self, code: str, detail: Dict[str, Any]):
+        """상세정보 저장 (기존 값 덮어쓰기)"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO kopis_details (code, status, data, fetched_at) VALUES (?, ?, ?, ?)",
+                (code, detail.get('status', ''), json.dumps(detail, ensure_ascii=False), time.time())
+            )
+            self.conn.commit()
+
+    def invalidate(self, code: str):
+        """특정 공연 캐시 삭제"""
+        with self.lock:
+            self.conn.execute("DELETE FROM kopis_details WHERE code = ?", (code,))
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 적중/미스 카운터"""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def log_stats(self):
+        total = self.hits + self.misses
+        if total:
+            logger.info(f"💾 KOPIS 상세 캐시: 적중 {self.hits}회 / 미스 {self.misses}회 ({self.hits / total:.0%})")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,140 @@
+"""
+KOPIS 증분 동기화 상태 저장소
+목록 API에서 본 공연 코드와 목록 단계 지문(제목, 기간, 상태)을 SQLite에 저장해서
+다음 실행 때 새로 생겼거나 바뀐 공연만 상세 조회하도록 함
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def list_fingerprint(record: Dict[str, Any]) -> str:
+    """목록 레코드의 지문 (제목, 시작일, 종료일, 상태)"""
+    key = '|'.join(
+        (record.get(field) or '').strip()
+        for field in ('title', 'start_date', 'end_date', 'state')
+    )
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class KopisSyncState:
+    """scope별로 이미 처리한 공연 코드와 상태별 워터마크를 관리
+
+    scope는 사용처마다 다르게 지정한다. 예를 들어 main 파이프라인은 DB에 반영된
+    공연을, 비교 도구는 상세정보를 확인한 공연을 기록하므로 서로 섞이면 안 된다.
+    """
+
+    def __init__(self, db_path: Path, scope: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.scope = scope
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS kopis_seen (
+                scope TEXT NOT NULL,
+                code TEXT NOT NULL,
+                state TEXT,
+                fingerprint TEXT NOT NULL,
+                seen_at REAL NOT NULL,
+                PRIMARY KEY (scope, code)
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS kopis_watermarks (
+                scope TEXT NOT NULL,
+                state TEXT NOT NULL,
+                synced_at REAL NOT NULL,
+                window_start TEXT,
+                window_end TEXT,
+                code_count INTEGER,
+                PRIMARY KEY (scope, state)
+            )
+        """)
+        self.conn.commit()
+
+    def _load_fingerprints(self) -> Dict[str, str]:
+        rows = self.conn.execute(
+            "SELECT code, fingerprint FROM kopis_seen WHERE scope = ?",
+            (self.scope,)
+        ).fetchall()
+        return dict(rows)
+
+    def split(self, records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """목록 레코드를 (새로 생겼거나 바뀐 것, 그대로인 것)으로 분리"""
+        with self.lock:
+            known = self._load_fingerprints()
+
+        changed, unchanged = [], []
+        for record in records:
+            if known.get(record['code']) == list_fingerprint(record):
+                unchanged.append(record)
+            else:
+                changed.append(record)
+
+        new_count = sum(1 for r in changed if r['code'] not in known)
+        logger.info(
+            f"🔁 증분 동기화 [{self.scope}]: 신규 {new_count}개, 변경 {len(changed) - new_count}개, "
+            f"변경 없음 {len(unchanged)}개"
+        )
+        return changed, unchanged
+
+    def mark_seen(self, records: List[Dict[str, Any]], start_date: str = None, end_date: str = None):
+        """처리가 끝난 목록 레코드를 기록하고 상태별 워터마크 갱신"""
+        now = time.time()
+        counts: Dict[str, int] = {}
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO kopis_seen (scope, code, state, fingerprint, seen_at) VALUES (?, ?, ?, ?, ?)",
+                [(self.scope, r['code'], r.get('state', ''), list_fingerprint(r), now) for r in records]
+            )
+            for r in records:
+                counts[r.get('state', '')] = counts.get(r.get('state', ''), 0) + 1
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO kopis_watermarks "
+                "(scope, state, synced_at, window_start, window_end, code_count) VALUES (?, ?, ?, ?, ?, ?)",
+                [(self.scope, state, now, start_date, end_date, count) for state, count in counts.items()]
+            )
+            self.conn.commit()
+        logger.info(f"🔁 증분 동기화 [{self.scope}]: {len(records)}개 공연 기록")
+
+    def get_watermark(self, state: str) -> Optional[Dict[str, Any]]:
+        """상태별 마지막 동기화 정보 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT synced_at, window_start, window_end, code_count FROM kopis_watermarks "
+                "WHERE scope = ? AND state = ?",
+                (self.scope, state)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            'synced_at': datetime.fromtimestamp(row[0]),
+            'window_start': row[1],
+            'window_end': row[2],
+            'code_count': row[3],
+        }
+
+    def log_watermarks(self, states=("01", "02", "03")):
+        for state in states:
+            watermark = self.get_watermark(state)
+            if watermark:
+                logger.info(
+                    f"   - 상태 {state}: 마지막 동기화 {watermark['synced_at']:%Y-%m-%d %H:%M} "
+                    f"({watermark['window_start']}~{watermark['window_end']}, {watermark['code_count']}개)"
+                )
+            else:
+                logger.info(f"   - 상태 {state}: 동기화 기록 없음 (전체 조회)")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -2,6 +2,8 @@
 """
 가사를 한국어 해석 및 발음으로 변환하는 모듈
 원본 가사 손실되지 않도록 처리
+결과는 <CSV>.translation.journal 에 곡·필드 단위로 기록하고 N건/T초마다, 그리고 종료 시 CSV에 병합
+(중단 후 다시 실행하면 저널에 남은 결과부터 반영하고 이어서 처리)
 """
 import csv
 import logging
@@ -10,6 +12,7 @@ from pathlib import Path
 from typing import List, Dict, Optional
 from core.apis.gemini_api import GeminiAPI
 from lib.config import Config
+from lib.csv_journal import CsvJournal, atomic_write_csv
 from lib.prompts import LyricsPrompts
 
 # CSV 모듈 설정 - 100만 글자 허용
@@ -110,17 +113,8 @@ class LyricsTranslator:
                 if field not in fieldnames:
                     fieldnames.append(field)
             
-            # 새 파일 저장
-            with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames, quoting=csv.QUOTE_NONNUMERIC)
-                writer.writeheader()
-                
-                for song in songs:
-                    # 모든 필드가 있도록 보장
-                    for field in fieldnames:
-                        if field not in song:
-                            song[field] = ''
-                    writer.writerow(song)
+            # 임시 파일에 쓴 뒤 교체
+            atomic_write_csv(songs, csv_path, fieldnames, quoting=csv.QUOTE_NONNUMERIC)
             
             logger.info(f"파일 저장 완료: {csv_path}")
             return True
@@ -166,7 +160,16 @@ class LyricsTranslator:
         
         logger.info(f"가사 {mode} 처리 시작: {len(songs_with_lyrics)}곡")
         print("-" * 60)
-        
+
+        with CsvJournal(csv_path, songs, self.write_songs_to_csv, name='translation') as journal:
+            self._translate_songs(songs_with_lyrics, journal, stats, mode)
+
+        logger.info(f"✅ 처리 완료: {stats}")
+        return stats
+
+    def _translate_songs(self, songs_with_lyrics: List[Dict[str, str]], journal: CsvJournal,
+                         stats: Dict[str, int], mode: str):
+        # 곡별 번역/발음 결과를 저널에 기록
         for i, song in enumerate(songs_with_lyrics):
             title = song.get('title', '').strip()
             artist = song.get('artist', '').strip()
@@ -185,14 +188,9 @@ class LyricsTranslator:
                     logger.info(f"번역 시작: {title}")
                     translation = self.get_translation(lyrics, title, artist)
                     if translation:
-                        song['translation'] = translation
+                        # 저널에 기록 (CSV는 N건/T초마다 병합)
+                        journal.record(song, translation=translation)
                         stats['translation_updated'] += 1
-                        
-                        # 즉시 저장
-                        if self.write_songs_to_csv(songs, csv_path):
-                            logger.info(f"💾 번역 저장 완료: {title}")
-                        else:
-                            logger.error(f"💾 번역 저장 실패: {title}")
                     else:
                         stats['failed'] += 1
                     
@@ -208,19 +206,11 @@ class LyricsTranslator:
                     logger.info(f"발음 변환 시작: {title}")
                     pronunciation = self.get_pronunciation(lyrics, title, artist)
                     if pronunciation:
-                        song['pronunciation'] = pronunciation
+                        # 저널에 기록 (CSV는 N건/T초마다 병합)
+                        journal.record(song, pronunciation=pronunciation)
                         stats['pronunciation_updated'] += 1
-                        
-                        # 즉시 저장
-                        if self.write_songs_to_csv(songs, csv_path):
-                            logger.info(f"💾 발음 저장 완료: {title}")
-                        else:
-                            logger.error(f"💾 발음 저장 실패: {title}")
                     else:
                         stats['failed'] += 1
                     
                     # API 호출 제한
                     time.sleep(2)
-        
-        logger.info(f"✅ 처리 완료: {stats}")
-        return stats
\ No newline at end of file
@@ -10,7 +10,7 @@ update_all_lyrics
        └→ extract_original_artist_name  (아티스트 정리)
        └→ get_title_search_variants     (제목 변형 생성)
        └→ musixmatch_api.get_lyrics     (가사 검색)
-       └→ write_songs_to_csv            (결과 저장)
+       └→ CsvJournal.record             (결과를 저널에 기록, N곡/T초마다 CSV 병합)
 """
 import csv
 import logging
@@ -19,6 +19,7 @@ from typing import List, Dict
 import time
 import re # 정규표현식 — 괄호 제거, 패턴 매칭에 사용
 from lib.config import Config
+from lib.csv_journal import CsvJournal, atomic_write_csv
 from core.apis.musixmatch_lrclib_lyrics_api import LyricsAPI # 가사 검색 API 클라이언트 (Musixmatch + LRCLIB)
 
 # CSV 모듈 설정 - 큰 필드 허용
@@ -119,17 +120,8 @@ class LyricsUpdater:
             if 'musixmatch_url' not in fieldnames:
                 fieldnames.append('musixmatch_url')
             
-            # 새 파일 저장 - quoting 옵션 추가로 특수문자 처리
-            with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames, quoting=csv.QUOTE_MINIMAL)
-                writer.writeheader()
-                
-                for song in songs:
-                    # 모든 필드가 있도록 보장
-                    for field in fieldnames:
-                        if field not in song:
-                            song[field] = ''
-                    writer.writerow(song)
+            # 임시 파일에 쓴 뒤 교체 - quoting 옵션 추가로 특수문자 처리
+            atomic_write_csv(songs, csv_path, fieldnames, quoting=csv.QUOTE_MINIMAL)
             
             logger.info(f"파일 저장 완료: {csv_path}")
             return True
@@ -154,8 +146,18 @@ class LyricsUpdater:
             return stats
         
         stats['total'] = len(songs)
+        with CsvJournal(csv_path, songs, self.write_songs_to_csv, name='lyrics') as journal:
+            self._update_songs(songs, journal, stats, max_songs)
+
+        logger.info(f"✅ {csv_path} 처리 완료: {stats['updated']}곡 업데이트됨")
+
+        return stats
+
+    def _update_songs(self, songs: List[Dict[str, str]], journal: CsvJournal, stats: Dict[str, int],
+                      max_songs: int = None):
+        # 가사가 없는 곡을 순서대로 검색해서 결과를 저널에 기록
         process_count = 0
-        
+
         for i, song in enumerate(songs):
             # 제한된 수만 처리
             if max_songs and process_count >= max_songs:
@@ -207,16 +209,11 @@ class LyricsUpdater:
                         break
 
                 if lyrics_info and lyrics_info.get('lyrics'):
-                    song['lyrics'] = lyrics_info['lyrics']
-                    song['musixmatch_url'] = lyrics_info.get('url', '')
+                    # 가사를 찾자마자 저널에 기록 (CSV는 N곡/T초마다 병합)
+                    journal.record(song, lyrics=lyrics_info['lyrics'],
+                                   musixmatch_url=lyrics_info.get('url', ''))
                     logger.info(f"✅ 가사 업데이트 성공: {title} - {original_artist}")
                     stats['updated'] += 1
-
-                    # 가사를 찾자마자 바로 CSV 저장
-                    if self.write_songs_to_csv(songs, csv_path):
-                        logger.info(f"💾 즉시 저장 완료: {title}")
-                    else:
-                        logger.error(f"💾 즉시 저장 실패: {title}")
                 else:
                     logger.warning(f"❌ 가사를 찾을 수 없음: {title} - {original_artist}")
                     stats['failed'] += 1
@@ -226,11 +223,6 @@ class LyricsUpdater:
                 stats['failed'] += 1
             
             process_count += 1
-        
-        # 각 곡마다 즉시 저장하므로 마지막 저장은 불필요
-        logger.info(f"✅ {csv_path} 처리 완료: {stats['updated']}곡 업데이트됨")
-        
-        return stats
     
     def update_all_lyrics(self, max_songs_per_file: int = None) -> Dict:
         """모든 songs.csv 파일의 가사 업데이트"""
@@ -391,6 +383,15 @@ class LyricsUpdater:
         logger.info(f"뮤직매치 검색용 아티스트명: {search_artist}")
         print("-" * 50)
 
+        with CsvJournal(csv_path, songs, self.write_songs_to_csv, name='lyrics') as journal:
+            self._update_artist_songs(artist_songs, journal, stats, search_artist, skip_artist_clean)
+
+        logger.info(f"✅ 아티스트 '{target_artist}' 처리 완료: {stats}")
+        return stats
+
+    def _update_artist_songs(self, artist_songs: List[Dict[str, str]], journal: CsvJournal,
+                             stats: Dict[str, int], search_artist: str, skip_artist_clean: bool):
+        # 한 아티스트의 곡들을 검색해서 결과를 저널에 기록
         for i, song in enumerate(artist_songs):
             title = song.get('title', '').strip()
             current_lyrics = song.get('lyrics', '').strip()
@@ -432,16 +433,11 @@ class LyricsUpdater:
                         break
 
                 if lyrics_info and lyrics_info.get('lyrics'):
-                    song['lyrics'] = lyrics_info['lyrics']
-                    song['musixmatch_url'] = lyrics_info.get('url', '')
+                    # 가사를 찾자마자 저널에 기록 (CSV는 N곡/T초마다 병합)
+                    journal.record(song, lyrics=lyrics_info['lyrics'],
+                                   musixmatch_url=lyrics_info.get('url', ''))
                     logger.info(f"✅ 가사 업데이트 성공: {title}")
                     stats['updated'] += 1
-
-                    # 가사를 찾자마자 바로 CSV 저장
-                    if self.write_songs_to_csv(songs, csv_path):
-                        logger.info(f"💾 즉시 저장 완료: {title}")
-                    else:
-                        logger.error(f"💾 즉시 저장 실패: {title}")
                 else:
                     logger.warning(f"❌ 가사를 찾을 수 없음: {title}")
                     stats['failed'] += 1
@@ -449,9 +445,6 @@ class LyricsUpdater:
             except Exception as e:
                 logger.error(f"가사 검색 실패: {title}: {e}")
                 stats['failed'] += 1
-        
-        logger.info(f"✅ 아티스트 '{target_artist}' 처리 완료: {stats}")
-        return stats
 
     def set_lyrics_for_song(self, csv_path: str, song_title: str, lyrics_text: str) -> bool:
         """
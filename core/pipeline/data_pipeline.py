@@ -1,18 +1,21 @@
 """
 데이터 수집 파이프라인 핵심 로직
 """
+import asyncio
 import csv
 import logging
 import shutil
 from datetime import datetime
 from pathlib import Path
 import pandas as pd
-from typing import Optional, Tuple, List, Dict
+from typing import Callable, Optional, Tuple, List, Dict
 
 from lib.config import Config
 from lib.data_collector import DataCollector
 from lib.safe_writer import SafeWriter
 from core.apis.kopis_api import KopisAPI
+from core.apis.kopis_async_api import AsyncKopisAPI
+from core.apis.kopis_sync import KopisSyncState
 
 KOPIS_BASE_DIR = Path("data/kopis_crawling")
 
@@ -31,8 +34,16 @@ logger = logging.getLogger(__name__)
 class DataPipeline:
     """단순화된 데이터 수집 파이프라인"""
     
-    def __init__(self, start_date: str = None, end_date: str = None, concert_codes: List[str] = None):
+    def __init__(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        concert_codes: List[str] = None,
+        incremental: bool = False
+    ):
         self.kopis_api = KopisAPI(Config.KOPIS_API_KEY)
+        # 목록 조회 클라이언트 (비동기 모드면 상태 × 월 조각을 동시에 조회, 결과는 동일)
+        self.list_api = AsyncKopisAPI(Config.KOPIS_API_KEY) if Config.KOPIS_ASYNC_LISTING else self.kopis_api
         self.api_client = APIClient(Config.GEMINI_API_KEY if Config.USE_GEMINI_API else Config.PERPLEXITY_API_KEY)
         self.data_collector = DataCollector(self.api_client)
         self.writer = SafeWriter
@@ -42,7 +53,12 @@ class DataPipeline:
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         self.run_dir = KOPIS_BASE_DIR / timestamp / "db"
         self.run_dir.mkdir(parents=True, exist_ok=True)
-        self.stats = {"concerts": 0, "artists": 0, "concert_list": [], "artist_list": []}
+        self.stats = {"concerts": 0, "artists": 0, "concert_list": [], "artist_list": [], "prefiltered": 0}
+
+        # 증분 모드: 이전 실행에서 처리한 공연 중 목록 지문이 그대로인 것은 건너뜀
+        self.incremental = incremental
+        self.sync_state = KopisSyncState(Config.CACHE_DIR / "kopis_sync.sqlite3", scope="main") if incremental else None
+        self._pending_sync_records = []
     
     def run_full_pipeline(self) -> bool:
         """전체 파이프라인 실행"""
@@ -58,6 +74,9 @@ class DataPipeline:
                 kopis_data = self._fetch_kopis_data()
             
             if not kopis_data:
+                # 증분 모드: 바뀐 공연 중 내한공연이 없어도 확인한 코드는 기록 (저장할 데이터 없음)
+                if kopis_data is not None:
+                    self.commit_sync_state()
                 return False
             
             # 2단계: 콘서트 데이터 보강
@@ -71,8 +90,10 @@ class DataPipeline:
                 if concert.artist in name_map:
                     concert.artist = name_map[concert.artist]
             print("✅ 아티스트 이름 통일 완료")
+            # 통합 보강 장르는 6단계가 묻는 (통일된) 아티스트명으로 캐시
+            self.data_collector.prime_concert_genres(concerts)
 
-            # 4단계: CSV 저장
+            # 4단계: CSV 저장 (증분 기록은 호출자가 DB 반영까지 성공한 뒤 commit_sync_state로 남김)
             self._save_data(concerts, artists)
             
             print("✅ 파이프라인 완료")
@@ -127,11 +148,33 @@ class DataPipeline:
         print("📡 KOPIS 데이터 수집 중...")
         
         try:
-            # 전체 공연 코드 수집
-            concert_codes = self.kopis_api.fetch_all_concerts(self.start_date, self.end_date)
-            print(f"📊 총 {len(concert_codes)}개 공연 코드 수집")
-            
-            concerts = self.kopis_api.fetch_concert_details(concert_codes)
+            # 전체 공연 목록 수집
+            records = self.list_api.fetch_all_concert_records(self.start_date, self.end_date)
+            print(f"📊 총 {len(records)}개 공연 코드 수집")
+
+            # 1차 키워드 필터: 제목만으로 걸러지는 공연은 상세 조회하지 않음
+            candidates, prefiltered = self.kopis_api.prefilter_records(records)
+            self.stats["prefiltered"] = len(prefiltered)
+            if prefiltered:
+                print(f"✂️ 1차 키워드 필터 제외: {len(prefiltered)}개 (상세 조회 {len(prefiltered)}회 절약)")
+
+            if self.incremental:
+                self.sync_state.log_watermarks()
+                changed, unchanged = self.sync_state.split(candidates)
+                print(f"🔁 증분 모드: 변경 없음 {len(unchanged)}개 건너뜀, {len(changed)}개만 상세 조회")
+                candidates = changed
+
+            concert_codes = [record['code'] for record in candidates]
+            failed_codes = []
+            concerts = self.kopis_api.fetch_concert_details(concert_codes, failed_codes=failed_codes)
+
+            if self.incremental:
+                # 상세 조회에 실패한 코드는 기록하지 않음 (다음 실행에서 다시 조회)
+                # 기록은 DB 반영까지 성공한 뒤에 (commit_sync_state)
+                if failed_codes:
+                    print(f"⚠️ 상세 조회 실패 {len(failed_codes)}개는 다음 실행에서 다시 조회")
+                failed = set(failed_codes)
+                self._pending_sync_records = [record for record in records if record['code'] not in failed]
             
             print(f"📊 수집 결과: {len(concerts)}개 내한공연 발견")
             return concerts
@@ -139,69 +182,125 @@ class DataPipeline:
         except Exception as e:
             logger.error(f"KOPIS 데이터 수집 실패: {e}")
             return None
-    
+
+    def commit_sync_state(self):
+        """증분 모드에서 이번 실행에 처리한 목록 레코드 기록 (CSV 저장/DB 반영이 성공한 뒤 호출)"""
+        if self.sync_state and self._pending_sync_records:
+            self.sync_state.mark_seen(self._pending_sync_records, self.start_date, self.end_date)
+            self._pending_sync_records = []
+
+    def _forget_sync_codes(self, codes: set):
+        """처리 중 실패한 공연은 기록 대상에서 제외 (다음 실행에서 다시 처리)"""
+        if self._pending_sync_records and codes:
+            self._pending_sync_records = [
+                record for record in self._pending_sync_records if record['code'] not in codes
+            ]
+
     def _enhance_concert_data(self, kopis_data: list) -> list:
         """콘서트 데이터 보강"""
         print("🔍 콘서트 정보 보강 중...")
-        
-        enhanced_concerts = []
-        
-        for i, kopis_concert in enumerate(kopis_data, 1):
-            title = kopis_concert.get('title', 'Unknown')
-            artist = kopis_concert.get('artist', '')
-            try:
-                print(f"  [{i}/{len(kopis_data)}] {title}")
 
-                # 2차 Gemini 장르 필터 (1차 키워드 통과 후)
-                if self.data_collector.is_excluded_genre(title, artist):
-                    print(f"    → 2차 장르 필터 제외: {title}")
-                    continue
+        failures = []
+        results = self._map_items(
+            self._enhance_one_concert,
+            kopis_data,
+            label=lambda kopis_concert: kopis_concert.get('title', 'Unknown'),
+            error_message="콘서트 정보 보강 실패",
+            failures=failures
+        )
+        enhanced_concerts = [concert for concert in results if concert is not None]
+        # 장르 필터 제외(None 반환)는 처리 완료, 예외로 실패한 공연만 다시 처리 대상
+        self._forget_sync_codes({kopis_concert.get('code') for kopis_concert in failures})
 
-                # 기본 콘서트 객체 생성
-                concert = self.data_collector.collect_concert_basic_info(kopis_concert)
+        print(f"✅ {len(enhanced_concerts)}개 콘서트 정보 보강 완료")
+        return enhanced_concerts
 
-                # AI API로 정보 보강
-                enhanced_concert = self.data_collector.enhance_concert_data(concert)
+    def _enhance_one_concert(self, kopis_concert: dict):
+        """콘서트 1개 보강 (제외 장르면 None)"""
+        title = kopis_concert.get('title', 'Unknown')
+        artist = kopis_concert.get('artist', '')
 
-                enhanced_concerts.append(enhanced_concert)
+        if Config.GEMINI_COMBINED_ENRICHMENT:
+            # 장르 필터 + 보강을 한 번의 호출로 처리 (검증 실패 항목만 재요청)
+            concert = self.data_collector.collect_concert_basic_info(kopis_concert)
+            enhanced_concert = self.data_collector.enhance_concert_data_combined(concert)
+            if enhanced_concert is None:
+                print(f"    → 2차 장르 필터 제외: {title}")
+            return enhanced_concert
+
+        # 2차 Gemini 장르 필터 (1차 키워드 통과 후)
+        if self.data_collector.is_excluded_genre(title, artist):
+            print(f"    → 2차 장르 필터 제외: {title}")
+            return None
+
+        # 기본 콘서트 객체 생성
+        concert = self.data_collector.collect_concert_basic_info(kopis_concert)
+
+        # AI API로 정보 보강
+        return self.data_collector.enhance_concert_data(concert)
 
-            except Exception as e:
-                logger.warning(f"콘서트 정보 보강 실패 ({title}): {e}")
-                continue
-        
-        print(f"✅ {len(enhanced_concerts)}개 콘서트 정보 보강 완료")
-        return enhanced_concerts
-    
     def _collect_artist_data(self, concerts: list) -> Tuple[List, Dict]:
         """아티스트 데이터 수집 및 이름 변환 맵 반환"""
         print("🎤 아티스트 정보 수집 중...")
-        
-        # 고유 아티스트 추출
-        unique_artists = set()
-        for concert in concerts:
-            if concert.artist:
-                unique_artists.add(concert.artist)
-        
+
+        # 고유 아티스트 추출 (콘서트 순서 유지)
+        unique_artists = list(dict.fromkeys(concert.artist for concert in concerts if concert.artist))
+
+        results = self._map_items(
+            self.data_collector.collect_artist_info,
+            unique_artists,
+            label=lambda artist_name: artist_name,
+            error_message="아티스트 정보 수집 실패"
+        )
+
         artists = []
         name_map = {}
-        for i, artist_name in enumerate(unique_artists, 1):
-            try:
-                print(f"  [{i}/{len(unique_artists)}] {artist_name}")
-                
-                artist_obj = self.data_collector.collect_artist_info(artist_name)
-                if artist_obj:
-                    artists.append(artist_obj)
-                    # 이름이 변경된 경우, 변환 맵에 추가
-                    if artist_obj.artist and artist_obj.artist != artist_name:
-                        name_map[artist_name] = artist_obj.artist
-                        
-            except Exception as e:
-                logger.warning(f"아티스트 정보 수집 실패 ({artist_name}): {e}")
-                continue
-        
+        for artist_name, artist_obj in zip(unique_artists, results):
+            if artist_obj:
+                artists.append(artist_obj)
+                # 이름이 변경된 경우, 변환 맵에 추가
+                if artist_obj.artist and artist_obj.artist != artist_name:
+                    name_map[artist_name] = artist_obj.artist
+
         print(f"✅ {len(artists)}명 아티스트 정보 수집 완료")
         return artists, name_map
-    
+
+    def _map_items(self, func: Callable, items: list, label: Callable, error_message: str,
+                   failures: Optional[list] = None) -> list:
+        """items 각각에 func 실행 후 입력 순서대로 결과 반환 (실패한 항목은 None, failures에도 추가)
+
+        GEMINI_MAX_CONCURRENCY가 2 이상이면 asyncio로 동시에 실행한다.
+        DataCollector는 Gemini/Serper/MusicBrainz를 동기로 호출하므로 항목마다
+        asyncio.to_thread로 실행하고, Gemini 호출 간격은 프로세스 공유 rate limiter가 맞춘다.
+        """
+        total = len(items)
+
+        def run_one(i: int, item):
+            print(f"  [{i}/{total}] {label(item)}")
+            try:
+                return func(item)
+            except Exception as e:
+                logger.warning(f"{error_message} ({label(item)}): {e}")
+                if failures is not None:
+                    failures.append(item)
+                return None
+
+        if Config.GEMINI_MAX_CONCURRENCY <= 1 or total <= 1:
+            return [run_one(i, item) for i, item in enumerate(items, 1)]
+
+        async def run_all():
+            semaphore = asyncio.Semaphore(Config.GEMINI_MAX_CONCURRENCY)
+
+            async def run_limited(i: int, item):
+                async with semaphore:
+                    return await asyncio.to_thread(run_one, i, item)
+
+            # gather는 완료 순서와 관계없이 입력 순서대로 결과를 돌려줌
+            return await asyncio.gather(*(run_limited(i, item) for i, item in enumerate(items, 1)))
+
+        print(f"  ⚡ 동시 실행: 최대 {Config.GEMINI_MAX_CONCURRENCY}개")
+        return asyncio.run(run_all())
+
     def _save_data(self, concerts: list, artists: list):
         """데이터 저장"""
         print("💾 데이터 저장 중...")
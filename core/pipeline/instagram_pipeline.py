@@ -3,13 +3,14 @@ Instagram 크롤링 → MySQL DB 저장 파이프라인
 """
 import csv
 import logging
-import re
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional, List, Tuple, Dict, Any
 
+from lib.config import Config
 from lib.prompts import DataCollectionPrompts, CONCERT_KEYWORDS
+from lib.artist_resolver import ArtistResolver
 from core.apis.serper_api import SerperAPI
 
 logger = logging.getLogger(__name__)
@@ -48,6 +49,7 @@ class InstagramPipeline:
         self.max_posts = max_posts
         self.generate_introduction = generate_introduction
         self.serper = SerperAPI()
+        self.artist_resolver = None
 
         self._preview_artists: List[Dict] = []
         self._preview_concerts: List[Dict] = []
@@ -361,60 +363,21 @@ class InstagramPipeline:
             post_url=post.post_url,
         )
         logger.info(f"캡션 앞 200자: {(post.caption or '')[:200]}")
-        result = self.gemini.query_json(prompt, use_search=False)
+        result = self.gemini.query_json(prompt, use_search=False, schema_type='instagram_parse')
         logger.info(f"Gemini 파싱 결과: {result}")
-        time.sleep(2)
         return result
 
     def _upsert_artist(self, artist_name: str) -> Tuple[Optional[int], str]:
         """(artist_id, 실제_저장된_아티스트명) 반환. 신규면 artist_name 그대로 삽입."""
-        self.db.cursor.execute("SELECT id, artist FROM artists WHERE artist = %s", (artist_name,))
-        row = self.db.cursor.fetchone()
-        if row:
-            return row[0], row[1]
-
-        # 대소문자·띄어쓰기 차이 → 한국어명 괄호 기준으로 재조회
-        # 스페이스 포함 한국어명도 캡처 (예: "험프 백")
-        korean_match = re.search(r'\(([가-힣\s]+)\)', artist_name)
-        if korean_match:
-            korean_name = korean_match.group(1).strip()
-            korean_name_no_space = korean_name.replace(' ', '')
-
-            # 1차: 그대로 매칭
-            self.db.cursor.execute(
-                "SELECT id, artist FROM artists WHERE artist LIKE %s LIMIT 1",
-                (f'%({korean_name})%',)
-            )
-            row = self.db.cursor.fetchone()
-            if row:
-                logger.info(f"한국어명 매칭: '{artist_name}' → DB의 '{row[1]}' (id={row[0]})")
-                return row[0], row[1]
-
-            # 2차: 공백 제거 후 매칭 (예: "험프 백" → "험프백")
-            if korean_name_no_space != korean_name:
-                self.db.cursor.execute(
-                    "SELECT id, artist FROM artists WHERE REPLACE(artist, ' ', '') LIKE %s LIMIT 1",
-                    (f'%({korean_name_no_space})%',)
-                )
-                row = self.db.cursor.fetchone()
-                if row:
-                    logger.info(f"한국어명(공백제거) 매칭: '{artist_name}' → DB의 '{row[1]}' (id={row[0]})")
-                    return row[0], row[1]
-
-        # 3차: 영문명만 따로 공백·대소문자 무시 매칭
-        # (예: "Hump Back" → "humpback" == DB의 "Humpback")
-        english_part = artist_name.split('(')[0].strip()
-        if english_part:
-            english_normalized = english_part.replace(' ', '').lower()
-            self.db.cursor.execute(
-                "SELECT id, artist FROM artists "
-                "WHERE LOWER(REPLACE(TRIM(SUBSTRING_INDEX(artist, '(', 1)), ' ', '')) = %s LIMIT 1",
-                (english_normalized,)
-            )
-            row = self.db.cursor.fetchone()
-            if row:
-                logger.info(f"영문명(공백제거) 매칭: '{artist_name}' → DB의 '{row[1]}' (id={row[0]})")
-                return row[0], row[1]
+        # 대소문자·띄어쓰기 차이는 한국어명(괄호 안) → 영문명 순으로 인메모리 인덱스에서 매칭
+        # (예: "Hump Back (험프 백)" == DB의 "Humpback (험프백)")
+        if self.artist_resolver is None:
+            self.artist_resolver = ArtistResolver(self.db, preload=not Config.ARTIST_INDEXED_LOOKUP)
+        existing = self.artist_resolver.resolve(artist_name)
+        if existing:
+            if existing[1] != artist_name:
+                logger.info(f"기존 아티스트 매칭: '{artist_name}' → DB의 '{existing[1]}' (id={existing[0]})")
+            return existing
 
         logger.info(f"새 아티스트 '{artist_name}' 정보 수집 중...")
         info = self.data_collector._collect_artist_basic_info(artist_name) or {}
@@ -451,7 +414,9 @@ class InstagramPipeline:
             now, now,
         ))
         self.db.commit()
-        return self.db.cursor.lastrowid, artist_name
+        artist_id = self.db.cursor.lastrowid
+        self.artist_resolver.add(artist_id, artist_name)
+        return artist_id, artist_name
 
     def _upsert_concert(self, parsed: Dict, post, artist_id: int,
                         artist_name: str, title: str, introduction: str) -> Optional[int]:
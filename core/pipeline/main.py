@@ -11,7 +11,7 @@ import traceback
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from lib.config import Config
-from lib.db_utils import get_db_manager, get_dev_db_manager, get_stage_db_manager
+from lib.db_utils import get_db_manager, get_dev_db_manager, get_stage_db_manager, db_session
 from lib.discord_notifier import notify_kopis_done
 from core.pipeline.data_pipeline import DataPipeline
 from tools.database.upsert_csv_to_mysql import upsert_table
@@ -48,17 +48,15 @@ DB_FACTORIES = {
 }
 
 
-def run_auto_pipeline(db_factory, pipeline, db_label: str = "dev"):
-    """수집 후 upsert까지 전 과정 자동 실행"""
-    print("\n[1/7] CSV 데이터 수집 완료 (main pipeline 실행됨)")
-
+def _run_auto_steps(db) -> bool:
+    """run_auto_pipeline의 2~7단계 (열린 DB 연결 공유)"""
     print("\n[2/7] artists upsert 중...")
-    if not upsert_table("artists", "artists.csv", db=db_factory()):
+    if not upsert_table("artists", "artists.csv", db=db):
         print("❌ artists upsert 실패")
         return False
 
     print("\n[3/7] concerts upsert 중...")
-    if not upsert_table("concerts", "concerts.csv", db=db_factory()):
+    if not upsert_table("concerts", "concerts.csv", db=db):
         print("❌ concerts upsert 실패")
         return False
 
@@ -66,7 +64,7 @@ def run_auto_pipeline(db_factory, pipeline, db_label: str = "dev"):
     populate_schedules()
 
     print("\n[5/7] schedule upsert 중...")
-    if not upsert_table("schedule", "schedule.csv", db=db_factory()):
+    if not upsert_table("schedule", "schedule.csv", db=db):
         print("❌ schedule upsert 실패")
         return False
 
@@ -74,10 +72,25 @@ def run_auto_pipeline(db_factory, pipeline, db_label: str = "dev"):
     update_concert_genres()
 
     print("\n[7/7] concert_genres upsert 중...")
-    if not upsert_table("concert_genres", "concert_genres.csv", db=db_factory()):
+    if not upsert_table("concert_genres", "concert_genres.csv", db=db):
         print("❌ concert_genres upsert 실패")
         return False
 
+    return True
+
+
+def run_auto_pipeline(db_factory, pipeline, db_label: str = "dev"):
+    """수집 후 upsert까지 전 과정 자동 실행"""
+    print("\n[1/7] CSV 데이터 수집 완료 (main pipeline 실행됨)")
+
+    # SSH 터널/DB 연결은 한 번만 열고 모든 upsert 단계가 공유
+    with db_session(db_factory) as db:
+        if db is None:
+            print("❌ DB 연결 실패")
+            return False
+        if not _run_auto_steps(db):
+            return False
+
     print(f"\n[CSV 백업] 타임스탬프 폴더에 복사 중...")
     pipeline.copy_to_run_dir("schedule.csv", "concert_genres.csv")
 
@@ -104,6 +117,8 @@ def main():
     parser.add_argument('--auto', action='store_true', help='수집 후 DB upsert까지 자동 실행')
     parser.add_argument('--db', choices=['dev', 'prod', 'stage'], default='dev',
                         help='--auto 시 사용할 DB (기본: dev)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='이전 실행 이후 새로 생겼거나 바뀐 공연만 상세 조회 (날짜 범위 모드)')
 
     args = parser.parse_args()
 
@@ -128,7 +143,7 @@ def main():
         else:
             # 기존 방식: 날짜 범위 입력
             start_date, end_date = get_date_input()
-            pipeline = DataPipeline(start_date=start_date, end_date=end_date)
+            pipeline = DataPipeline(start_date=start_date, end_date=end_date, incremental=args.incremental)
 
         # 파이프라인 실행
         if args.stage:
@@ -146,8 +161,13 @@ def main():
             db_factory = DB_FACTORIES[args.db]
             print(f"\n--auto 모드: [{args.db}] DB에 upsert 시작")
             if not run_auto_pipeline(db_factory, pipeline, db_label=args.db):
+                # 증분 기록을 남기지 않아 다음 실행에서 같은 공연을 다시 처리
                 sys.exit(1)
 
+        # 증분 모드: CSV 저장(--auto면 DB upsert)까지 성공한 뒤에만 처리한 코드 기록
+        if not args.stage:
+            pipeline.commit_sync_state()
+
     except KeyboardInterrupt:
         print("\n⚠️ 사용자가 중단했습니다.")
         sys.exit(1)
@@ -5,6 +5,7 @@
 """
 import sys
 import os
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import logging
@@ -12,6 +13,7 @@ import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from lib.config import Config
+from lib.concert_dates import compute_status
 
 logging.basicConfig(
     level=getattr(logging, Config.LOG_LEVEL, 'INFO'),
@@ -61,22 +63,19 @@ class ConcertStatusUpdater:
                 logger.warning(f"날짜 컬럼이 없어 상태 업데이트 불가: {filepath}")
                 return 0
             
-            updated_count = 0
-            original_status_col = 'status' if 'status' in df.columns else None
-            
-            # 새로운 상태 계산
-            for idx, row in df.iterrows():
-                new_status = self._calculate_status(row['start_date'], row['end_date'])
-                old_status = row.get('status', '') if original_status_col else ''
-                
-                # 상태가 변경된 경우만 업데이트
-                if new_status != old_status:
-                    df.at[idx, 'status'] = new_status
-                    updated_count += 1
-                    
-                    # 로그 출력
-                    title = row.get('title', row.get('prfnm', '알 수 없는 콘서트'))
-                    logger.debug(f"상태 변경: {title} [{old_status}] -> [{new_status}]")
+            # 새로운 상태 계산 (전체 컬럼을 한 번에)
+            new_status = compute_status(df['start_date'], df['end_date'], today=self.today_date)
+            old_status = df['status'].fillna('').astype(str) if 'status' in df.columns else pd.Series('', index=df.index)
+            changed = old_status.to_numpy() != new_status
+            updated_count = int(changed.sum())
+
+            # 상태가 변경된 경우만 로그 출력
+            if logger.isEnabledFor(logging.DEBUG):
+                title_col = 'title' if 'title' in df.columns else ('prfnm' if 'prfnm' in df.columns else None)
+                for idx in np.flatnonzero(changed):
+                    title = df[title_col].iloc[idx] if title_col else '알 수 없는 콘서트'
+                    logger.debug(f"상태 변경: {title} [{old_status.iloc[idx]}] -> [{new_status[idx]}]")
+            df['status'] = new_status
             
             # 변경사항이 있으면 파일 저장
             if updated_count > 0:
@@ -88,58 +87,6 @@ class ConcertStatusUpdater:
             logger.error(f"CSV 파일 업데이트 실패: {filepath} - {e}")
             return 0
     
-    def _calculate_status(self, start_date: str, end_date: str) -> str:
-        """날짜를 기반으로 콘서트 상태 계산"""
-        try:
-            # 날짜 형식 파싱 (YYYYMMDD 또는 YYYY.MM.DD 또는 YYYY-MM-DD)
-            start = self._parse_date(start_date)
-            end = self._parse_date(end_date)
-            
-            if not start or not end:
-                return 'UNKNOWN'
-            
-            # 상태 결정
-            if self.today_date < start:
-                return 'UPCOMING'  # 공연 예정
-            elif start <= self.today_date <= end:
-                return 'ONGOING'   # 공연 중
-            else:
-                return 'COMPLETED' # 공연 완료
-                
-        except Exception as e:
-            logger.error(f"날짜 파싱 실패: {start_date}, {end_date} - {e}")
-            return 'UNKNOWN'
-    
-    def _parse_date(self, date_str: str):
-        """다양한 형식의 날짜를 파싱"""
-        if not date_str or pd.isna(date_str):
-            return None
-        
-        date_str = str(date_str).strip()
-        
-        # YYYYMMDD 형식
-        if len(date_str) == 8 and date_str.isdigit():
-            try:
-                return datetime.strptime(date_str, '%Y%m%d').date()
-            except:
-                pass
-        
-        # YYYY.MM.DD 형식
-        if '.' in date_str:
-            try:
-                return datetime.strptime(date_str, '%Y.%m.%d').date()
-            except:
-                pass
-        
-        # YYYY-MM-DD 형식
-        if '-' in date_str:
-            try:
-                return datetime.strptime(date_str, '%Y-%m-%d').date()
-            except:
-                pass
-        
-        return None
-    
     def show_status_summary(self):
         """현재 상태 요약 표시"""
         concerts_file = os.path.join(Config.OUTPUT_DIR, 'concerts.csv')
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
 콘서트 상태 업데이트 스크립트
+기본: DB 안에서 UPCOMING/ONGOING 공연의 날짜를 파싱해 경계를 넘은 공연만 상태 변경 (set-based)
+--calendar: concerts.next_status_at(다음 전환일, tools/database/migrate_concert_calendar.py)이
+            오늘 이전이거나 비어 있는 공연만 읽어 처리 (변경 수에 비례하는 비용)
+--csv: 기존 방식
 1. DB에서 UPCOMING/ONGOING 공연만 가져와서 CSV 저장
 2. CSV에서 start_date / end_date 비교 후 status 갱신
 3. 갱신된 CSV 내용을 DB에 UPDATE 반영
@@ -9,13 +13,17 @@
 import os
 import sys
 import shutil
+import argparse
 import pandas as pd
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 import logging
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from lib.db_utils import get_db_manager
 from lib.config import Config
+from lib.discord_notifier import notify_status_done
+from lib.concert_dates import compute_status, next_transition
 
 
 logging.basicConfig(
@@ -24,6 +32,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 저장된 날짜 문자열(YYYY.MM.DD, YYYY-MM-DD, YYYYMMDD) → DATE, 파싱 실패 시 NULL
+_SQL_PARSE_DATE = (
+    "COALESCE(STR_TO_DATE({col}, '%Y.%m.%d'), STR_TO_DATE({col}, '%Y-%m-%d'), "
+    "STR_TO_DATE({col}, '%Y%m%d'))"
+)
+
 
 class ConcertStatusUpdater:
     def __init__(self):
@@ -32,7 +46,8 @@ class ConcertStatusUpdater:
 
     def download_table(self):
         """MySQL → CSV 다운로드 (UPCOMING/ONGOING만)"""
-        db = get_db_manager()
+        # 다운로드/반영 두 단계가 같은 터널과 풀을 재사용
+        db = get_db_manager(pooled=True)
         if not db.connect_with_ssh():
             return False
 
@@ -80,12 +95,10 @@ class ConcertStatusUpdater:
             logger.error("❌ start_date, end_date 컬럼 없음.")
             return 0
 
-        updated_count = 0
-        for idx, row in df.iterrows():
-            new_status = self._calculate_status(row["start_date"], row["end_date"])
-            if row.get("status", "") != new_status:
-                df.at[idx, "status"] = new_status
-                updated_count += 1
+        new_status = compute_status(df["start_date"], df["end_date"], today=self.today_date)
+        old_status = df["status"].fillna("").astype(str).to_numpy() if "status" in df.columns else ""
+        updated_count = int((old_status != new_status).sum())
+        df["status"] = new_status
 
         if updated_count > 0:
             df.to_csv(self.csv_file, index=False, encoding="utf-8-sig")
@@ -103,7 +116,7 @@ class ConcertStatusUpdater:
 
         df = pd.read_csv(self.csv_file, encoding="utf-8-sig")
 
-        db = get_db_manager()
+        db = get_db_manager(pooled=True)
         if not db.connect_with_ssh():
             return False
 
@@ -129,41 +142,162 @@ class ConcertStatusUpdater:
         finally:
             db.disconnect()
 
-    def _calculate_status(self, start_date, end_date):
-        """날짜 기반 상태 계산"""
+    def transition_in_db(self) -> Optional[Dict[str, List[Tuple[int, str]]]]:
+        """DB 안에서 상태 계산 후 바뀌는 공연만 UPDATE, {새 상태: [(id, 공연명), ...]} 반환 (연결/쿼리 실패 시 None)
+
+        날짜 파싱과 비교는 SELECT 한 번으로 처리하고 (strict 모드에서 UPDATE 중 날짜 파싱 경고가
+        에러로 바뀌지 않도록), 실제 변경은 새 상태별 UPDATE ... WHERE id IN (...) 으로 묶어서 실행
+        """
+        db = get_db_manager(pooled=True)
+        if not db.connect_with_ssh():
+            logger.error("❌ DB 연결 실패")
+            return None
+
         try:
-            start = self._parse_date(start_date)
-            end = self._parse_date(end_date)
-            if not start or not end:
-                return "UNKNOWN"
-
-            if self.today_date < start:
-                return "UPCOMING"
-            elif start <= self.today_date <= end:
-                return "ONGOING"
-            else:
-                return "COMPLETED"
-        except:
-            return "UNKNOWN"
-
-    def _parse_date(self, date_str):
-        """다양한 날짜 형식 파싱"""
-        if pd.isna(date_str) or not date_str:
+            start = _SQL_PARSE_DATE.format(col="start_date")
+            end = _SQL_PARSE_DATE.format(col="end_date")
+            db.cursor.execute(f"""
+                SELECT id, title, new_status FROM (
+                    SELECT id, title, status,
+                        CASE
+                            WHEN s IS NULL OR e IS NULL THEN 'UNKNOWN'
+                            WHEN %s < s THEN 'UPCOMING'
+                            WHEN %s <= e THEN 'ONGOING'
+                            ELSE 'COMPLETED'
+                        END AS new_status
+                    FROM (
+                        SELECT id, title, status, {start} AS s, {end} AS e
+                        FROM concerts
+                        WHERE status IN ('UPCOMING', 'ONGOING')
+                    ) AS parsed
+                ) AS computed
+                WHERE new_status <> status
+            """, (self.today_date, self.today_date))
+
+            transitions = {}
+            for concert_id, title, new_status in db.cursor.fetchall():
+                transitions.setdefault(new_status, []).append((concert_id, title))
+
+            if not transitions:
+                logger.info("⚪ 업데이트할 상태 없음")
+                return {}
+
+            for new_status, concerts in transitions.items():
+                ids = [concert_id for concert_id, _ in concerts]
+                placeholders = ", ".join(["%s"] * len(ids))
+                db.cursor.execute(f"""
+                    UPDATE concerts
+                    SET status = %s, updated_at = NOW()
+                    WHERE id IN ({placeholders}) AND status IN ('UPCOMING', 'ONGOING')
+                """, (new_status, *ids))
+                logger.info(f"✅ {new_status}: {len(ids)}개")
+            db.commit()
+
+            logger.info(f"🎉 DB 반영 완료 ({sum(len(c) for c in transitions.values())}개 레코드)")
+            return transitions
+
+        except Exception as e:
+            logger.error(f"❌ DB 상태 전환 실패: {e}")
+            db.rollback()
             return None
-        s = str(date_str).strip()
+        finally:
+            db.disconnect()
 
-        for fmt in ("%Y%m%d", "%Y-%m-%d", "%Y.%m.%d"):
-            try:
-                return datetime.strptime(s, fmt).date()
-            except:
-                continue
-        return None
+    def transition_by_calendar(self) -> Optional[Dict[str, List[Tuple[int, str]]]]:
+        """다음 전환일이 오늘 이전(또는 미계산)인 공연만 상태/전환일 갱신, {새 상태: [(id, 공연명), ...]} 반환 (실패 시 None)
+
+        next_status_at은 날짜/상태가 바뀌면 트리거가 NULL로 되돌리므로 다른 경로로 수정된 공연도 다시 계산됨
+        """
+        db = get_db_manager(pooled=True)
+        if not db.connect_with_ssh():
+            logger.error("❌ DB 연결 실패")
+            return None
+
+        try:
+            db.cursor.execute("""
+                SELECT id, title, status, start_date, end_date FROM concerts
+                WHERE status IN ('UPCOMING', 'ONGOING')
+                  AND (next_status_at IS NULL OR next_status_at <= %s)
+            """, (self.today_date,))
+            df = pd.DataFrame(db.cursor.fetchall(), columns=["id", "title", "status", "start_date", "end_date"])
+            if df.empty:
+                logger.info("⚪ 오늘 전환할 공연 없음")
+                return {}
+
+            df["new_status"] = compute_status(df["start_date"], df["end_date"], today=self.today_date)
+            next_at = next_transition(df["new_status"], df["start_date"], df["end_date"])
+            df["next_status_at"] = [d.date() if pd.notna(d) else None for d in next_at]
+            changed = df["status"] != df["new_status"]
+
+            # 상태가 바뀐 공연: 상태 + 전환일 + updated_at, 그대로인 공연(전환일만 미계산): 전환일만
+            for frame, with_status in ((df[changed], True), (df[~changed], False)):
+                for i in range(0, len(frame), Config.UPSERT_BATCH_SIZE):
+                    self._update_calendar_chunk(db, frame.iloc[i:i + Config.UPSERT_BATCH_SIZE], with_status)
+            db.commit()
+
+            transitions = {}
+            for row in df[changed].itertuples():
+                transitions.setdefault(row.new_status, []).append((row.id, row.title))
+            for new_status, concerts in transitions.items():
+                logger.info(f"✅ {new_status}: {len(concerts)}개")
+            logger.info(f"🎉 DB 반영 완료 (확인 {len(df)}개, 상태 변경 {int(changed.sum())}개)")
+            return transitions
+
+        except Exception as e:
+            logger.error(f"❌ DB 상태 전환 실패: {e}")
+            db.rollback()
+            return None
+        finally:
+            db.disconnect()
+
+    @staticmethod
+    def _update_calendar_chunk(db, frame, with_status: bool):
+        """id별 값이 다른 UPDATE를 CASE 한 문장으로 묶어서 실행"""
+        if frame.empty:
+            return
+        ids = frame["id"].tolist()
+        next_case = " ".join(["WHEN %s THEN %s"] * len(ids))
+        params = [v for pair in zip(ids, frame["next_status_at"]) for v in pair]
+        assignments = f"next_status_at = CASE id {next_case} END"
+        if with_status:
+            status_case = " ".join(["WHEN %s THEN %s"] * len(ids))
+            params += [v for pair in zip(ids, frame["new_status"]) for v in pair]
+            assignments += f", status = CASE id {status_case} END, updated_at = NOW()"
+        placeholders = ", ".join(["%s"] * len(ids))
+        db.cursor.execute(
+            f"UPDATE concerts SET {assignments} WHERE id IN ({placeholders})",
+            (*params, *ids)
+        )
 
 
 def main():
+    parser = argparse.ArgumentParser(description="콘서트 상태(UPCOMING/ONGOING/COMPLETED) 일일 업데이트")
+    parser.add_argument("--csv", action="store_true", help="CSV 다운로드 → 계산 → 행별 UPDATE 기존 방식 사용")
+    parser.add_argument("--calendar", action="store_true",
+                        help="next_status_at 전환일 기준으로 오늘 바뀌는 공연만 처리 (STATUS_CALENDAR=true와 동일)")
+    args = parser.parse_args()
+
     updater = ConcertStatusUpdater()
     print("🚀 콘서트 상태 업데이트 시작")
 
+    if not args.csv:
+        if args.calendar or Config.STATUS_CALENDAR:
+            transitions = updater.transition_by_calendar()
+        else:
+            transitions = updater.transition_in_db()
+        if transitions is None:
+            # "전환할 공연 없음"({})과 구분해서 cron이 실패로 인식하도록 0이 아닌 코드로 종료
+            print("❌ 상태 업데이트 실패")
+            sys.exit(1)
+        notify_status_done(
+            webhook_url=Config.DISCORD_WEBHOOK_URL,
+            db_label="프로덕션",
+            transitions={status: [f"{title} (id={concert_id})" for concert_id, title in concerts]
+                         for status, concerts in transitions.items()},
+        )
+        print("✅ 전체 프로세스 완료!")
+        return
+
     download_ok = updater.download_table()
 
     if not download_ok:
@@ -171,9 +305,12 @@ def main():
 
     if download_ok or os.path.exists(updater.csv_file):
         updater.update_status_in_csv()
-        updater.apply_updates_to_db()
+        if not updater.apply_updates_to_db():
+            print("❌ 상태 업데이트 실패")
+            sys.exit(1)
     else:
         logger.error("❌ CSV 없음. 업데이트 중단.")
+        sys.exit(1)
 
     print("✅ 전체 프로세스 완료!")
 
@@ -135,6 +135,7 @@ async def add_command(interaction: discord.Interaction):
     info = await get_request_info(interaction.channel)
     request_id = int(info["request_id"])
 
+    # 봇 배포 환경에는 시스템 ssh 명령이 없을 수 있어 lib.db_utils(ssh 명령) 대신 paramiko 기반 터널 사용
     from tools.database.ssh_mysql_connection import SSHMySQLConnection
     ssh_config = {
         'host': Config.DB_SSH_HOST, 'port': Config.DB_SSH_PORT,
@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Optional, Tuple
 from lib.config import Config
 from lib.prompts import DataCollectionPrompts
+from lib.artist_resolver import ArtistResolver
 from core.apis.serper_api import SerperAPI
 
 logger = logging.getLogger(__name__)
@@ -42,38 +43,15 @@ def parse_extraction_embed(embed) -> dict:
     return result
 
 
-def upsert_artist(db, artist_name: str, data_collector) -> Tuple[Optional[int], bool]:
+def upsert_artist(db, artist_name: str, data_collector,
+                  resolver: Optional[ArtistResolver] = None) -> Tuple[Optional[int], bool]:
     """아티스트 upsert. (artist_id, is_new) 반환. 대소문자/공백 무시하고 매칭."""
-    # 1차: 정확 일치
-    db.cursor.execute("SELECT id FROM artists WHERE artist = %s", (artist_name,))
-    row = db.cursor.fetchone()
-    if row:
-        return row[0], False
-
-    # 2차: 한국어명(괄호 안) 기준 매칭
-    korean_match = re.search(r'\(([가-힣\s]+)\)', artist_name)
-    if korean_match:
-        korean_name = korean_match.group(1).strip()
-        db.cursor.execute(
-            "SELECT id FROM artists WHERE artist LIKE %s LIMIT 1",
-            (f'%({korean_name})%',)
-        )
-        row = db.cursor.fetchone()
-        if row:
-            return row[0], False
-
-    # 3차: 영문명 부분만 공백/대소문자 무시하고 매칭
-    english_part = artist_name.split('(')[0].strip()
-    if english_part:
-        english_normalized = english_part.replace(' ', '').lower()
-        db.cursor.execute(
-            "SELECT id FROM artists "
-            "WHERE LOWER(REPLACE(TRIM(SUBSTRING_INDEX(artist, '(', 1)), ' ', '')) = %s LIMIT 1",
-            (english_normalized,)
-        )
-        row = db.cursor.fetchone()
-        if row:
-            return row[0], False
+    # 완전 일치 → 한국어명(괄호 안) → 영문명 순으로 인메모리 인덱스에서 매칭
+    if resolver is None:
+        resolver = ArtistResolver(db, preload=not Config.ARTIST_INDEXED_LOOKUP)
+    existing = resolver.resolve(artist_name)
+    if existing:
+        return existing[0], False
 
     # 못 찾았으면 신규 생성
     info = data_collector._collect_artist_basic_info(artist_name) or {}
@@ -89,7 +67,9 @@ def upsert_artist(db, artist_name: str, data_collector) -> Tuple[Optional[int],
         now, now,
     ))
     db.commit()
-    return db.cursor.lastrowid, True
+    artist_id = db.cursor.lastrowid
+    resolver.add(artist_id, artist_name)
+    return artist_id, True
 
 
 def _to_dot_format(date_str: str) -> str:
@@ -235,7 +215,7 @@ def _insert_ticketing_schedule(db, concert_id: int, artist_name: str, concert_ti
                                  start_date: str, end_date: str, data_collector) -> list:
     """공식 소스에서 예매 일정(선예매/일반예매) 검색 후 schedule 테이블에 저장. 추가된 항목 리스트 반환."""
     query = DataCollectionPrompts.get_schedule_info_prompt(artist_name, concert_title, start_date, end_date)
-    response = data_collector.api.query_json(query, use_search=True)
+    response = data_collector.api.query_json(query, use_search=True, schema_type='schedule_info')
 
     if not response:
         return []
@@ -0,0 +1,157 @@
+"""
+아티스트명 매칭용 인메모리 인덱스
+artists 테이블을 한 번 읽어 정규화된 영문명/한국어명 딕셔너리로 만들고 O(1)로 기존 아티스트를 찾음
+(예: "Hump Back (험프 백)" == DB의 "Humpback (험프백)")
+
+artists에 정규화 컬럼(tools/database/migrate_artist_keys.py)이 있으면 preload=False로
+전체를 읽지 않고 인덱스 조회만 할 수 있음
+"""
+import logging
+import re
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+KOREAN_PART_PATTERN = re.compile(r'\(([가-힣\s]+)\)')
+
+# MySQL 생성 컬럼 (english_key/korean_key와 같은 규칙, CSV 다운로드 시 제외)
+ARTIST_KEY_COLUMNS = {
+    'artist_en_key': "LOWER(REPLACE(TRIM(SUBSTRING_INDEX(artist, '(', 1)), ' ', ''))",
+    # korean_part와 같이 한글/공백으로만 된 첫 번째 괄호 내용 (MySQL 8 정규식 함수)
+    'artist_ko_key': (
+        "NULLIF(REGEXP_REPLACE(REGEXP_SUBSTR(artist, '\\\\([가-힣[:space:]]+\\\\)'), "
+        "'[()[:space:]]', ''), '')"
+    ),
+}
+
+
+def name_key(artist_name: str) -> str:
+    """완전 일치 비교용 키 (artist 컬럼 콜레이션처럼 대소문자와 뒤쪽 공백 무시)"""
+    return (artist_name or '').casefold().rstrip()
+
+
+def korean_part(artist_name: str) -> str:
+    """'영문 (한국어)' 형식의 괄호 안 한국어명 (없으면 빈 문자열)"""
+    match = KOREAN_PART_PATTERN.search(artist_name or '')
+    return match.group(1).strip() if match else ''
+
+
+def korean_key(artist_name: str) -> str:
+    """한국어명 공백 제거 (artist_ko_key 컬럼과 같은 값)"""
+    return re.sub(r'\s+', '', korean_part(artist_name))
+
+
+def english_key(artist_name: str) -> str:
+    """괄호 앞 영문명을 공백 제거·소문자로 정규화 (예: "Hump Back (험프 백)" → "humpback")"""
+    return (artist_name or '').split('(')[0].strip().replace(' ', '').lower()
+
+
+class ArtistResolver:
+    """이름 기반 아티스트 중복 검사 (완전 일치 → 한국어명 → 공백 제거 한국어명 → 영문명 순)
+
+    - 완전 일치는 기존 WHERE artist = %s 와 같게 대소문자/뒤쪽 공백 차이를 무시 (name_key)
+    - db를 주면 첫 조회 때 artists 전체를 한 번만 읽음
+    - 새 아티스트를 INSERT한 뒤 add()로 반영하거나 refresh()로 늘어난 id만 다시 읽음
+    - 같은 키에 여러 아티스트가 있으면 id가 가장 작은(먼저 등록된) 쪽을 사용
+    - preload=False면 전체를 읽지 않고 artist_en_key/artist_ko_key 인덱스로 조회 (찾은 결과는 캐시)
+    """
+
+    def __init__(self, db=None, preload: bool = True):
+        self.db = db
+        self.preload = preload
+        self.loaded = db is None or not preload
+        self.max_id = 0
+        self.by_name: Dict[str, Tuple[int, str]] = {}
+        self.by_korean: Dict[str, Tuple[int, str]] = {}
+        self.by_korean_no_space: Dict[str, Tuple[int, str]] = {}
+        self.by_english: Dict[str, Tuple[int, str]] = {}
+
+    def load(self):
+        """artists 테이블 전체를 읽어 인덱스 구성"""
+        self.db.cursor.execute("SELECT id, artist FROM artists ORDER BY id")
+        for artist_id, artist_name in self.db.cursor.fetchall():
+            self.add(artist_id, artist_name)
+        self.loaded = True
+        logger.info(f"아티스트 인덱스 로드: {len(self.by_name)}명")
+
+    def refresh(self):
+        """마지막으로 읽은 id 이후에 추가된 아티스트만 반영 (PK 범위 조회)"""
+        if not self.preload:
+            return
+        if not self.loaded:
+            self.load()
+            return
+        self.db.cursor.execute(
+            "SELECT id, artist FROM artists WHERE id > %s ORDER BY id", (self.max_id,)
+        )
+        for artist_id, artist_name in self.db.cursor.fetchall():
+            self.add(artist_id, artist_name)
+
+    def add(self, artist_id, artist_name: str):
+        """아티스트 한 명을 인덱스에 추가 (이미 있는 키는 유지)"""
+        if not artist_name:
+            return
+        entry = (artist_id, artist_name)
+        self.by_name.setdefault(name_key(artist_name), entry)
+
+        korean = korean_part(artist_name)
+        if korean:
+            self.by_korean.setdefault(korean, entry)
+            self.by_korean_no_space.setdefault(korean.replace(' ', ''), entry)
+
+        english = english_key(artist_name)
+        if english:
+            self.by_english.setdefault(english, entry)
+
+        if isinstance(artist_id, int) and artist_id > self.max_id:
+            self.max_id = artist_id
+
+    def resolve(self, artist_name: str) -> Optional[Tuple[int, str]]:
+        """기존 아티스트가 있으면 (id, DB의 artist명), 없으면 None"""
+        if not artist_name:
+            return None
+        if not self.loaded:
+            self.load()
+
+        # 1차: 완전 일치 (콜레이션 기준)
+        entry = self.by_name.get(name_key(artist_name))
+        if entry:
+            return entry
+
+        # 인덱스 조회 모드: 캐시의 한국어명/영문명 매칭이 DB의 더 앞 순위 매칭을 가리지 않도록 DB를 먼저 조회
+        # (캐시는 아직 커밋되지 않은 add() 항목용)
+        if self.db is not None and not self.preload:
+            entry = self._lookup(artist_name)
+            if entry:
+                self.add(*entry)
+                return entry
+
+        # 2차: 한국어명(괄호 안) 매칭, 공백 차이 허용 (예: "험프 백" == "험프백")
+        korean = korean_part(artist_name)
+        if korean:
+            entry = self.by_korean.get(korean) or self.by_korean_no_space.get(korean.replace(' ', ''))
+            if entry:
+                return entry
+
+        # 3차: 영문명만 공백·대소문자 무시
+        english = english_key(artist_name)
+        if english:
+            entry = self.by_english.get(english)
+            if entry:
+                return entry
+        return None
+
+    def _lookup(self, artist_name: str) -> Optional[Tuple[int, str]]:
+        """정규화 컬럼 인덱스로 같은 순서(완전 일치 → 한국어명 → 영문명) 조회"""
+        lookups = [("artist", artist_name), ("artist_ko_key", korean_key(artist_name)),
+                   ("artist_en_key", english_key(artist_name))]
+        for column, value in lookups:
+            if not value:
+                continue
+            self.db.cursor.execute(
+                f"SELECT id, artist FROM artists WHERE {column} = %s ORDER BY id LIMIT 1", (value,)
+            )
+            row = self.db.cursor.fetchone()
+            if row:
+                return row[0], row[1]
+        return None
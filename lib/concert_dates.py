@@ -0,0 +1,98 @@
+"""
+콘서트 날짜 파싱 / 상태 계산 / 정렬 공통 모듈
+YYYYMMDD, YYYY.MM.DD, YYYY-MM-DD (+ YYYY/MM/DD) 형식이 섞인 날짜를 처리
+- 컬럼 단위(pandas/NumPy): parse_date_column, compute_status, next_transition, sort_positions
+- 값 단위(수집 중 한 건씩 판단할 때): parse_date, determine_status
+"""
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+UPCOMING = 'UPCOMING'
+ONGOING = 'ONGOING'
+COMPLETED = 'COMPLETED'
+UNKNOWN = 'UNKNOWN'
+
+# sort_positions 그룹 순서: 완료(최근 것 먼저) → 진행 중 → 예정(가까운 것 먼저) → 그 외
+_STATUS_GROUP = {COMPLETED: 0, ONGOING: 1, UPCOMING: 2}
+
+
+def _clean(values) -> pd.Series:
+    """문자열로 통일 (CSV에서 float로 읽힌 20250101.0 같은 값도 처리), 빈 값은 NA"""
+    s = pd.Series(values, copy=False).astype('string').str.strip().str.removesuffix('.0')
+    return s.mask(s == '')
+
+
+def parse_date_column(values) -> pd.Series:
+    """날짜 컬럼 전체를 한 번에 파싱, 실패는 NaT
+
+    YYYYMMDD는 그대로, 나머지는 구분자(. /)를 '-'로 통일해 형식별 파싱을 두 번으로 줄임
+    """
+    s = _clean(values)
+    compact = (s.str.len().eq(8) & s.str.isdigit()).fillna(False).astype(bool)
+    normalized = s.str.replace('.', '-', regex=False).str.replace('/', '-', regex=False)
+    parsed = pd.to_datetime(normalized.mask(compact), format='%Y-%m-%d', errors='coerce')
+    if compact.any():
+        parsed[compact] = pd.to_datetime(s[compact], format='%Y%m%d', errors='coerce')
+    return parsed
+
+
+def compute_status(start_dates, end_dates, today: Optional[date] = None,
+                   completed_label: str = COMPLETED, end_defaults_to_start: bool = False) -> np.ndarray:
+    """시작일/종료일 컬럼으로 상태 배열 계산
+
+    - 오늘 < 시작일: UPCOMING / 시작일 <= 오늘 <= 종료일: ONGOING / 그 외: completed_label
+    - 날짜를 파싱할 수 없으면 UNKNOWN
+    - end_defaults_to_start=True면 종료일이 비어 있을 때 시작일을 종료일로 사용
+    """
+    today = pd.Timestamp(today or date.today())
+    start = parse_date_column(start_dates)
+    end = parse_date_column(end_dates)
+    end.index = start.index
+    if end_defaults_to_start:
+        end = end.where(_clean(end_dates).set_axis(start.index).notna(), start)
+
+    return np.select(
+        [start.isna() | end.isna(), today < start, today <= end],
+        [UNKNOWN, UPCOMING, ONGOING],
+        default=completed_label,
+    )
+
+
+def next_transition(status, start_dates, end_dates) -> pd.Series:
+    """다음 상태 전환일 (UPCOMING → 시작일에 ONGOING, ONGOING → 종료일 다음 날에 COMPLETED), 그 외 NaT"""
+    status = pd.Series(status, copy=False).astype(object)
+    start = parse_date_column(start_dates).set_axis(status.index)
+    end = parse_date_column(end_dates).set_axis(status.index)
+    next_at = pd.Series(pd.NaT, index=status.index, dtype='datetime64[ns]')
+    next_at = next_at.mask(status == UPCOMING, start)
+    return next_at.mask(status == ONGOING, end + pd.Timedelta(days=1))
+
+
+def sort_positions(status, start_dates, fallback: Optional[date] = None) -> np.ndarray:
+    """정렬 순서(행 위치 배열): COMPLETED는 시작일 내림차순, ONGOING/UPCOMING은 오름차순
+
+    시작일을 파싱할 수 없는 행은 fallback(기본 오늘) 날짜로 취급
+    """
+    status = pd.Series(status, copy=False).astype(object)
+    start = parse_date_column(start_dates).fillna(pd.Timestamp(fallback or date.today()))
+    days = start.to_numpy(dtype='datetime64[D]').astype(np.int64)
+    group = status.map(_STATUS_GROUP).fillna(len(_STATUS_GROUP)).to_numpy(dtype=np.int64)
+    day_key = np.where(group == _STATUS_GROUP[COMPLETED], -days, days)
+    # np.lexsort는 마지막 키가 1순위
+    return np.lexsort((day_key, group))
+
+
+def parse_date(value) -> Optional[date]:
+    """날짜 값 하나 파싱 (parse_date_column을 그대로 사용), 실패 시 None"""
+    parsed = parse_date_column([value]).iloc[0]
+    return None if pd.isna(parsed) else parsed.date()
+
+
+def determine_status(start_date, end_date, today: Optional[date] = None,
+                     completed_label: str = COMPLETED, end_defaults_to_start: bool = False) -> str:
+    """compute_status의 값 하나 버전 (같은 파싱/판정을 거쳐 빈 값·잘못된 날짜도 같은 결과)"""
+    return str(compute_status([start_date], [end_date], today=today, completed_label=completed_label,
+                              end_defaults_to_start=end_defaults_to_start)[0])
@@ -35,6 +35,13 @@ class Config:
     DB_SSH_PORT = int(os.getenv('DB_SSH_PORT', 22))
     DB_SSH_USER = os.getenv('DB_SSH_USER')
     
+    # SSH 터널 로컬 포트가 열릴 때까지 기다리는 최대 시간(초)
+    SSH_TUNNEL_TIMEOUT = float(os.getenv('SSH_TUNNEL_TIMEOUT', 15))
+
+    # 풀 모드(DatabaseManager(pooled=True)) 연결 수와 빈 연결을 기다리는 최대 시간(초)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+
     # 데이터베이스 설정 (프로덕션)
     DB_HOST = os.getenv('DB_HOST', 'localhost')
     DB_PORT = int(os.getenv('DB_PORT', 3306))
@@ -54,6 +61,18 @@ class Config:
     USE_GEMINI_API = os.getenv('USE_GEMINI_API', 'true').lower() == 'true'
     GEMINI_USE_SEARCH = os.getenv('GEMINI_USE_SEARCH', 'true').lower() == 'true'
     GEMINI_MODEL_VERSION = os.getenv('GEMINI_MODEL_VERSION', '2.0')
+    GEMINI_CACHE_ENABLED = os.getenv('GEMINI_CACHE_ENABLED', 'true').lower() == 'true'
+    # 콘서트 보강 항목(아티스트/소개/레이블/장르/제외 여부)을 한 번의 호출로 수집
+    GEMINI_COMBINED_ENRICHMENT = os.getenv('GEMINI_COMBINED_ENRICHMENT', 'false').lower() == 'true'
+    # DataPipeline 2/3단계(콘서트 보강, 아티스트 수집)에서 동시에 처리할 항목 수 (1이면 순차)
+    GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', 1))
+    # 프롬프트별 응답 스키마(lib/prompts.py PROMPT_RESPONSE_SCHEMAS)로 JSON을 직접 받음
+    GEMINI_STRUCTURED_OUTPUT = os.getenv('GEMINI_STRUCTURED_OUTPUT', 'true').lower() == 'true'
+    # 검색(grounding) 호출에도 스키마 적용 - 도구와 구조화 출력을 함께 지원하는 모델에서만 켤 것
+    GEMINI_SCHEMA_WITH_SEARCH = os.getenv('GEMINI_SCHEMA_WITH_SEARCH', 'false').lower() == 'true'
+    # Gemini 호출 예산 (요금제 한도에 맞춰 설정, 기본값은 무료 등급 gemini-2.5-flash 기준)
+    GEMINI_RPM = float(os.getenv('GEMINI_RPM', 10))
+    GEMINI_TPM = float(os.getenv('GEMINI_TPM', 250000))
     DISCORD_WEBHOOK_URL = os.getenv('DISCORD_WEBHOOK_URL')
     DISCORD_BOT_TOKEN = os.getenv('DISCORD_BOT_TOKEN')
     
@@ -62,6 +81,7 @@ class Config:
     OUTPUT_DIR = DATA_DIR / "main_output"
     TEST_OUTPUT_DIR = DATA_DIR / "test_output"
     BACKUP_DIR = DATA_DIR / "backups"
+    CACHE_DIR = DATA_DIR / "cache"
     LOGS_DIR = PROJECT_ROOT / "logs"
     
     # 로깅 설정
@@ -71,6 +91,37 @@ class Config:
     REQUEST_DELAY = int(os.getenv('REQUEST_DELAY', 2))
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', 3))
     TIMEOUT = int(os.getenv('TIMEOUT', 30))
+
+    # KOPIS 상세정보 병렬 수집 설정
+    KOPIS_MAX_WORKERS = int(os.getenv('KOPIS_MAX_WORKERS', 10))
+    KOPIS_CALLS_PER_SECOND = float(os.getenv('KOPIS_CALLS_PER_SECOND', 10))
+    # 공연 목록을 상태 × 월 단위로 동시에 조회 (core/apis/kopis_async_api.py)
+    KOPIS_ASYNC_LISTING = os.getenv('KOPIS_ASYNC_LISTING', 'false').lower() == 'true'
+
+    # CSV → MySQL 업서트 배치 크기 (여러 행을 한 INSERT ... ON DUPLICATE KEY UPDATE로 전송, 배치마다 커밋)
+    UPSERT_BATCH_SIZE = int(os.getenv('UPSERT_BATCH_SIZE', 500))
+    # 한 배치의 파라미터 크기 상한 (가사처럼 긴 컬럼이 max_allowed_packet을 넘지 않도록)
+    UPSERT_MAX_BATCH_BYTES = int(os.getenv('UPSERT_MAX_BATCH_BYTES', 8 * 1024 * 1024))
+    # 대상 테이블 행별 해시와 비교해 신규/변경 행만 전송 (dry-run이면 DB에 쓰지 않고 집계만)
+    UPSERT_DIFF = os.getenv('UPSERT_DIFF', 'false').lower() == 'true'
+    UPSERT_DRY_RUN = os.getenv('UPSERT_DRY_RUN', 'false').lower() == 'true'
+    # MySQL → CSV 다운로드 시 한 번에 받아오는 행 수 (unbuffered 커서 fetchmany 크기)
+    EXPORT_FETCH_SIZE = int(os.getenv('EXPORT_FETCH_SIZE', 2000))
+
+    # 가사/번역 결과 저널(lib/csv_journal.py)을 CSV에 병합하는 주기 (N건 또는 T초마다, 종료 시 항상)
+    CSV_JOURNAL_FLUSH_EVERY = int(os.getenv('CSV_JOURNAL_FLUSH_EVERY', 50))
+    CSV_JOURNAL_FLUSH_SECONDS = float(os.getenv('CSV_JOURNAL_FLUSH_SECONDS', 60))
+
+    # 콘서트 상태 일일 업데이트를 concerts.next_status_at(다음 전환일) 기준으로 처리
+    # (tools/database/migrate_concert_calendar.py 적용 후 켤 것)
+    STATUS_CALENDAR = os.getenv('STATUS_CALENDAR', 'false').lower() == 'true'
+
+    # artists 정규화 컬럼(artist_en_key/artist_ko_key) 인덱스로 아티스트 매칭
+    # (tools/database/migrate_artist_keys.py 적용 후 켤 것, 끄면 artists 전체를 읽어 메모리에서 매칭)
+    ARTIST_INDEXED_LOOKUP = os.getenv('ARTIST_INDEXED_LOOKUP', 'false').lower() == 'true'
+
+    # KOPIS 상세정보 로컬 캐시 (공연 상태별 TTL은 core/apis/kopis_cache.py 참고)
+    KOPIS_CACHE_ENABLED = os.getenv('KOPIS_CACHE_ENABLED', 'true').lower() == 'true'
     
     @classmethod
     def ensure_directories(cls):
@@ -0,0 +1,148 @@
+"""
+CSV 행 단위 변경 저널 (append-only 사이드카 파일)
+가사/번역처럼 한 곡씩 결과가 나올 때마다 CSV 전체를 다시 쓰지 않고
+변경 필드만 <파일명>.<작업명>.journal 에 한 줄(JSON)씩 추가한 뒤, N건 또는 T초마다 CSV에 한 번에 병합
+
+- 중단되어도 저널에 남은 변경은 다음 실행 시작 시 replay()로 복구
+- 병합은 임시 파일에 쓴 뒤 교체(atomic_write_csv)하므로 중간에 죽어도 CSV가 깨지지 않음
+- 같은 변경이 두 번 적용되어도 결과가 같아서 병합 직후 저널 비우기 전에 죽어도 안전
+"""
+import csv
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from lib.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write_csv(rows: List[Dict[str, str]], csv_path: Path, fieldnames: Iterable[str],
+                     quoting: int = csv.QUOTE_MINIMAL):
+    """같은 디렉토리의 임시 파일에 쓰고 os.replace로 교체
+
+    fieldnames에 없는 키가 행에 있으면 뒤에 덧붙여서 저장 (다른 작업이 추가한 컬럼이 사라지지 않도록)
+    """
+    fieldnames = list(fieldnames)
+    seen = set(fieldnames)
+    for row in rows:
+        for field in row:
+            if field not in seen:
+                seen.add(field)
+                fieldnames.append(field)
+    tmp_path = Path(f"{csv_path}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, quoting=quoting, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({field: row.get(field, '') for field in fieldnames})
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, csv_path)
+
+
+def row_key(row: Dict[str, str]) -> Tuple[str, ...]:
+    """행 식별 키 (id가 있으면 id, 없으면 제목 + 아티스트)"""
+    row_id = (row.get('id') or '').strip()
+    if row_id:
+        return ('id', row_id)
+    return ('title', (row.get('title') or '').strip(), (row.get('artist') or '').strip())
+
+
+class CsvJournal:
+    """CSV 행 변경 저널
+
+    with CsvJournal(csv_path, rows, write_rows, name='lyrics') as journal:
+        journal.record(row, lyrics=...)
+
+    - name: 작업별 저널 파일 구분 (같은 CSV를 다루는 다른 작업의 저널을 잘못 재생하지 않도록)
+    - write_rows(rows, csv_path) -> bool: 병합 시 CSV 전체 저장 (원자적으로 쓸 것)
+    - 진입 시 이전 실행에서 남은 저널을 rows에 반영하고 바로 병합
+    - 종료 시(예외/중단 포함) 남은 변경을 병합
+    """
+
+    def __init__(self, csv_path: Path, rows: List[Dict[str, str]],
+                 write_rows: Callable[[List[Dict[str, str]], Path], bool], name: str,
+                 flush_every: Optional[int] = None, flush_seconds: Optional[float] = None):
+        self.csv_path = Path(csv_path)
+        self.path = Path(f"{self.csv_path}.{name}.journal")
+        self.rows = rows
+        self.write_rows = write_rows
+        self.flush_every = max(1, flush_every or Config.CSV_JOURNAL_FLUSH_EVERY)
+        self.flush_seconds = Config.CSV_JOURNAL_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        self._file = None
+        self._index: Dict[Tuple[str, ...], List[Dict[str, str]]] = {}
+        for row in rows:
+            self._index.setdefault(row_key(row), []).append(row)
+
+    def __enter__(self):
+        replayed = self.replay()
+        if replayed:
+            logger.info(f"📒 저널 복구: {replayed}건 반영 ({self.path.name})")
+            self.checkpoint(force=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.checkpoint()
+        finally:
+            if self._file:
+                self._file.close()
+                self._file = None
+            # 모두 병합되었으면 빈 저널 파일은 정리
+            if self.path.exists() and self.path.stat().st_size == 0:
+                self.path.unlink()
+        return False
+
+    def replay(self) -> int:
+        """저널에 남은 변경을 rows에 반영, 반영한 건수 반환 (마지막 줄이 잘렸으면 무시)"""
+        if not self.path.exists():
+            return 0
+        applied = 0
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"저널 마지막 줄이 불완전해 건너뜀: {self.path.name}")
+                    break
+                for row in self._index.get(tuple(entry['key']), []):
+                    row.update(entry['fields'])
+                    applied += 1
+        self.pending += applied
+        return applied
+
+    def record(self, row: Dict[str, str], **fields):
+        """행에 필드 값을 반영하고 저널에 한 줄 추가 (조건이 되면 CSV 병합)"""
+        row.update(fields)
+        self._file.write(json.dumps({'key': row_key(row), 'fields': fields}, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.pending += 1
+
+        if (self.pending >= self.flush_every
+                or time.monotonic() - self.last_flush >= self.flush_seconds):
+            self.checkpoint()
+
+    def checkpoint(self, force: bool = False) -> bool:
+        """쌓인 변경을 CSV에 병합하고 저널 비우기"""
+        if not self.pending and not force:
+            return True
+        if not self.write_rows(self.rows, self.csv_path):
+            logger.error(f"💾 저널 병합 실패, 저널 유지: {self.path.name}")
+            return False
+
+        if self._file:
+            self._file.truncate(0)
+            self._file.seek(0)
+        elif self.path.exists():
+            self.path.unlink()
+        logger.info(f"💾 저널 병합 완료: {self.pending}건 → {self.csv_path.name}")
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        return True
@@ -2,20 +2,23 @@
 데이터 수집 핵심 로직
 """
 import logging
-import time
 import json
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import requests
 import pandas as pd
 from lib.data_models import Concert, Artist
 from lib.config import Config
 from lib.prompts import DataCollectionPrompts
+from lib.concert_dates import determine_status
 from core.apis.musicbrainz_api import MusicBrainzAPI
 from core.apis.serper_api import SerperAPI
 
 logger = logging.getLogger(__name__)
 
+# concert_genres의 genre_id ↔ 장르명 (lib/prompts.py get_concert_genre_prompt 기준)
+GENRE_NAMES = {1: 'JPOP', 2: 'ROCK_METAL', 3: 'RAP_HIPHOP', 4: 'INDIE', 5: 'POP'}
+
 
 class DataCollector:
     def __init__(self, api_client):
@@ -25,6 +28,8 @@ class DataCollector:
 
         self._artist_cache = {}
         self._title_artist_cache = {}
+        # 통합 보강에서 얻은 장르 (공연명 → 장르), 아티스트명 통일 후 prime_concert_genres로 캐시에 저장
+        self._pending_genres = {}
 
     def _validate_image_url(self, url: str) -> bool:
         """URL이 유효한 이미지인지 HEAD 요청으로 확인"""
@@ -92,8 +97,7 @@ class DataCollector:
 예시: {{"name": "RADWIMPS (라드윔프스)"}}, {{"name": "Charlie Puth (찰리 푸스)"}}"""
 
         try:
-            result = self.api.query_json(prompt, use_search=True)
-            time.sleep(1)
+            result = self.api.query_json(prompt, use_search=True, cache_type='korean_name')
             if result and isinstance(result, dict):
                 name = result.get('name', '')
                 if name and '(' in name and ')' in name:
@@ -103,6 +107,11 @@ class DataCollector:
             logger.warning(f"아티스트명 변환 실패: {e}")
         return artist_name
 
+    @staticmethod
+    def _is_valid_artist_name(raw_name: str) -> bool:
+        """구분자만 있거나 한 글자인 아티스트명 거부"""
+        return len(raw_name) > 1 and raw_name.lower() not in ['x', '&', 'ft.', 'vs']
+
     def _extract_artist_from_title(self, title: str) -> Optional[str]:
         """콘서트 제목에서 아티스트명 추출 후 '영문 (한국어)' 형식으로 변환"""
         if title in self._title_artist_cache:
@@ -110,12 +119,11 @@ class DataCollector:
             return self._title_artist_cache[title]
         try:
             query = DataCollectionPrompts.get_artist_name_prompt(title)
-            response = self.api.query_json(query, use_search=True)
-            time.sleep(6)
+            response = self.api.query_json(query, use_search=True, schema_type='artist_name')
 
             if response and response.get('artist'):
                 raw_name = response.get('artist').strip()
-                if len(raw_name) <= 1 or raw_name.lower() in ['x', '&', 'ft.', 'vs']:
+                if not self._is_valid_artist_name(raw_name):
                     logger.warning(f"유효하지 않은 아티스트명 거부: '{raw_name}'")
                     self._title_artist_cache[title] = None
                     return None
@@ -160,6 +168,116 @@ class DataCollector:
             logger.error(f"콘서트 정보 보강 실패: {e}")
             return concert
 
+    def enhance_concert_data_combined(self, concert: Concert) -> Optional[Concert]:
+        """콘서트 보강 항목을 한 번의 호출로 수집하고, 검증에 실패한 항목만 개별 프롬프트로 다시 요청
+
+        제외 장르로 판단되면 None 반환 (is_excluded_genre + enhance_concert_data를 대신함)
+        """
+        kopis_artist = concert.artist
+        query = DataCollectionPrompts.get_concert_enrichment_prompt(concert.title, kopis_artist)
+        try:
+            response = self.api.query_json(query, use_search=True, cache_type='concert_enrichment')
+        except Exception as e:
+            logger.warning(f"통합 보강 요청 실패 ({concert.title}): {e}")
+            response = None
+        if not isinstance(response, dict):
+            response = {}
+
+        retried = []
+
+        # 제외 장르 여부: bool이 아니면 개별 판단 요청
+        is_excluded = response.get('is_excluded')
+        if not isinstance(is_excluded, bool):
+            retried.append('is_excluded')
+            is_excluded = self.is_excluded_genre(concert.title, kopis_artist)
+        elif is_excluded:
+            logger.info(f"장르 필터 제외 이유 ({concert.title}): {response.get('exclude_reason', '이유 없음')}")
+        if is_excluded:
+            return None
+
+        # 아티스트명: raw 이름 검증 후 "영문 (한국어)" 형식 확인 (형식이 맞으면 추가 호출 없음)
+        raw_name = response.get('artist')
+        raw_name = raw_name.strip() if isinstance(raw_name, str) else ''
+        if self._is_valid_artist_name(raw_name):
+            display_name = response.get('artist_display')
+            if isinstance(display_name, str) and '(' in display_name and ')' in display_name:
+                artist_name = self._get_korean_artist_name(display_name.strip())
+            else:
+                retried.append('artist_display')
+                artist_name = self._get_korean_artist_name(raw_name)
+            self._title_artist_cache[concert.title] = artist_name
+        else:
+            retried.append('artist')
+            artist_name = self._extract_artist_from_title(concert.title)
+        if artist_name and artist_name != concert.artist:
+            logger.info(f"콘서트 제목에서 추출한 아티스트 '{artist_name}'로 기존 정보 '{concert.artist}'를 덮어씁니다.")
+            concert.artist = artist_name
+
+        # 티켓 정보 수집 (KOPIS URL 없을 때만 Serper 검색)
+        if not concert.ticket_url:
+            ticket_info = self.serper.search_ticket_url(concert.title)
+            if ticket_info:
+                concert.ticket_url = ticket_info.get('url', '')
+                concert.ticket_site = ticket_info.get('site', '')
+
+        introduction = response.get('summary')
+        introduction = self._clean_introduction(introduction) if isinstance(introduction, str) else ''
+        if not introduction:
+            retried.append('summary')
+            introduction = self._collect_short_introduction(concert.title, concert.artist)
+        concert.introduction = introduction
+
+        # 라벨은 빈 문자열도 정상 응답 (화제성 없음)
+        label = response.get('label')
+        if not isinstance(label, str):
+            retried.append('label')
+            additional_info = self._collect_additional_info(concert.title, concert.artist) or {}
+            label = additional_info.get('label', '')
+        concert.label = label.strip()
+
+        # 장르: 파이프라인 6단계(update_concert_genres)에서 쓰므로 검증된 값만 보관했다가
+        # 아티스트명 통일 후 6단계가 묻는 이름으로 캐시에 저장 (prime_concert_genres)
+        # 실패하면 여기서 다시 묻지 않고 6단계의 개별 요청에 맡김
+        genres = self._validate_genres(response.get('genres'))
+        if genres:
+            self._pending_genres[concert.title] = genres
+        else:
+            retried.append('genres')
+
+        if retried:
+            logger.info(f"통합 보강 재요청 항목 ({concert.title}): {', '.join(retried)}")
+        return concert
+
+    def prime_concert_genres(self, concerts: List[Concert]):
+        """통합 보강에서 얻은 장르를 최종(이름 통일 후) 아티스트명 기준 장르 프롬프트 캐시에 저장"""
+        if not hasattr(self.api, 'prime_cache'):
+            self._pending_genres.clear()
+            return
+        for concert in concerts:
+            genres = self._pending_genres.pop(concert.title, None)
+            if genres and concert.artist:
+                genre_query = DataCollectionPrompts.get_concert_genre_prompt(concert.artist, concert.title)
+                self.api.prime_cache(genre_query, genres, use_search=True, cache_type='concert_genre')
+        self._pending_genres.clear()
+
+    @staticmethod
+    def _validate_genres(genres: Any) -> Optional[list]:
+        """[{genre_id, name}] 1~2개이고 id/이름이 장르 정의와 일치할 때만 반환"""
+        if not isinstance(genres, list) or not 1 <= len(genres) <= 2:
+            return None
+        validated = []
+        for genre in genres:
+            if not isinstance(genre, dict):
+                return None
+            try:
+                genre_id = int(genre.get('genre_id'))
+            except (TypeError, ValueError):
+                return None
+            if GENRE_NAMES.get(genre_id) != str(genre.get('name', '')).strip().upper():
+                return None
+            validated.append({'genre_id': genre_id, 'name': GENRE_NAMES[genre_id]})
+        return validated
+
     def collect_artist_info(self, artist_name: str, concert_title: Optional[str] = None) -> Optional[Artist]:
         #아티스트 정보 수집 (카테고리, 소개, 인스타URL, 키워드, 이미지, 데뷔년도, 국적, 그룹유형, MBID)
         try:
@@ -201,8 +319,7 @@ is_excluded: true 조건
 - 아티스트가 주로 EDM/일렉트로닉 DJ/프로듀서인 경우
 - 그 외는 false"""
         try:
-            result = self.api.query_json(prompt, use_search=False)
-            time.sleep(1)
+            result = self.api.query_json(prompt, use_search=False, cache_type='genre_filter')
             if result and isinstance(result, dict):
                 if result.get('is_excluded'):
                     logger.info(f"장르 필터 제외 이유 ({title}): {result.get('reason', '이유 없음')}")
@@ -215,8 +332,7 @@ is_excluded: true 조건
         #콘서트 장르 정보 수집 (장르명, 장르 코드) - 최대 2개 반환
         try:
             query = DataCollectionPrompts.get_concert_genre_prompt(artist_name, concert_title)
-            response = self.api.query_json(query, use_search=True)
-            time.sleep(6)
+            response = self.api.query_json(query, use_search=True, cache_type='concert_genre')
 
             if response:
                 if isinstance(response, list) and len(response) > 0:
@@ -236,35 +352,14 @@ is_excluded: true 조건
         return date_str.replace('-', '.').replace('/', '.')
 
     def _determine_status(self, start_date: Optional[str], end_date: Optional[str]) -> str:
-        """날짜 기반 상태 결정"""
-        from datetime import datetime, date
-
-        if not start_date:
-            return 'UNKNOWN'
-
-        try:
-            start_date = start_date.replace('-', '.').replace('/', '.')
-            start = datetime.strptime(start_date, '%Y.%m.%d').date()
-            today = date.today()
-
-            if start > today:
-                return 'UPCOMING'
-            elif end_date:
-                end_date = end_date.replace('-', '.').replace('/', '.')
-                end = datetime.strptime(end_date, '%Y.%m.%d').date()
-                return 'ONGOING' if end >= today else 'PAST'
-            else:
-                return 'PAST' if start < today else 'ONGOING'
-
-        except ValueError:
-            return 'UNKNOWN'
+        """날짜 기반 상태 결정 (종료일이 없으면 시작일 기준)"""
+        return determine_status(start_date, end_date, completed_label='PAST', end_defaults_to_start=True)
 
     def _collect_additional_info(self, title: str, artist: str) -> Optional[Dict[str, Any]]:
         #추가 정보 수집 (레이블)
         try:
             query = DataCollectionPrompts.get_additional_info_prompt(title, artist)
-            response = self.api.query_json(query, use_search=True)
-            time.sleep(6)
+            response = self.api.query_json(query, use_search=True, cache_type='label')
 
             if response:
                 return {'label': response.get('label', '')}
@@ -278,28 +373,31 @@ is_excluded: true 조건
         #한 줄 요약 소개 수집 (콘서트 한줄소개)
         try:
             query = DataCollectionPrompts.get_short_introduction_prompt(title, artist)
-            response = self.api.query_json(query, use_search=True)
-            time.sleep(6)
+            response = self.api.query_json(query, use_search=True, schema_type='short_introduction')
 
             if response:
                 introduction = response.get('summary') or response.get('introduction', '')
 
-                if introduction:
-                    introduction = re.sub(r"'\s*'", "", introduction)
-                    introduction = re.sub(r",\s*의 주인공", "의 주인공", introduction)
-                    introduction = re.sub(r"'\s*,\s*의", "의", introduction)
-                    introduction = re.sub(r"히트곡\s*의\s+주인공\s*", "", introduction)
-                    introduction = re.sub(r"^의\s+주인공\s*", "", introduction)
-                    introduction = re.sub(r"주요곡\s*,\s*'", "주요곡 '", introduction)
-                    introduction = re.sub(r"\s+", " ", introduction).strip()
-
-                return introduction
+                return self._clean_introduction(introduction)
 
         except Exception as e:
             logger.warning(f"한 줄 요약 수집 실패: {e}")
 
         return ""
 
+    @staticmethod
+    def _clean_introduction(introduction: str) -> str:
+        """대표곡을 못 찾았을 때 남는 빈 따옴표/어색한 표현 정리"""
+        if not introduction:
+            return introduction
+        introduction = re.sub(r"'\s*'", "", introduction)
+        introduction = re.sub(r",\s*의 주인공", "의 주인공", introduction)
+        introduction = re.sub(r"'\s*,\s*의", "의", introduction)
+        introduction = re.sub(r"히트곡\s*의\s+주인공\s*", "", introduction)
+        introduction = re.sub(r"^의\s+주인공\s*", "", introduction)
+        introduction = re.sub(r"주요곡\s*,\s*'", "주요곡 '", introduction)
+        return re.sub(r"\s+", " ", introduction).strip()
+
     def _collect_artist_basic_info(self, artist_name: str, concert_title: Optional[str] = None) -> Optional[Dict[str, Any]]:
         #아티스트 기본 정보 수집 (MusicBrainz 우선, LLM 보강) (국적, 그룹유형, 데뷔년도, 카테고리, 소개, 이미지, 인스타URL, 키워드)
         if artist_name in self._artist_cache:
@@ -314,8 +412,7 @@ is_excluded: true 조건
             song_examples = []
             try:
                 song_query = DataCollectionPrompts.get_artist_songs_prompt(artist_name, concert_title)
-                song_response = self.api.query_json(song_query, use_search=True)
-                time.sleep(6)
+                song_response = self.api.query_json(song_query, use_search=True, cache_type='artist_songs')
 
                 if song_response and song_response.get('songs'):
                     song_examples = [s for s in song_response.get('songs', []) if s and s.strip()][:2]
@@ -388,8 +485,7 @@ is_excluded: true 조건
                 musicbrainz_context=mb_context,
                 song_examples=song_examples
             )
-            response = self.api.query_json(query, use_search=True)
-            time.sleep(6)
+            response = self.api.query_json(query, use_search=True, cache_type='artist_basic_info')
 
             if response:
                 artist_info['category'] = response.get('category', '')
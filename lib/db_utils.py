@@ -2,26 +2,41 @@
 """
 데이터베이스 연결 유틸리티
 SSH 터널을 열고 MySQL에 연결하는 모든 과정을 담당
+- 터널은 시스템 ssh 명령(OpenSSH 클라이언트)으로 엶
+- 기본: 연결마다 터널 생성/종료 (한 번 실행하고 끝나는 스크립트용)
+- 풀 모드(pooled=True, pooled_db): 포트별 공유 터널 + 커넥션 풀 (대화형 도구처럼 여러 번 연결하는 프로세스용)
 """
+import atexit
+import socket
+import threading
 import time
+from contextlib import contextmanager
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool
 from pathlib import Path
 from lib.platform_utils import create_cross_platform_subprocess
 from lib.config import Config
 
+# 풀 모드 공유 자원 (프로세스 전체에서 재사용)
+_shared_tunnels = {}  # local_port → ssh 프로세스 (dev/stage는 같은 원격 DB 서버라 포트 3308 터널 공유)
+_pools = {}           # (local_port, db_name) → MySQLConnectionPool
+_pool_lock = threading.Lock()
+
 
 class DatabaseManager:
     #SSH 터널 생성 → MySQL 연결 → 쿼리 실행 → 연결 종료
 
-    def __init__(self, db_name: str = None, local_port: int = 3307):
-        #DatabaseManager 초기화
+    def __init__(self, db_name: str = None, local_port: int = 3307, pooled: bool = False):
+        #DatabaseManager 초기화 (pooled=True면 공유 터널 + 커넥션 풀에서 연결을 빌려 씀)
         self.ssh_process = None
         self.connection = None
         self.cursor = None
         self.project_root = Path(__file__).parent.parent
         self.db_name = db_name or Config.DB_NAME
         self.local_port = local_port
+        self.pooled = pooled
 
     def create_ssh_tunnel(self, ssh_config=None):
         #SSH 터널 생성 (DB 접근용 중간 다리)
@@ -53,43 +68,63 @@ class DatabaseManager:
                 stderr=None
             )
 
-            time.sleep(3)  # 터널 연결 대기
-
-            if self.ssh_process.poll() is None:
+            # 고정 대기 대신 로컬 포트가 열릴 때까지만 대기
+            if self._wait_for_tunnel(ssh_config['local_port']):
                 print(" SSH 터널 연결 성공")
                 return True
             else:
                 print(" SSH 터널 생성 실패")
+                if self.ssh_process.poll() is None:
+                    self.ssh_process.terminate()
                 return False
 
         except Exception as e:
             print(f" SSH 터널 오류: {e}")
             return False
 
+    def _wait_for_tunnel(self, local_port, timeout=None):
+        #터널 로컬 포트가 연결을 받을 때까지 짧은 간격으로 확인 (ssh가 먼저 종료되면 실패)
+        deadline = time.monotonic() + (timeout or Config.SSH_TUNNEL_TIMEOUT)
+        while time.monotonic() < deadline:
+            if self.ssh_process.poll() is not None:
+                return False
+            try:
+                with socket.create_connection(('127.0.0.1', local_port), timeout=0.5):
+                    return True
+            except OSError:
+                time.sleep(0.1)
+        return False
+
+    def _mysql_config(self):
+        #터널 로컬 포트로 접속하는 기본 MySQL 설정
+        return {
+            'host': '127.0.0.1',
+            'port': self.local_port,
+            'user': Config.DB_USER,
+            'password': Config.DB_PASSWORD,
+            'database': self.db_name,
+            'charset': 'utf8mb4',
+            'collation': 'utf8mb4_unicode_ci',
+            'use_unicode': True
+        }
+
+    def _set_charset(self):
+        # 한글 깨짐 방지를 위한 문자셋 설정
+        self.cursor.execute("SET NAMES utf8mb4")
+        self.cursor.execute("SET CHARACTER SET utf8mb4")
+        self.cursor.execute("SET character_set_connection=utf8mb4")
+
     def connect_mysql(self, config=None):
         #SSH 터널을 통해 MySQL 연결
         if config is None:
-            config = {
-                'host': '127.0.0.1',
-                'port': self.local_port,
-                'user': Config.DB_USER,
-                'password': Config.DB_PASSWORD,
-                'database': self.db_name,
-                'charset': 'utf8mb4',
-                'collation': 'utf8mb4_unicode_ci',
-                'use_unicode': True
-            }
+            config = self._mysql_config()
 
         try:
             print(" MySQL 연결 중...")
 
             self.connection = mysql.connector.connect(**config)
             self.cursor = self.connection.cursor()
-
-            # 한글 깨짐 방지를 위한 문자셋 설정
-            self.cursor.execute("SET NAMES utf8mb4")
-            self.cursor.execute("SET CHARACTER SET utf8mb4")
-            self.cursor.execute("SET character_set_connection=utf8mb4")
+            self._set_charset()
 
             print(" MySQL 연결 성공!")
             return True
@@ -100,19 +135,93 @@ class DatabaseManager:
 
     def connect_with_ssh(self, ssh_config=None, mysql_config=None):
         #SSH 터널 생성 + MySQL 연결 한번에
+        if self.pooled:
+            return self._checkout_pooled()
+
         if not self.create_ssh_tunnel(ssh_config):
             return False
 
         return self.connect_mysql(mysql_config)
 
+    def _ensure_shared_tunnel(self):
+        #이 포트의 공유 터널이 없거나 죽었으면 새로 열기 (_pool_lock 안에서 호출)
+        process = _shared_tunnels.get(self.local_port)
+        if process is not None and process.poll() is None:
+            return True
+
+        if not self.create_ssh_tunnel():
+            self.ssh_process = None
+            return False
+        _shared_tunnels[self.local_port] = self.ssh_process
+        self.ssh_process = None  # 공유 터널은 disconnect에서 종료하지 않음
+        return True
+
+    def _checkout_pooled(self):
+        #풀에서 연결 하나를 빌림 (풀이 가득 차면 DB_POOL_TIMEOUT초까지 대기)
+        key = (self.local_port, self.db_name)
+        try:
+            with _pool_lock:
+                if not self._ensure_shared_tunnel():
+                    return False
+                pool = _pools.get(key)
+                if pool is None:
+                    pool = MySQLConnectionPool(
+                        pool_name=f"livith_{self.db_name}_{self.local_port}",
+                        pool_size=Config.DB_POOL_SIZE,
+                        pool_reset_session=True,
+                        **self._mysql_config()
+                    )
+                    _pools[key] = pool
+
+            deadline = time.monotonic() + Config.DB_POOL_TIMEOUT
+            while True:
+                try:
+                    # 끊긴 연결은 풀이 반납 시점이 아니라 꺼낼 때 재연결함
+                    self.connection = pool.get_connection()
+                    break
+                except PoolError:
+                    if time.monotonic() >= deadline:
+                        raise
+                    time.sleep(0.05)
+
+            self.cursor = self.connection.cursor()
+            self._set_charset()
+            return True
+
+        except Error as e:
+            print(f" MySQL 풀 연결 실패: {e}")
+            return False
+
+    def is_connected(self):
+        #MySQL 연결이 살아있는지 확인
+        return self.connection is not None and self.connection.is_connected()
+
+    def ensure_connected(self):
+        #연결이 끊겼으면 터널은 그대로 두고 MySQL만 재연결
+        if self.is_connected():
+            return True
+        if self.connection is None:
+            return False
+        try:
+            self.connection.reconnect(attempts=2, delay=1)
+            self.cursor = self.connection.cursor()
+            self._set_charset()
+            return True
+        except Error as e:
+            print(f" MySQL 재연결 실패: {e}")
+            return False
+
     def disconnect(self):
-        #커서, DB 연결, SSH 터널 순으로 종료
+        #커서, DB 연결, SSH 터널 순으로 종료 (풀 모드면 연결만 풀에 반납하고 터널 유지)
         if self.cursor:
             self.cursor.close()
         if self.connection:
             self.connection.close()
+        self.cursor = None
+        self.connection = None
         if self.ssh_process:
             self.ssh_process.terminate()
+            self.ssh_process = None
             print(" 연결 종료")
 
     def get_data_path(self, filename=""):
@@ -163,14 +272,63 @@ class DatabaseManager:
             self.connection.rollback()
 
 
-def get_db_manager():
+def get_db_manager(pooled: bool = False):
     #프로덕션 DB 매니저 반환
-    return DatabaseManager()
+    return DatabaseManager(pooled=pooled)
 
-def get_dev_db_manager():
+def get_dev_db_manager(pooled: bool = False):
     #개발 DB 매니저 반환 (DB 이름, 포트만 다름)
-    return DatabaseManager(db_name=Config.DEV_DB_NAME, local_port=3308)
+    return DatabaseManager(db_name=Config.DEV_DB_NAME, local_port=3308, pooled=pooled)
 
-def get_stage_db_manager():
+def get_stage_db_manager(pooled: bool = False):
     #스테이지 DB 매니저 반환
-    return DatabaseManager(db_name=Config.STAGE_DB_NAME, local_port=3308)
+    return DatabaseManager(db_name=Config.STAGE_DB_NAME, local_port=3308, pooled=pooled)
+
+
+DB_TARGETS = {
+    'prod': get_db_manager,
+    'dev': get_dev_db_manager,
+    'stage': get_stage_db_manager,
+}
+
+
+@contextmanager
+def db_session(db_factory=get_db_manager):
+    #터널과 연결을 한 번만 열고 블록 안의 모든 작업이 공유 (연결 실패 시 None)
+    db = db_factory()
+    if not db.connect_with_ssh():
+        db.disconnect()
+        yield None
+        return
+    try:
+        yield db
+    finally:
+        db.disconnect()
+
+
+@contextmanager
+def pooled_db(target: str = 'prod'):
+    #target(prod/dev/stage) 풀에서 연결을 빌려 쓰고 블록이 끝나면 반납 (연결 실패 시 None)
+    #오래 떠 있는 프로세스는 터널 생성/접속 비용 없이 매 요청마다 사용
+    db = DB_TARGETS[target](pooled=True)
+    if not db.connect_with_ssh():
+        yield None
+        return
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.disconnect()
+
+
+@atexit.register
+def close_shared_tunnels():
+    #프로세스 종료 시 풀 모드 공유 터널 정리
+    with _pool_lock:
+        for process in _shared_tunnels.values():
+            if process.poll() is None:
+                process.terminate()
+        _shared_tunnels.clear()
+        _pools.clear()
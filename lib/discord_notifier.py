@@ -2,7 +2,7 @@
 Discord 알림 전송 모듈
 
 - DiscordNotifier: KOPIS 비교 결과를 일반 텍스트 메시지로 전송
-- notify_kopis_done / notify_instagram_done: 포럼 채널 webhook embed 전송
+- notify_kopis_done / notify_instagram_done / notify_status_done: 포럼 채널 webhook embed 전송
 """
 import requests
 import logging
@@ -224,3 +224,25 @@ def notify_instagram_done(
 
     _send_with_thread(webhook_url=webhook_url, thread_name=thread_name,
                       color=COLOR_SUCCESS, detail_fields=detail_fields)
+
+
+def notify_status_done(
+    webhook_url: str,
+    db_label: str,
+    transitions: Dict[str, List[str]],
+):
+    """콘서트 상태 전환 결과 ({새 상태: [공연 목록]})"""
+    total = sum(len(items) for items in transitions.values())
+    if not webhook_url or total == 0:
+        return
+
+    counts = "  |  ".join(f"{status} {len(items)}개" for status, items in sorted(transitions.items()))
+    thread_name = f"📅 콘서트 상태 업데이트 완료  |  {db_label}  |  {counts}"
+
+    detail_fields = [
+        {"name": f"{status} 전환", "value": _format_list(items)}
+        for status, items in sorted(transitions.items())
+    ]
+
+    _send_with_thread(webhook_url=webhook_url, thread_name=thread_name,
+                      color=COLOR_SUCCESS, detail_fields=detail_fields)
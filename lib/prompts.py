@@ -330,6 +330,42 @@ class DataCollectionPrompts:
 
 JSON 형식: {{"label": "화제성 문구 또는 빈 문자열"}}"""
 
+    @staticmethod
+    def get_concert_enrichment_prompt(concert_title: str, kopis_artist: str = "") -> str:
+        """
+        사용 위치: lib/data_collector.py -> enhance_concert_data_combined()
+        목적: 아티스트명/한국어 표기/한줄소개/라벨/장르/제외 장르 여부를 한 번의 호출로 수집
+        테이블: concerts.csv, concert_genres.csv
+        컬럼: artist, introduction, label, genre_id, name
+        """
+        cast_context = f"\nKOPIS 출연진 정보: {kopis_artist}" if kopis_artist else ""
+        return f"""{DataCollectionPrompts.COMMON_SOURCE_RULES}
+
+공연명: {concert_title}{cast_context}
+
+이 내한 공연을 검색해서 아래 항목을 한 번에 JSON으로 반환하세요.
+
+1. artist: 메인 아티스트/밴드의 공식 활동명 (찾은 그대로, 언어 변환 금지)
+   - 콜라보/합동 공연이면 첫 번째 아티스트만, "x", "&", "ft.", "vs" 등 구분자 금지
+   - 찾을 수 없으면 빈 문자열
+2. artist_display: "영문 (한국어)" 형식의 이름 (예: "RADWIMPS (라드윔프스)", "Coldplay (콜드플레이)")
+3. summary: 한 줄 소개 문구
+   - 우선순위: 내한 정보(첫 내한, n년 만의 내한) → 재결합/고별/기념 투어 → 새 앨범/투어명 → 100% 확실한 대표곡 → 장르 내 위상/수상
+   - 대표곡이 확실하지 않으면 곡 언급 자체를 하지 말 것, 빈 따옴표 '' 금지
+   - 예: "히트곡 'Sprinter', 'Doja'의 주인공 Central Cee, 첫 단독 내한!"
+4. label: 재결합, n년 만의 내한, 고별 투어, 매진 임박, 데뷔 n주년 등 화제성이 있을 때만 짧은 문구, 없으면 빈 문자열
+5. genres: 아티스트 메인 활동 장르 1개 (두 장르를 넘나들 때만 2개, 3개 이상 금지, 빈 배열 금지)
+   - 1 JPOP: 일본 국적 아티스트만 (일본 록/인디/힙합 아티스트는 JPOP + 해당 장르)
+   - 2 ROCK_METAL: 록, 메탈, 펑크, 브릿팝, 얼터너티브
+   - 3 RAP_HIPHOP: 랩, 힙합, 트랩
+   - 4 INDIE: 인디팝, 인디록, 포크, 싱어송라이터, 어쿠스틱
+   - 5 POP: 메인스트림 팝, K-POP, 댄스팝, 일렉트로팝, R&B, 소울
+6. is_excluded: 아티스트가 주로 재즈 연주/보컬, EDM/일렉트로닉 DJ/프로듀서, 클래식 계열이면 true, 그 외 false
+7. exclude_reason: is_excluded 판단 이유 한 줄
+
+JSON 형식:
+{{"artist": "공식 활동명", "artist_display": "영문 (한국어)", "summary": "한 줄 소개", "label": "화제성 문구 또는 빈 문자열", "genres": [{{"genre_id": 숫자, "name": "장르명"}}], "is_excluded": false, "exclude_reason": "판단 이유"}}"""
+
     # =========================================================================
     # SETLISTS 테이블 관련 프롬프트
     # =========================================================================
@@ -1011,3 +1047,115 @@ JSON 형식으로만 응답해주세요:
 
 
 
+
+
+# =============================================================================
+# 응답 스키마 레지스트리 (GeminiAPI.query_json의 구조화 출력 모드에서 사용)
+# =============================================================================
+# 키는 query_json의 schema_type (cache_type과 같은 이름 사용)
+# 형식은 Gemini response_schema (OpenAPI 부분집합), 프롬프트의 JSON 예시와 필드를 맞춰야 함
+
+_STRING = {"type": "STRING"}
+_GENRE_LIST = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {"genre_id": {"type": "INTEGER"}, "name": {"type": "STRING"}},
+        "required": ["genre_id", "name"],
+    },
+}
+
+PROMPT_RESPONSE_SCHEMAS = {
+    # get_artist_basic_info_prompt
+    "artist_basic_info": {
+        "type": "OBJECT",
+        "properties": {
+            field: _STRING for field in (
+                "artist", "category", "detail", "instagram_url", "keywords",
+                "img_url", "debut_date", "nationality", "group_type",
+            )
+        },
+        "required": ["artist", "category", "detail"],
+    },
+    # get_artist_songs_prompt
+    "artist_songs": {
+        "type": "OBJECT",
+        "properties": {"songs": {"type": "ARRAY", "items": _STRING}},
+        "required": ["songs"],
+    },
+    # get_artist_name_prompt
+    "artist_name": {
+        "type": "OBJECT",
+        "properties": {"artist": _STRING},
+        "required": ["artist"],
+    },
+    # DataCollector._get_korean_artist_name
+    "korean_name": {
+        "type": "OBJECT",
+        "properties": {"name": _STRING},
+        "required": ["name"],
+    },
+    # get_short_introduction_prompt
+    "short_introduction": {
+        "type": "OBJECT",
+        "properties": {"summary": _STRING},
+        "required": ["summary"],
+    },
+    # get_additional_info_prompt
+    "label": {
+        "type": "OBJECT",
+        "properties": {"label": _STRING},
+        "required": ["label"],
+    },
+    # get_concert_enrichment_prompt
+    "concert_enrichment": {
+        "type": "OBJECT",
+        "properties": {
+            "artist": _STRING,
+            "artist_display": _STRING,
+            "summary": _STRING,
+            "label": _STRING,
+            "genres": _GENRE_LIST,
+            "is_excluded": {"type": "BOOLEAN"},
+            "exclude_reason": _STRING,
+        },
+        "required": ["artist", "artist_display", "summary", "label", "genres", "is_excluded"],
+    },
+    # get_schedule_info_prompt
+    "schedule_info": {
+        "type": "ARRAY",
+        "items": {
+            "type": "OBJECT",
+            "properties": {"concert_title": _STRING, "category": _STRING, "scheduled_at": _STRING},
+            "required": ["concert_title", "category", "scheduled_at"],
+        },
+    },
+    # get_concert_genre_prompt
+    "concert_genre": _GENRE_LIST,
+    # DataCollector.is_excluded_genre
+    "genre_filter": {
+        "type": "OBJECT",
+        "properties": {"is_excluded": {"type": "BOOLEAN"}, "reason": _STRING},
+        "required": ["is_excluded"],
+    },
+    # get_instagram_parse_prompt
+    "instagram_parse": {
+        "type": "OBJECT",
+        "properties": {
+            "is_concert_post": {"type": "BOOLEAN"},
+            **{
+                field: _STRING for field in (
+                    "artist_name", "title", "start_date", "end_date", "concert_time", "venue",
+                    "ticket_site", "ticket_url", "pre_ticketing_date", "pre_ticketing_time",
+                    "general_ticketing_date", "general_ticketing_time",
+                )
+            },
+        },
+        "required": ["is_concert_post"],
+    },
+}
+
+
+def get_response_schema(schema_type: Optional[str]) -> Optional[dict]:
+    """프롬프트 종류에 해당하는 응답 스키마 (등록되지 않은 종류는 None)"""
+    return PROMPT_RESPONSE_SCHEMAS.get(schema_type) if schema_type else None
@@ -0,0 +1,91 @@
+"""
+스레드 안전한 토큰 버킷 Rate Limiter
+여러 워커 스레드가 하나의 요청 예산(초당 N회)을 공유할 때 사용
+"""
+import time
+import threading
+
+
+class TokenBucket:
+    """초당 rate개씩 토큰이 채워지고 최대 capacity개까지 쌓이는 버킷"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        # 마지막 충전 이후 경과 시간만큼 토큰 충전 (lock 안에서 호출)
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 얻을 때까지 대기"""
+        if tokens > self.capacity:
+            raise ValueError(f"요청 토큰({tokens})이 버킷 용량({self.capacity})보다 큽니다.")
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait_time = (tokens - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+    # compare_kopis_db.RateLimiter와 같은 호출 방식 지원
+    wait = acquire
+
+
+class AdaptiveRateLimiter:
+    """분당 요청 수(RPM)와 분당 토큰 수(TPM) 예산으로 호출 간격을 조절하는 limiter
+
+    - 예산이 남아 있으면 바로 통과하고, 부족할 때만 필요한 만큼 대기
+    - 429/5xx 응답을 받으면 지수 백오프 구간을 설정해 모든 호출자가 함께 쉼
+    - 성공하면 백오프 단계 초기화
+    """
+
+    def __init__(self, rpm: float, tpm: float = None, max_backoff: float = 60.0):
+        # 분 단위 예산을 초당 충전량으로 변환, 버스트는 1분 예산의 1/6(10초 분량)까지 허용
+        self.requests = TokenBucket(rpm / 60.0, capacity=max(1.0, rpm / 6.0))
+        self.tokens = TokenBucket(tpm / 60.0, capacity=max(1.0, tpm / 6.0)) if tpm else None
+        self.max_backoff = max_backoff
+        self.backoff_until = 0.0
+        self.backoff_step = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, estimated_tokens: int = 0):
+        """요청 1회와 예상 토큰만큼 예산을 확보할 때까지 대기"""
+        while True:
+            with self.lock:
+                wait_time = self.backoff_until - time.monotonic()
+            if wait_time <= 0:
+                break
+            time.sleep(wait_time)
+
+        self.requests.acquire()
+        if self.tokens and estimated_tokens:
+            self.tokens.acquire(min(estimated_tokens, self.tokens.capacity))
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """응답의 실제 토큰 사용량으로 TPM 예산 보정 (예상보다 많이 쓰면 다음 호출이 더 기다림)"""
+        if not self.tokens or actual_tokens is None:
+            return
+        with self.tokens.lock:
+            self.tokens.tokens -= actual_tokens - estimated_tokens
+
+    def on_success(self):
+        with self.lock:
+            self.backoff_step = 0
+
+    def on_throttle(self, retry_after: float = None) -> float:
+        """429/5xx 발생 시 백오프 구간 설정, 대기 시간(초) 반환"""
+        with self.lock:
+            delay = retry_after or min(self.max_backoff, 2.0 * (2 ** self.backoff_step))
+            self.backoff_step += 1
+            self.backoff_until = max(self.backoff_until, time.monotonic() + delay)
+            return delay
@@ -10,6 +10,11 @@ if ! command -v python3 &> /dev/null; then
     exit 1
 fi
 
+# OpenSSH 클라이언트 확인 (DB 연결은 ssh 명령으로 터널을 엶, lib/db_utils.py)
+if ! command -v ssh &> /dev/null; then
+    echo "⚠️ ssh 명령을 찾을 수 없습니다. DB 작업 전에 OpenSSH 클라이언트를 설치하세요."
+fi
+
 # 가상환경 생성
 echo "🔧 가상환경 생성..."
 rm -rf venv
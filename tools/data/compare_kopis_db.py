@@ -418,11 +418,17 @@ def compare_concerts() -> dict:
         # 3. KOPIS API에서 공연 코드 목록 가져오기
         logger.info(f"\n📡 KOPIS API에서 공연 목록을 가져오는 중...")
         try:
-            all_kopis_codes = kopis_api.fetch_all_concerts(
+            kopis_records = kopis_api.fetch_all_concert_records(
                 start_date=today_str,
                 end_date=end_date_str
             )
-            logger.info(f"✅ KOPIS에서 총 {len(all_kopis_codes)}개의 공연을 찾았습니다.")
+            logger.info(f"✅ KOPIS에서 총 {len(kopis_records)}개의 공연을 찾았습니다.")
+
+            # 제목만으로 제외되는 공연은 상세 조회 생략 (제외 통계에는 포함)
+            kopis_records, prefiltered = kopis_api.prefilter_records(kopis_records, EXCLUDED_GENRES)
+            if prefiltered:
+                logger.info(f"✂️ 제목 키워드로 제외: {len(prefiltered)}개 (상세 조회 {len(prefiltered)}회 생략)")
+            all_kopis_codes = [record['code'] for record in kopis_records]
         except Exception as e:
             logger.error(f"❌ KOPIS API 호출 중 오류 발생: {e}")
             return result
@@ -439,6 +445,9 @@ def compare_concerts() -> dict:
                 api=kopis_api,
                 max_workers=20
             )
+            for record in prefiltered:
+                keyword = record['excluded_keyword']
+                excluded_counts[keyword] = excluded_counts.get(keyword, 0) + 1
             if api_error_codes:
                 logger.info(f"⚠️ API 400 에러로 조회 실패: {len(api_error_codes)}개 코드 (사라진 공연 판단 제외)")
             logger.info(f"✅ KOPIS에서 {len(concert_details)}개의 내한 공연을 찾았습니다.")
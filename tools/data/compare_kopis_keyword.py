@@ -8,6 +8,7 @@ KOPIS API와 로컬 데이터베이스의 콘서트 목록을 비교
 import os
 import sys
 import time
+import argparse
 import logging
 import threading
 from datetime import datetime
@@ -22,6 +23,7 @@ from tqdm import tqdm
 from lib.discord_notifier import DiscordNotifier
 
 from core.apis.kopis_api import KopisAPI, KopisAPIError
+from core.apis.kopis_sync import KopisSyncState
 from lib.db_utils import get_db_manager
 from lib.config import Config
 
@@ -99,7 +101,7 @@ def normalize_date(date_str: str) -> str:
     return date_str
 
 
-def fetch_single_concert(code: str, api: KopisAPI, max_retries: int = 3) -> tuple[
+def fetch_single_concert(code: str, api: KopisAPI, max_retries: int = 3, trusted_codes: set = frozenset()) -> tuple[
     Optional[Dict[str, Any]],  # 필터 통과한 공연
     Optional[Dict[str, Any]],  # 키워드로 제외된 공연
     str                        # 제외 장르 or _API_ERROR
@@ -108,11 +110,15 @@ def fetch_single_concert(code: str, api: KopisAPI, max_retries: int = 3) -> tupl
     단일 공연 정보를 가져오는 함수
     Returns: (valid_detail, excluded_detail, excluded_genre)
     - excluded_genre == _API_ERROR: 400 에러로 조회 실패
+    - trusted_codes: 목록 지문이 그대로라 캐시된 상세정보를 만료와 무관하게 믿어도 되는 코드
     """
     for attempt in range(max_retries):
         try:
-            rate_limiter.wait()
-            detail = api.get_concert_detail(code)
+            # 캐시 적중 시에는 rate limit 대기 없이 바로 사용
+            detail = api.get_cached_detail(code, ignore_ttl=code in trusted_codes)
+            if detail is None:
+                rate_limiter.wait()
+                detail = api.get_concert_detail(code, refresh=True)
             if detail:
                 is_valid, excluded_genre = is_visit_concert(detail)
                 detail['start_date'] = normalize_date(detail.get('start_date', ''))
@@ -143,7 +149,8 @@ def fetch_single_concert(code: str, api: KopisAPI, max_retries: int = 3) -> tupl
 def fetch_concerts_parallel(
     concert_codes: List[str],
     api: KopisAPI,
-    max_workers: int = 10
+    max_workers: int = 10,
+    trusted_codes: set = frozenset()
 ) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int], set]:
     """
     병렬 처리로 공연 정보를 가져오는 함수
@@ -157,7 +164,7 @@ def fetch_concerts_parallel(
     excluded_concerts = []
     excluded_counts: Dict[str, int] = {genre: 0 for genre in EXCLUDED_GENRES}
     api_error_codes: set = set()
-    fetch_func = partial(fetch_single_concert, api=api)
+    fetch_func = partial(fetch_single_concert, api=api, trusted_codes=trusted_codes)
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         future_to_code = {
@@ -235,6 +242,7 @@ def print_comparison_results(
     db_concerts: Dict,
     excluded_concerts: List[Dict[str, Any]],
     excluded_counts: Dict[str, int],
+    prefiltered_count: int = 0,
 ):
     new_codes = kopis_codes - db_codes
     removed_codes = db_codes - kopis_codes
@@ -249,6 +257,8 @@ def print_comparison_results(
     print(f"   - KOPIS 내한 공연: {total_kopis}개")
     print(f"   - DB 현재/미래 공연: {len(db_codes)}개")
     print(f"   - 필터링된 공연: {total_excluded}개")
+    if prefiltered_count:
+        print(f"   - 목록 단계 키워드 제외 (상세 조회 생략): {prefiltered_count}개")
     print(f"   - 새로 추가된 공연: {len(new_codes)}개")
     print(f"   - 사라진 공연: {len(removed_codes)}개")
     print("=" * 80)
@@ -302,6 +312,7 @@ def send_discord_results(
     excluded_counts: Dict[str, int],
     start_date: str,
     end_date: str,
+    prefiltered_count: int = 0,
 ):
     new_codes = kopis_codes - db_codes
     removed_codes = db_codes - kopis_codes
@@ -326,6 +337,8 @@ def send_discord_results(
     header += f"- 새로 추가: {len(new_codes)}개\n"
     header += f"- 사라진 공연: {len(removed_codes)}개\n"
     header += f"- 필터링된 공연: {total_excluded}개"
+    if prefiltered_count:
+        header += f"\n- 목록 단계 키워드 제외: {prefiltered_count}개 (상세 조회 생략)"
     messages.append(header)
 
     # 새로 추가된 공연
@@ -383,12 +396,20 @@ def send_discord_results(
     return success
 
 
-def compare_concerts() -> dict:
+def compare_concerts(incremental: bool = False) -> dict:
+    """
+    incremental=True면 이전 실행 이후 목록 지문(제목, 기간, 상태)이 그대로인 공연은
+    캐시된 상세정보를 재사용하고, 새로 생겼거나 바뀐 공연만 상세 API를 호출
+    """
     validate_config()
     start_time = time.time()
 
     kopis_api = KopisAPI(api_key=Config.KOPIS_API_KEY)
     db_manager = get_db_manager()
+    sync_state = KopisSyncState(Config.CACHE_DIR / "kopis_sync.sqlite3", scope="compare_keyword") if incremental else None
+    kopis_records = []
+    prefiltered_records = []
+    trusted_codes = set()
 
     result = {
         'new_count': 0,
@@ -432,11 +453,19 @@ def compare_concerts() -> dict:
 
         logger.info(f"\n📡 KOPIS API에서 공연 목록을 가져오는 중...")
         try:
-            all_kopis_codes = kopis_api.fetch_all_concerts(
+            kopis_records = kopis_api.fetch_all_concert_records(
                 start_date=today_str,
                 end_date=end_date_str
             )
-            logger.info(f"✅ KOPIS에서 총 {len(all_kopis_codes)}개의 공연을 찾았습니다.")
+            logger.info(f"✅ KOPIS에서 총 {len(kopis_records)}개의 공연을 찾았습니다.")
+
+            # 제목만으로 제외되는 공연은 상세 조회 생략 (내한 여부는 확인하지 않음)
+            candidate_records, prefiltered_records = kopis_api.prefilter_records(kopis_records, EXCLUDED_GENRES)
+            all_kopis_codes = [record['code'] for record in candidate_records]
+            if sync_state:
+                sync_state.log_watermarks()
+                _, unchanged = sync_state.split(candidate_records)
+                trusted_codes = {record['code'] for record in unchanged}
         except Exception as e:
             logger.error(f"❌ KOPIS API 호출 중 오류 발생: {e}")
             return result
@@ -450,11 +479,14 @@ def compare_concerts() -> dict:
             valid_concerts, excluded_concerts, excluded_counts, api_error_codes = fetch_concerts_parallel(
                 all_kopis_codes,
                 api=kopis_api,
-                max_workers=20
+                max_workers=20,
+                trusted_codes=trusted_codes
             )
             if api_error_codes:
                 logger.info(f"⚠️ API 400 에러로 조회 실패: {len(api_error_codes)}개 코드 (사라진 공연 판단 제외)")
             logger.info(f"✅ KOPIS에서 {len(valid_concerts)}개의 내한 공연을 찾았습니다. (키워드 제외: {len(excluded_concerts)}개)")
+            if kopis_api.detail_cache:
+                kopis_api.detail_cache.log_stats()
         except Exception as e:
             logger.error(f"❌ 공연 상세 정보 가져오기 중 오류 발생: {e}")
             import traceback
@@ -465,7 +497,11 @@ def compare_concerts() -> dict:
         kopis_codes = set(kopis_concerts.keys())
 
         # 키워드 필터에 걸린 공연도 KOPIS에 존재하는 것으로 취급 (사라진 공연 오분류 방지)
-        all_existing_kopis_codes = kopis_codes | {c['code'] for c in excluded_concerts}
+        all_existing_kopis_codes = (
+            kopis_codes
+            | {c['code'] for c in excluded_concerts}
+            | {r['code'] for r in prefiltered_records}
+        )
 
         logger.info(f"\n💾 데이터베이스에서 공연 목록을 가져오는 중...")
         try:
@@ -484,13 +520,21 @@ def compare_concerts() -> dict:
         logger.info("\n🔄 공연 목록 비교 중...")
         print_comparison_results(
             kopis_codes, db_codes, kopis_concerts, db_concerts,
-            excluded_concerts, excluded_counts
+            excluded_concerts, excluded_counts,
+            prefiltered_count=len(prefiltered_records)
         )
 
         result['new_count'] = len(new_codes)
         result['removed_count'] = len(removed_codes)
         result['success'] = True
 
+        if sync_state:
+            # 상세 조회에 실패한 코드는 기록하지 않아 다음 실행에서 다시 확인
+            sync_state.mark_seen(
+                [record for record in kopis_records if record['code'] not in api_error_codes],
+                today_str, end_date_str
+            )
+
         if Config.DISCORD_WEBHOOK_URL_KOPIS:
             logger.info("📤 Discord 알림 전송 중...")
             notifier = DiscordNotifier(Config.DISCORD_WEBHOOK_URL_KOPIS)
@@ -500,7 +544,8 @@ def compare_concerts() -> dict:
                     kopis_codes, db_codes, kopis_concerts, db_concerts,
                     excluded_concerts, excluded_counts,
                     start_date=today_for_db,
-                    end_date=max_db_date_str
+                    end_date=max_db_date_str,
+                    prefiltered_count=len(prefiltered_records)
                 ):
                     logger.info("✅ Discord 알림 전송 완료")
                     break
@@ -523,4 +568,8 @@ def compare_concerts() -> dict:
 
 
 if __name__ == "__main__":
-    compare_concerts()
+    parser = argparse.ArgumentParser(description='KOPIS와 DB 공연 목록 비교 (키워드 필터)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='목록 지문이 그대로인 공연은 캐시된 상세정보 재사용')
+    args = parser.parse_args()
+    compare_concerts(incremental=args.incremental)
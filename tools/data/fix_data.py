@@ -368,7 +368,8 @@ class DataFixer:
             db_choice = input("  DB 선택 (1/2/3): ").strip()
             db_map = {'1': get_dev_db_manager, '2': get_db_manager, '3': get_stage_db_manager}
             db_factory = db_map.get(db_choice, get_db_manager)
-            db = db_factory()
+            # 대화형 세션 동안 메뉴마다 터널을 새로 열지 않도록 풀 모드 사용
+            db = db_factory(pooled=True)
             if self._connect_db(db):
                 mysql_results = self.update_mysql_data('artist', old_value, new_value)
                 db.disconnect()
@@ -418,7 +419,8 @@ class DataFixer:
             db_choice = input("  DB 선택 (1/2/3): ").strip()
             db_map = {'1': get_dev_db_manager, '2': get_db_manager, '3': get_stage_db_manager}
             db_factory = db_map.get(db_choice, get_db_manager)
-            db = db_factory()
+            # 대화형 세션 동안 메뉴마다 터널을 새로 열지 않도록 풀 모드 사용
+            db = db_factory(pooled=True)
             if self._connect_db(db):
                 mysql_results = self.update_mysql_data('concert_title', old_value, new_value)
                 db.disconnect()
@@ -1273,11 +1275,11 @@ class DataFixer:
         db_choice = input("선택 (1-3): ").strip()
 
         if db_choice == '1':
-            db = get_dev_db_manager()
+            db = get_dev_db_manager(pooled=True)
         elif db_choice == '2':
-            db = get_db_manager()
+            db = get_db_manager(pooled=True)
         elif db_choice == '3':
-            db = get_stage_db_manager()
+            db = get_stage_db_manager(pooled=True)
         else:
             print("❌ 잘못된 선택입니다.")
             return
@@ -5,47 +5,34 @@ import re
 import time
 from datetime import datetime
 from pathlib import Path
-import requests
-import xml.etree.ElementTree as ET
 
 # Add project root to sys.path
 project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
 from lib.config import Config
+from core.apis.kopis_api import KopisAPI, KopisAPIError
 
-def get_concert_details_from_kopis(kopis_id: str) -> dict | None:
-    """Fetches details for a single KOPIS ID and returns a dictionary of details."""
+def get_concert_details_from_kopis(kopis_id: str, api: KopisAPI) -> dict | None:
+    """Fetches details for a single KOPIS ID (served from the local detail cache when fresh)."""
     if not kopis_id or pd.isna(kopis_id):
         return None
 
-    api_key = Config.KOPIS_API_KEY
-    url = f"http://www.kopis.or.kr/openApi/restful/pblprfr/{kopis_id}?service={api_key}"
-    
     try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        
-        root = ET.fromstring(response.text)
-        db_element = root.find('.//db')
-        
-        if db_element is None:
-            return None
-
-        def _get_text(element, tag):
-            found = element.find(tag)
-            return found.text if found is not None and found.text else ""
-
-        details = {
-            'start_date': _get_text(db_element, 'prfpdfrom'),
-            'end_date': _get_text(db_element, 'prfpdto'),
-            'dtguidance': _get_text(db_element, 'dtguidance')
-        }
-        return details
-    except Exception as e:
+        detail = api.get_concert_detail(kopis_id)
+    except KopisAPIError as e:
         print(f"  -> KOPIS API Error for {kopis_id}: {e}")
         return None
 
+    if not detail:
+        return None
+
+    return {
+        'start_date': detail.get('start_date', ''),
+        'end_date': detail.get('end_date', ''),
+        'dtguidance': detail.get('dtguidance', '')
+    }
+
 def populate_schedules():
     """
     Reads concerts.csv, fetches schedule details from KOPIS API,
@@ -61,6 +48,7 @@ def populate_schedules():
         return
 
     new_schedule_rows = []
+    kopis_api = KopisAPI(Config.KOPIS_API_KEY)
 
     print("Starting to populate schedules from concerts.csv...")
     day_map = {'월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6}
@@ -76,7 +64,7 @@ def populate_schedules():
             print("  -> Skipping, no KOPIS ID.")
             continue
 
-        details = get_concert_details_from_kopis(kopis_id)
+        details = get_concert_details_from_kopis(kopis_id, kopis_api)
         time.sleep(0.1)
 
         if not details:
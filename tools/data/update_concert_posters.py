@@ -2,8 +2,6 @@ import pandas as pd
 import os
 import sys
 import time
-import requests
-import xml.etree.ElementTree as ET
 from pathlib import Path
 
 # Add project root to sys.path to import Config
@@ -11,31 +9,22 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
 from lib.config import Config
+from core.apis.kopis_api import KopisAPI, KopisAPIError
 
-def get_poster_from_kopis(kopis_id: str) -> str | None:
+def get_poster_from_kopis(kopis_id: str, api: KopisAPI) -> str | None:
     """Fetches details for a single KOPIS ID and returns the poster URL."""
     if not kopis_id or pd.isna(kopis_id):
         return None
 
-    api_key = Config.KOPIS_API_KEY
-    url = f"http://www.kopis.or.kr/openApi/restful/pblprfr/{kopis_id}?service={api_key}"
-    
     try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        
-        root = ET.fromstring(response.text)
-        poster_element = root.find('.//db/poster')
-        
-        if poster_element is not None and poster_element.text:
-            return poster_element.text
-        return None
-    except requests.RequestException as e:
+        detail = api.get_concert_detail(kopis_id)
+    except KopisAPIError as e:
         print(f"  -> API request failed for {kopis_id}: {e}")
         return None
-    except ET.ParseError as e:
-        print(f"  -> XML parsing failed for {kopis_id}: {e}")
-        return None
+
+    if detail and detail.get('poster'):
+        return detail['poster']
+    return None
 
 def update_concert_posters():
     """
@@ -59,6 +48,7 @@ def update_concert_posters():
     df['poster'] = df['poster'].fillna('')
 
     updated_count = 0
+    kopis_api = KopisAPI(Config.KOPIS_API_KEY)
 
     for index, row in df.iterrows():
         # Check if the poster field is empty
@@ -71,7 +61,7 @@ def update_concert_posters():
 
         print(f"Processing concert: {row['title']} (ID: {kopis_id})")
         
-        poster_url = get_poster_from_kopis(kopis_id)
+        poster_url = get_poster_from_kopis(kopis_id, kopis_api)
         
         if poster_url:
             df.loc[index, 'poster'] = poster_url
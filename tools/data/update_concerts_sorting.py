@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
 import subprocess
@@ -12,6 +13,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from lib.config import Config
 from lib.db_utils import get_db_manager
+from lib.concert_dates import parse_date_column, compute_status, sort_positions, COMPLETED, ONGOING, UNKNOWN
 
 class ConcertsSortingUpdater:
     def __init__(self):
@@ -45,20 +47,15 @@ class ConcertsSortingUpdater:
             today = date.today()
             print(f"  • 오늘 날짜: {today}")
             
-            # start_date 기준으로 분류
-            date_categories = {'past': 0, 'today': 0, 'future': 0, 'invalid': 0}
-            
-            for _, row in df.iterrows():
-                try:
-                    start_date = datetime.strptime(row['start_date'], '%Y-%m-%d').date()
-                    if start_date < today:
-                        date_categories['past'] += 1
-                    elif start_date == today:
-                        date_categories['today'] += 1
-                    else:
-                        date_categories['future'] += 1
-                except:
-                    date_categories['invalid'] += 1
+            # start_date 기준으로 분류 (컬럼 전체를 한 번에 파싱)
+            start_dates = parse_date_column(df['start_date'])
+            today_ts = pd.Timestamp(today)
+            date_categories = {
+                'past': int((start_dates < today_ts).sum()),
+                'today': int((start_dates == today_ts).sum()),
+                'future': int((start_dates > today_ts).sum()),
+                'invalid': int(start_dates.isna().sum()),
+            }
             
             print(f"  • 날짜 분류:")
             for category, count in date_categories.items():
@@ -92,60 +89,29 @@ class ConcertsSortingUpdater:
             # 1. 과거 이벤트 (start_date 오름차순)
             # 2. 오늘/미래 이벤트 (start_date 오름차순)
             
+            # Status 결정 (종료일이 비어 있으면 시작일 기준)
+            status = compute_status(df['start_date'], df['end_date'], today=today, end_defaults_to_start=True)
+            invalid = status == UNKNOWN
+            if invalid.any():
+                # 날짜 파싱 실패시 ONGOING으로 두고 오늘 날짜 기준으로 정렬
+                print(f"⚠️ 날짜 파싱 실패 {int(invalid.sum())}개 (rows: {np.flatnonzero(invalid).tolist()[:20]})")
+                status = np.where(invalid, ONGOING, status)
+
             updated_df = df.copy()
-            updated_records = []
-            
-            for i, (_, row) in enumerate(df.iterrows()):
-                try:
-                    start_date = datetime.strptime(row['start_date'], '%Y-%m-%d').date()
-                    end_date = datetime.strptime(row['end_date'], '%Y-%m-%d').date() if row['end_date'] else start_date
-                    
-                    # Status 결정
-                    if end_date < today:
-                        new_status = 'COMPLETED'
-                    elif start_date <= today <= end_date:
-                        new_status = 'ONGOING'
-                    else:
-                        new_status = 'UPCOMING'
-                    
-                    # 레코드 업데이트
-                    updated_record = row.copy()
-                    updated_record['status'] = new_status
-                    updated_record['date_for_sorting'] = start_date  # 정렬용 임시 컬럼
-                    updated_record['row_index'] = i  # 원래 순서 보존용
-                    
-                    updated_records.append(updated_record)
-                    
-                except Exception as e:
-                    print(f"⚠️ 날짜 파싱 실패 (row {i}): {e}")
-                    # 날짜 파싱 실패시 원본 유지
-                    updated_record = row.copy()
-                    updated_record['status'] = 'ONGOING'
-                    updated_record['date_for_sorting'] = today
-                    updated_record['row_index'] = i
-                    updated_records.append(updated_record)
-            
-            # DataFrame으로 변환
-            updated_df = pd.DataFrame(updated_records)
-            
+            updated_df['status'] = status
+            completed_count = int((status == COMPLETED).sum())
+            ongoing_count = int((status == ONGOING).sum())
+
             # 정렬 로직:
             # 1. COMPLETED (과거) - start_date 내림차순 (최근 완료된 것 먼저)  
             # 2. ONGOING (진행 중) - start_date 오름차순
             # 3. UPCOMING (예정) - start_date 오름차순 (가까운 것 먼저)
-            
-            completed_df = updated_df[updated_df['status'] == 'COMPLETED'].sort_values('date_for_sorting', ascending=False)
-            ongoing_df = updated_df[updated_df['status'] == 'ONGOING'].sort_values('date_for_sorting', ascending=True)
-            upcoming_df = updated_df[updated_df['status'] == 'UPCOMING'].sort_values('date_for_sorting', ascending=True)
-            
-            # 순서대로 합치기
-            final_df = pd.concat([completed_df, ongoing_df, upcoming_df], ignore_index=True)
+            order = sort_positions(status, df['start_date'], fallback=today)
+            final_df = updated_df.iloc[order].reset_index(drop=True)
             
             # sorted_index 재할당 (0부터 시작)
             final_df['sorted_index'] = range(len(final_df))
             
-            # 임시 컬럼 제거
-            final_df = final_df.drop(['date_for_sorting', 'row_index'], axis=1)
-            
             # 결과 확인
             print(f"\n📊 업데이트 결과:")
             new_status_counts = final_df['status'].value_counts()
@@ -153,9 +119,9 @@ class ConcertsSortingUpdater:
                 print(f"  • {status}: {count}개")
             
             print(f"\n🔢 새로운 sorted_index:")
-            print(f"  • COMPLETED: 0 ~ {len(completed_df)-1}")
-            print(f"  • ONGOING: {len(completed_df)} ~ {len(completed_df)+len(ongoing_df)-1}")
-            print(f"  • UPCOMING: {len(completed_df)+len(ongoing_df)} ~ {len(final_df)-1}")
+            print(f"  • COMPLETED: 0 ~ {completed_count-1}")
+            print(f"  • ONGOING: {completed_count} ~ {completed_count+ongoing_count-1}")
+            print(f"  • UPCOMING: {completed_count+ongoing_count} ~ {len(final_df)-1}")
             
             # 샘플 확인
             print(f"\n📋 정렬 결과 샘플:")
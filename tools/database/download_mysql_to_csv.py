@@ -2,66 +2,129 @@
 """
 MySQL 데이터베이스에서 CSV 파일로 데이터를 다운로드하는 스크립트
 """
-import pandas as pd
+import csv
 import os
 import sys
-from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from lib.db_utils import get_db_manager, get_dev_db_manager
 from lib.config import Config
+from lib.artist_resolver import ARTIST_KEY_COLUMNS
 
 ALL_TABLES = ["artists", "concerts", "concert_genres", "schedule", "songs", "setlist_songs", "users", "user_genres", "user_interest_concerts"]
 
-def download_table(table_name, db_factory=get_db_manager):
-    """MySQL 테이블을 CSV로 다운로드"""
+# DB에서 계산되는 컬럼 (artists 정규화 생성 컬럼, concerts 다음 상태 전환일)
+_DERIVED_COLUMNS = set(ARTIST_KEY_COLUMNS) | {"next_status_at"}
+
+def _csv_value(value):
+    """DB 값을 CSV 문자열로 (NULL은 빈 칸, pandas to_csv와 같은 표기)"""
+    if value is None:
+        return ''
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    return value
+
+
+def _read_watermark(csv_path):
+    """기존 CSV의 updated_at 최댓값 (컬럼 하나만 순차로 읽음, 없으면 None)"""
+    if not os.path.exists(csv_path):
+        return None
+    with open(csv_path, encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or 'updated_at' not in reader.fieldnames or 'id' not in reader.fieldnames:
+            return None
+        values = [row['updated_at'] for row in reader if row['updated_at']]
+    return max(values) if values else None
+
+
+def _stream_rows(cursor, columns, keep):
+    """서버 커서에서 fetchmany 단위로 받아 한 행씩 반환"""
+    while True:
+        rows = cursor.fetchmany(Config.EXPORT_FETCH_SIZE)
+        if not rows:
+            break
+        for row in rows:
+            yield [_csv_value(row[i]) for i in keep]
+
+
+def download_table(table_name, db_factory=get_db_manager, incremental=False):
+    """MySQL 테이블을 CSV로 다운로드
+
+    결과를 한 번에 메모리에 올리지 않고 unbuffered 커서 + fetchmany로 받아 바로 CSV에 씀
+    incremental=True면 기존 CSV의 updated_at 최댓값 이후 바뀐 행만 받아 id 기준으로 교체/추가
+    (DB에서 삭제된 행은 반영되지 않으므로 주기적으로 전체 다운로드 필요)
+    """
     db = db_factory()
     
     # 연결
     if not db.connect_with_ssh():
         return False
     
+    cursor = None
     try:
-        # 쿼리 실행
-        db.cursor = db.connection.cursor(dictionary=True)
-        query = f"SELECT * FROM {table_name}"
-        db.cursor.execute(query)
-        data = db.cursor.fetchall()
-        
-        if not data:
-            print(f"⚠️ {table_name} 테이블이 비어있습니다.")
-            return True
-        
-        # DataFrame 생성
-        df = pd.DataFrame(data)
-        if 'id' in df.columns:
-            df['id'] = df['id'].astype('Int64')
-        
-        # CSV 저장
         csv_file = f"{table_name}.csv"
         csv_path = os.path.join(Config.OUTPUT_DIR, csv_file)
-        
-        # 백업 생성
+        tmp_path = f"{csv_path}.tmp"
+
+        watermark = _read_watermark(csv_path) if incremental else None
+        if incremental and watermark is None:
+            print(f"ℹ️ {csv_file}에 updated_at 기준점이 없어 전체 다운로드합니다.")
+
+        # 쿼리 실행 (unbuffered 커서라 행을 받는 동안 서버에서 조금씩 전송됨)
+        cursor = db.connection.cursor(buffered=False)
+        if watermark is not None:
+            cursor.execute(f"SELECT * FROM {table_name} WHERE updated_at >= %s", (watermark,))
+        else:
+            cursor.execute(f"SELECT * FROM {table_name}")
+
+        # artists 정규화 생성 컬럼, concerts 전환일은 DB에서 계산되므로 CSV에는 남기지 않음
+        all_columns = [desc[0] for desc in cursor.description]
+        keep = [i for i, col in enumerate(all_columns) if col not in _DERIVED_COLUMNS]
+        columns = [all_columns[i] for i in keep]
+
+        # 백업 생성 (파일 복사)
         if os.path.exists(csv_path):
-            now = datetime.now()
-            today_str = now.strftime('%Y%m%d')
-            
-            # 날짜별 백업 폴더 생성
-            date_backup_dir = os.path.join(Config.BACKUP_DIR, today_str)
-            os.makedirs(date_backup_dir, exist_ok=True)
-
-            # 백업 파일명 및 전체 경로 정의
-            backup_file = f"{table_name}_backup_{now.strftime('%Y%m%d_%H%M%S')}.csv"
-            backup_path = os.path.join(date_backup_dir, backup_file)
-            
-            # 백업 수행
-            df_backup = pd.read_csv(csv_path)
-            df_backup.to_csv(backup_path, index=False, encoding='utf-8-sig')
-            print(f"💾 백업 생성: {os.path.join(today_str, backup_file)}")
-        
-        # 새 파일 저장
-        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-        print(f"📁 {table_name} → {csv_file} ({len(df)}개 레코드)")
+            backup_path = Config.create_backup(csv_file)
+            print(f"💾 백업 생성: {os.path.relpath(backup_path, Config.BACKUP_DIR)}")
+
+        count = 0
+        with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            if watermark is not None:
+                # 변경분(작음)만 메모리에 두고 기존 CSV를 한 행씩 읽으며 같은 id는 교체
+                id_index = columns.index('id')
+                changed = {str(row[id_index]): row for row in _stream_rows(cursor, columns, keep)}
+                with open(csv_path, encoding='utf-8-sig', newline='') as old:
+                    reader = csv.reader(old)
+                    old_columns = next(reader)
+                    old_id_index = old_columns.index('id')
+                    for row in reader:
+                        row_id = row[old_id_index]
+                        if row_id in changed:
+                            writer.writerow(changed.pop(row_id))
+                        elif old_columns == columns:
+                            writer.writerow(row)
+                        else:
+                            old_row = dict(zip(old_columns, row))
+                            writer.writerow([old_row.get(col, '') for col in columns])
+                        count += 1
+                writer.writerows(changed.values())
+                count += len(changed)
+            else:
+                for row in _stream_rows(cursor, columns, keep):
+                    writer.writerow(row)
+                    count += 1
+
+        if count == 0 and watermark is None:
+            os.remove(tmp_path)
+            print(f"⚠️ {table_name} 테이블이 비어있습니다.")
+            return True
+
+        # 다 쓴 뒤에만 교체 (중간에 실패해도 기존 CSV 유지)
+        os.replace(tmp_path, csv_path)
+        mode = f" (updated_at >= {watermark} 증분)" if watermark is not None else ""
+        print(f"📁 {table_name} → {csv_file} ({count}개 레코드){mode}")
         
         return True
         
@@ -69,6 +132,11 @@ def download_table(table_name, db_factory=get_db_manager):
         print(f"❌ 다운로드 실패: {e}")
         return False
     finally:
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
         db.disconnect()
 
 
@@ -108,9 +176,11 @@ def main():
     else:
         tables = [ALL_TABLES[c - 1] for c in choices]
 
+    incremental = input("updated_at 이후 바뀐 행만 받을까요? (y/N): ").strip().lower() == 'y'
+
     print(f"\n🚀 [{db_label}] {', '.join(tables)} 다운로드 시작")
     for table_name in tables:
-        if not download_table(table_name, db_factory=db_factory):
+        if not download_table(table_name, db_factory=db_factory, incremental=incremental):
             print(f"❌ {table_name} 다운로드 실패")
             return False
 
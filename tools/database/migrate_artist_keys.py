@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+artists 테이블에 아티스트 매칭용 정규화 컬럼과 인덱스를 추가하는 마이그레이션
+- artist_en_key: 괄호 앞 영문명, 공백 제거·소문자 (예: "Hump Back (험프 백)" → "humpback")
+- artist_ko_key: 한글로만 된 첫 번째 괄호 안 한국어명, 공백 제거 (예: "험프백", MySQL 8 이상)
+artist 값에서 계산되는 STORED 생성 컬럼이라 업서트 경로에서 따로 쓸 필요 없음
+적용 후 .env에 ARTIST_INDEXED_LOOKUP=true 를 설정하면 lib/artist_resolver.py가 인덱스로 조회
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from lib.db_utils import DB_TARGETS, db_session
+from lib.artist_resolver import ARTIST_KEY_COLUMNS, english_key, korean_key
+
+
+def _existing_columns(db):
+    db.cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'artists'
+    """)
+    return {row[0] for row in db.cursor.fetchall()}
+
+
+def _existing_indexes(db):
+    db.cursor.execute("""
+        SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'artists'
+    """)
+    return {row[0] for row in db.cursor.fetchall()}
+
+
+def migrate(db, rebuild=False):
+    """없는 컬럼/인덱스만 추가 (여러 번 실행해도 안전)
+
+    rebuild=True면 이미 있는 생성 컬럼도 현재 ARTIST_KEY_COLUMNS 식으로 다시 정의 (식이 바뀌었을 때)
+    """
+    columns = _existing_columns(db)
+    indexes = _existing_indexes(db)
+
+    changes = []
+    for column, expression in ARTIST_KEY_COLUMNS.items():
+        definition = f"{column} VARCHAR(255) GENERATED ALWAYS AS ({expression}) STORED"
+        if column not in columns:
+            changes.append(f"ADD COLUMN {definition}")
+        elif rebuild:
+            changes.append(f"MODIFY COLUMN {definition}")
+        index_name = f"idx_artists_{column}"
+        if index_name not in indexes:
+            changes.append(f"ADD INDEX {index_name} ({column})")
+
+    if not changes:
+        print("✅ 정규화 컬럼과 인덱스가 이미 있습니다.")
+        return True
+
+    query = "ALTER TABLE artists\n    " + ",\n    ".join(changes)
+    print(f"🛠️ {query}")
+    db.cursor.execute(query)
+    db.commit()
+    print(f"✅ artists 마이그레이션 완료 ({len(changes)}개 변경)")
+    return True
+
+
+def verify(db):
+    """DB의 생성 컬럼 값과 lib/artist_resolver.py 정규화 결과가 같은지 확인"""
+    db.cursor.execute("SELECT id, artist, artist_en_key, artist_ko_key FROM artists")
+    mismatches = []
+    rows = db.cursor.fetchall()
+    for artist_id, artist, en_key, ko_key in rows:
+        expected_en = english_key(artist)
+        expected_ko = korean_key(artist)
+        if (en_key or '') != expected_en or (ko_key or '') != expected_ko:
+            mismatches.append((artist_id, artist, en_key, ko_key, expected_en, expected_ko))
+
+    for artist_id, artist, en_key, ko_key, expected_en, expected_ko in mismatches[:20]:
+        print(f"  ⚠️ id={artist_id} '{artist}': DB=({en_key}, {ko_key}) / 예상=({expected_en}, {expected_ko})")
+    print(f"🔍 검증 완료: {len(rows)}명 중 불일치 {len(mismatches)}명")
+    if mismatches:
+        print("  → 정규화 규칙이 바뀐 경우 --rebuild 로 생성 컬럼을 다시 정의하세요.")
+    return not mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="artists 정규화 컬럼(artist_en_key/artist_ko_key) 마이그레이션")
+    parser.add_argument("--target", choices=sorted(DB_TARGETS), default="dev", help="대상 DB (기본: dev)")
+    parser.add_argument("--verify-only", action="store_true", help="마이그레이션 없이 값만 검증")
+    parser.add_argument("--rebuild", action="store_true", help="이미 있는 생성 컬럼도 현재 식으로 다시 정의")
+    args = parser.parse_args()
+
+    with db_session(DB_TARGETS[args.target]) as db:
+        if db is None:
+            print(f"❌ [{args.target}] DB 연결 실패")
+            return False
+        if not args.verify_only and not migrate(db, rebuild=args.rebuild):
+            return False
+        return verify(db)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+concerts 테이블에 다음 상태 전환일(next_status_at) 컬럼과 인덱스, 초기화 트리거를 추가하는 마이그레이션
+- next_status_at: UPCOMING → 시작일, ONGOING → 종료일 다음 날 (lib/concert_dates.next_transition)
+- idx_concerts_next_status_at (status, next_status_at): 오늘 전환할 공연만 범위 조회
+- trg_concerts_next_status_reset: 상태/날짜가 바뀌었는데 전환일을 같이 쓰지 않으면 NULL로 되돌려 다시 계산되게 함
+적용 후 .env에 STATUS_CALENDAR=true 를 설정하거나 update_concert_status_auto.py --calendar 로 실행
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from lib.db_utils import DB_TARGETS, db_session
+
+COLUMN = "next_status_at"
+INDEX = "idx_concerts_next_status_at"
+TRIGGER = "trg_concerts_next_status_reset"
+
+
+def _existing_columns(db):
+    db.cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'concerts'
+    """)
+    return {row[0] for row in db.cursor.fetchall()}
+
+
+def _existing_indexes(db):
+    db.cursor.execute("""
+        SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'concerts'
+    """)
+    return {row[0] for row in db.cursor.fetchall()}
+
+
+def _existing_triggers(db):
+    db.cursor.execute("""
+        SELECT TRIGGER_NAME FROM information_schema.TRIGGERS
+        WHERE TRIGGER_SCHEMA = DATABASE() AND EVENT_OBJECT_TABLE = 'concerts'
+    """)
+    return {row[0] for row in db.cursor.fetchall()}
+
+
+def migrate(db):
+    """없는 컬럼/인덱스/트리거만 추가 (여러 번 실행해도 안전)"""
+    changes = []
+    if COLUMN not in _existing_columns(db):
+        changes.append(f"ADD COLUMN {COLUMN} DATE NULL")
+    if INDEX not in _existing_indexes(db):
+        changes.append(f"ADD INDEX {INDEX} (status, {COLUMN})")
+
+    if changes:
+        query = "ALTER TABLE concerts\n    " + ",\n    ".join(changes)
+        print(f"🛠️ {query}")
+        db.cursor.execute(query)
+
+    if TRIGGER not in _existing_triggers(db):
+        query = f"""
+            CREATE TRIGGER {TRIGGER} BEFORE UPDATE ON concerts
+            FOR EACH ROW
+            BEGIN
+                IF NEW.{COLUMN} <=> OLD.{COLUMN}
+                   AND NOT (NEW.status <=> OLD.status
+                            AND NEW.start_date <=> OLD.start_date
+                            AND NEW.end_date <=> OLD.end_date) THEN
+                    SET NEW.{COLUMN} = NULL;
+                END IF;
+            END
+        """
+        print(f"🛠️ CREATE TRIGGER {TRIGGER}")
+        db.cursor.execute(query)
+        changes.append(f"CREATE TRIGGER {TRIGGER}")
+
+    if not changes:
+        print("✅ 전환일 컬럼/인덱스/트리거가 이미 있습니다.")
+        return True
+
+    db.commit()
+    print(f"✅ concerts 마이그레이션 완료 ({len(changes)}개 변경)")
+    return True
+
+
+def report(db):
+    """전환일 채움 현황 (NULL은 다음 상태 업데이트 때 계산됨)"""
+    db.cursor.execute(f"""
+        SELECT status, COUNT(*), SUM({COLUMN} IS NULL) FROM concerts
+        WHERE status IN ('UPCOMING', 'ONGOING')
+        GROUP BY status
+    """)
+    for status, total, missing in db.cursor.fetchall():
+        print(f"  - {status}: {total}개 (전환일 미계산 {int(missing or 0)}개)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="concerts 다음 상태 전환일(next_status_at) 마이그레이션")
+    parser.add_argument("--target", choices=sorted(DB_TARGETS), default="dev", help="대상 DB (기본: dev)")
+    args = parser.parse_args()
+
+    with db_session(DB_TARGETS[args.target]) as db:
+        if db is None:
+            print(f"❌ [{args.target}] DB 연결 실패")
+            return False
+        if not migrate(db):
+            return False
+        report(db)
+        return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,314 +1,181 @@
 #!/usr/bin/env python3
 """
-MySQL 데이터베이스에서 데이터를 로드하고 처리하는 유틸리티
+CSV 파일을 MySQL에 대량 적재하는 스크립트 (LOAD DATA LOCAL INFILE)
+새 dev/stage DB 부트스트랩처럼 행이 많을 때 upsert_csv_to_mysql.py 대신 사용
+1. CSV를 임시 스테이징 테이블(모든 컬럼 LONGTEXT)로 LOAD DATA LOCAL INFILE
+2. INSERT ... SELECT ... ON DUPLICATE KEY UPDATE 한 번으로 대상 테이블에 병합
+서버에 local_infile=ON 설정이 필요함
 """
-import pandas as pd
-import mysql.connector
-from mysql.connector import Error
-import logging
-from datetime import datetime
+import argparse
+import csv
+import os
 import sys
+import time
 
-class MySQLDataLoader:
-    def __init__(self, host, port, user, password, database):
-        """
-        MySQL 데이터 로더 초기화
-        
-        Args:
-            host: MySQL 서버 호스트
-            port: MySQL 서버 포트
-            user: MySQL 사용자명
-            password: MySQL 비밀번호
-            database: 데이터베이스 이름
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from lib.db_utils import DB_TARGETS
+
+# 대상 테이블 → CSV 파일 (나열 순서대로 적재, concerts는 artists 다음)
+# concerts.csv에는 artist_id가 없고 artist명만 있으므로 병합 후 _POST_MERGE로 채움
+LOAD_TABLES = {
+    "artists": "artists.csv",
+    "concerts": "concerts.csv",
+    "schedule": "schedule.csv",
+    "songs": "songs.csv",
+    "setlist_songs": "setlists.csv",
+}
+
+# 병합 후 실행하는 set-based 보정 (CSV에 없는 참조 id 채우기)
+_POST_MERGE = {
+    "concerts": (
+        "artist_id",
         """
-        self.host = host
-        self.port = port
-        self.user = user
-        self.password = password
-        self.database = database
-        self.connection = None
-        self.cursor = None
-        
-        # 로깅 설정
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('mysql_data_load.log'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        UPDATE concerts c
+        JOIN (SELECT artist, MIN(id) AS id FROM artists GROUP BY artist) a ON a.artist = c.artist
+        SET c.artist_id = a.id
+        WHERE c.artist_id IS NULL
+        """,
+    ),
+}
 
-    def connect(self):
-        """MySQL 데이터베이스에 연결"""
-        try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                charset='utf8mb4',
-                use_unicode=True
-            )
-            self.cursor = self.connection.cursor()
-            self.logger.info(f"MySQL 데이터베이스 '{self.database}' 연결 성공")
-            return True
-        except Error as e:
-            self.logger.error(f"MySQL 연결 실패: {e}")
-            return False
+# 병합 시 기존 행에서 덮어쓰지 않는 컬럼
+_KEEP_ON_UPDATE = {"created_at"}
 
-    def disconnect(self):
-        """MySQL 데이터베이스 연결 종료"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
-        self.logger.info("MySQL 연결 종료")
+# 빈 문자열을 그대로 넣을 수 있는 문자열 타입 (그 외 타입은 ''를 NULL로 변환)
+_STRING_TYPES = {"char", "varchar", "tinytext", "text", "mediumtext", "longtext", "enum", "set"}
 
-    def get_table_structure(self, table_name):
-        """테이블 구조 조회"""
-        try:
-            self.cursor.execute(f"DESCRIBE {table_name}")
-            columns = self.cursor.fetchall()
-            self.logger.info(f"테이블 '{table_name}' 구조:")
-            for col in columns:
-                self.logger.info(f"  {col[0]} - {col[1]} - {col[2]} - {col[3]} - {col[4]} - {col[5]}")
-            return columns
-        except Error as e:
-            self.logger.error(f"테이블 구조 조회 실패 ({table_name}): {e}")
-            return None
 
-    def clear_table(self, table_name):
-        """테이블 데이터 삭제 (Foreign Key 제약조건 고려)"""
-        try:
-            # Foreign Key 체크 비활성화
-            self.cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
-            
-            # 기존 데이터 유지 (업서트 모드)
-            # self.cursor.execute(f"TRUNCATE TABLE {table_name}")
-            # self.connection.commit()
-            
-            # Foreign Key 체크 재활성화
-            self.cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-            
-            self.logger.info(f"테이블 '{table_name}' 데이터 삭제 완료")
-            return True
-        except Error as e:
-            self.logger.error(f"테이블 데이터 삭제 실패 ({table_name}): {e}")
-            self.connection.rollback()
-            return False
+def _read_header(csv_path):
+    """CSV 헤더와 줄바꿈 문자 (BOM이 있어도 컬럼명이 깨지지 않도록 utf-8-sig로 읽음)"""
+    with open(csv_path, "rb") as f:
+        first_line = f.readline()
+    line_terminator = "\r\n" if first_line.endswith(b"\r\n") else "\n"
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        header = next(csv.reader(f), [])
+    return [col.strip() for col in header], line_terminator
 
-    def load_artists(self, csv_path):
-        """artists 테이블에 데이터 로드"""
-        try:
-            df = pd.read_csv(csv_path, encoding='utf-8')
-            self.logger.info(f"artists.csv 로드: {len(df)} 행")
-            
-            # 테이블 구조에 맞게 조정 (예시)
-            insert_query = """
-                INSERT INTO artists (name, created_at, updated_at) 
-                VALUES (%s, %s, %s)
-            """
-            
-            current_time = datetime.now()
-            data_to_insert = []
-            
-            # CSV가 헤더가 없는 경우 (첫 번째 컬럼이 아티스트명)
-            if 'artist' in df.columns:
-                artist_names = df['artist'].tolist()
-            else:
-                artist_names = df.iloc[:, 0].tolist()
-            
-            for artist_name in artist_names:
-                data_to_insert.append((artist_name, current_time, current_time))
-            
-            self.cursor.executemany(upsert_query, data_to_insert)
-            self.connection.commit()
-            
-            self.logger.info(f"artists 테이블에 {len(data_to_insert)}개 데이터 삽입 완료")
-            return True
-            
-        except Error as e:
-            self.logger.error(f"artists 데이터 로드 실패: {e}")
-            self.connection.rollback()
-            return False
 
-    def load_concerts(self, csv_path):
-        """concerts 테이블에 데이터 로드"""
-        try:
-            df = pd.read_csv(csv_path, encoding='utf-8')
-            self.logger.info(f"concerts.csv 로드: {len(df)} 행")
-            
-            # 예시 쿼리 (실제 테이블 구조에 맞게 수정 필요)
-            insert_query = """
-                INSERT INTO concerts (title, artist_id, venue, date, created_at, updated_at) 
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            
-            current_time = datetime.now()
-            data_to_insert = []
-            
-            for _, row in df.iterrows():
-                # artist_id를 artists 테이블에서 조회
-                artist_query = "SELECT id FROM artists WHERE name = %s"
-                self.cursor.execute(artist_query, (row['artist'],))
-                artist_result = self.cursor.fetchone()
-                
-                if artist_result:
-                    artist_id = artist_result[0]
-                    data_to_insert.append((
-                        row['title'],
-                        artist_id,
-                        row.get('venue', ''),
-                        row.get('date', None),
-                        current_time,
-                        current_time
-                    ))
-                else:
-                    self.logger.warning(f"아티스트를 찾을 수 없음: {row['artist']}")
-            
-            self.cursor.executemany(insert_query, data_to_insert)
-            self.connection.commit()
-            
-            self.logger.info(f"concerts 테이블에 {len(data_to_insert)}개 데이터 삽입 완료")
-            return True
-            
-        except Error as e:
-            self.logger.error(f"concerts 데이터 로드 실패: {e}")
-            self.connection.rollback()
-            return False
+def _table_columns(db, table):
+    """대상 테이블의 (컬럼명 → 데이터 타입), PK 컬럼 목록 (생성 컬럼은 제외)"""
+    db.cursor.execute("""
+        SELECT COLUMN_NAME, DATA_TYPE, COLUMN_KEY, EXTRA FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+    """, (table,))
+    types = {}
+    primary_keys = []
+    for name, data_type, column_key, extra in db.cursor.fetchall():
+        if "GENERATED" in (extra or "").upper():
+            continue
+        types[name] = data_type.lower()
+        if column_key == "PRI":
+            primary_keys.append(name)
+    return types, primary_keys
 
-    def load_songs(self, csv_path):
-        """songs 테이블에 데이터 로드"""
-        try:
-            df = pd.read_csv(csv_path, encoding='utf-8')
-            self.logger.info(f"songs.csv 로드: {len(df)} 행")
-            
-            insert_query = """
-                INSERT INTO songs (title, artist_id, lyrics, pronunciation, translation, 
-                                 youtube_id, musixmatch_url, created_at, updated_at) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            current_time = datetime.now()
-            data_to_insert = []
-            
-            for _, row in df.iterrows():
-                # artist_id를 artists 테이블에서 조회
-                artist_query = "SELECT id FROM artists WHERE name = %s"
-                self.cursor.execute(artist_query, (row['artist'],))
-                artist_result = self.cursor.fetchone()
-                
-                if artist_result:
-                    artist_id = artist_result[0]
-                    data_to_insert.append((
-                        row['title'],
-                        artist_id,
-                        row.get('lyrics', ''),
-                        row.get('pronunciation', ''),
-                        row.get('translation', ''),
-                        row.get('youtube_id', ''),
-                        row.get('musixmatch_url', ''),
-                        current_time,
-                        current_time
-                    ))
-                else:
-                    self.logger.warning(f"아티스트를 찾을 수 없음: {row['artist']}")
-            
-            self.cursor.executemany(insert_query, data_to_insert)
-            self.connection.commit()
-            
-            self.logger.info(f"songs 테이블에 {len(data_to_insert)}개 데이터 삽입 완료")
-            return True
-            
-        except Error as e:
-            self.logger.error(f"songs 데이터 로드 실패: {e}")
-            self.connection.rollback()
-            return False
 
-    def load_all_data(self, csv_base_path):
-        """모든 CSV 데이터를 MySQL에 로드"""
-        try:
-            # Foreign Key 관계를 고려한 삽입 순서
-            load_sequence = [
-                ('artists', 'artists.csv', self.load_artists),
-                # ('concerts', 'concerts.csv', self.load_concerts),
-                # ('songs', 'songs.csv', self.load_songs),
-                # 추가 테이블들...
-            ]
-            
-            self.logger.info("=== 데이터 로드 시작 ===")
-            
-            for table_name, csv_file, load_function in load_sequence:
-                self.logger.info(f"\n{table_name} 테이블 로드 시작...")
-                
-                # 테이블 구조 확인
-                self.get_table_structure(table_name)
-                
-                # 기존 데이터 삭제 (선택사항)
-                # self.clear_table(table_name)
-                
-                # 데이터 로드
-                csv_path = f"{csv_base_path}/{csv_file}"
-                success = load_function(csv_path)
-                
-                if not success:
-                    self.logger.error(f"{table_name} 로드 실패")
-                    return False
-                    
-                self.logger.info(f"{table_name} 로드 완료")
-            
-            self.logger.info("=== 모든 데이터 로드 완료 ===")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"데이터 로드 중 오류: {e}")
-            return False
+def load_table(db, table, csv_path):
+    """CSV 한 개를 스테이징 테이블에 적재한 뒤 대상 테이블에 병합"""
+    if not os.path.exists(csv_path):
+        print(f"⚠️ {os.path.basename(csv_path)} 파일이 없습니다.")
+        return True
 
-def main():
-    """메인 실행 함수"""
-    import sys
-    from pathlib import Path
-    sys.path.append(str(Path(__file__).parent.parent.parent))
-    from lib.config import Config
+    started_at = time.perf_counter()
+    header, line_terminator = _read_header(csv_path)
+    types, primary_keys = _table_columns(db, table)
+    if not types:
+        print(f"❌ {table} 테이블을 찾을 수 없습니다.")
+        return False
+
+    columns = [col for col in header if col in types]
+    if not columns:
+        print(f"❌ {table}: CSV 헤더에 테이블 컬럼이 없습니다. ({', '.join(header)})")
+        return False
+    skipped = [col for col in header if col not in types]
+    if skipped:
+        print(f"  - 테이블에 없는 CSV 컬럼은 무시: {', '.join(skipped)}")
+
+    staging = f"_stage_{table}"
+    db.cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging}")
+    db.cursor.execute(
+        f"CREATE TEMPORARY TABLE {staging} ("
+        + ", ".join(f"`{col}` LONGTEXT NULL" for col in columns)
+        + ") CHARACTER SET utf8mb4"
+    )
 
-    config = {
-        'host': 'localhost',
-        'port': Config.DB_PORT,
-        'user': Config.DB_USER,
-        'password': Config.DB_PASSWORD,
-        'database': Config.DB_NAME,
-    }
+    # 테이블에 없는 CSV 컬럼은 사용자 변수로 받아 버림
+    targets = [f"`{col}`" if col in types else "@skip" for col in header]
+    db.cursor.execute(
+        f"LOAD DATA LOCAL INFILE %s INTO TABLE {staging} "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+        f"LINES TERMINATED BY %s IGNORE 1 LINES ({', '.join(targets)})",
+        (os.path.abspath(csv_path), line_terminator)
+    )
+    loaded = db.cursor.rowcount
+    db.cursor.execute("SHOW COUNT(*) WARNINGS")
+    warnings = db.cursor.fetchone()[0]
 
-    csv_base_path = str(Config.OUTPUT_DIR.parent)
+    select_list = ", ".join(
+        f"`{col}`" if types[col] in _STRING_TYPES else f"NULLIF(`{col}`, '')"
+        for col in columns
+    )
+    update_clause = ",\n".join(
+        f"`{col}` = VALUES(`{col}`)"
+        for col in columns if col not in primary_keys and col not in _KEEP_ON_UPDATE
+    )
+    query = (
+        f"INSERT INTO {table} ({', '.join(f'`{col}`' for col in columns)})\n"
+        f"SELECT {select_list} FROM {staging}\n"
+    )
+    if update_clause:
+        query += f"ON DUPLICATE KEY UPDATE\n{update_clause}"
+    else:
+        query = query.replace("INSERT INTO", "INSERT IGNORE INTO", 1)
+    db.cursor.execute(query)
+    # ON DUPLICATE KEY UPDATE의 rowcount는 신규 1, 변경 2, 동일 0으로 집계됨
+    affected = db.cursor.rowcount
+    if table in _POST_MERGE:
+        column, post_query = _POST_MERGE[table]
+        db.cursor.execute(post_query)
+        print(f"  - {column} 채움: {db.cursor.rowcount}행")
+    db.commit()
+    db.cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {staging}")
+
+    elapsed = time.perf_counter() - started_at
+    rate = loaded / elapsed if elapsed > 0 else 0
+    print(f"✅ {table}: {loaded}행 적재 (경고 {warnings}건), 병합 영향 {affected}행, "
+          f"{elapsed:.1f}초, {rate:,.0f} rows/s")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV → MySQL 대량 적재 (LOAD DATA LOCAL INFILE + 병합)")
+    parser.add_argument("--target", choices=sorted(DB_TARGETS), default="dev", help="대상 DB (기본: dev)")
+    parser.add_argument("--tables", nargs="+", choices=list(LOAD_TABLES), default=list(LOAD_TABLES),
+                        help="적재할 테이블 (기본: 전체, 나열한 순서대로 적재)")
+    args = parser.parse_args()
+
+    db = DB_TARGETS[args.target]()
+    mysql_config = db._mysql_config()
+    mysql_config["allow_local_infile"] = True
+    if not db.connect_with_ssh(mysql_config=mysql_config):
+        print(f"❌ [{args.target}] DB 연결 실패")
+        return False
 
-    # 데이터 로더 생성
-    loader = MySQLDataLoader(**config)
-    
     try:
-        # 데이터베이스 연결
-        if not loader.connect():
-            print("데이터베이스 연결 실패")
-            return
-        
-        # 모든 테이블 구조 확인
-        tables = ['artists', 'concerts', 'songs', 'setlists', 'concert_info', 
-                 'concert_setlists', 'cultures', 'schedule', 'setlist_songs']
-        
-        print("=== 테이블 구조 확인 ===")
-        for table in tables:
-            print(f"\n{table} 테이블:")
-            loader.get_table_structure(table)
-        
-        # 실제 데이터 로드는 테이블 구조 확인 후 주석 해제
-        # loader.load_all_data(csv_base_path)
-        
+        for table in args.tables:
+            csv_path = db.get_data_path(LOAD_TABLES[table])
+            print(f"📁 {LOAD_TABLES[table]} → {table}")
+            if not load_table(db, table, csv_path):
+                return False
+        return True
     except Exception as e:
-        print(f"오류 발생: {e}")
+        print(f"❌ 적재 실패: {e}")
+        db.rollback()
+        return False
     finally:
-        loader.disconnect()
+        db.disconnect()
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(0 if main() else 1)
@@ -4,40 +4,66 @@ CSV 파일을 MySQL 데이터베이스에 업서트하는 스크립트
 """
 import pandas as pd
 import os
-import re
 import sys
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from lib.db_utils import get_db_manager, get_dev_db_manager, get_stage_db_manager
+from lib.db_utils import get_db_manager, get_dev_db_manager, get_stage_db_manager, db_session
 from lib.config import Config
+from lib.artist_resolver import ArtistResolver, name_key
 
-def upsert_table(table_name, csv_file, db=None):
-    """CSV 파일을 MySQL 테이블에 업서트"""
+def _csv_path(csv_file):
+    return os.path.join(Config.DATA_DIR, "main_output", csv_file)
+
+
+def read_table_csv(csv_file):
+    """CSV를 백업 후 DataFrame으로 읽기 (파일이 없으면 None)"""
+    csv_path = _csv_path(csv_file)
+    if not os.path.exists(csv_path):
+        print(f"⚠️ {csv_file} 파일이 없습니다.")
+        return None
+
+    backup_path = Config.create_backup(csv_file)
+    if backup_path:
+        print(f"🗄️ 백업 생성: {backup_path}")
+
+    return pd.read_csv(csv_path, encoding='utf-8').fillna('')
+
+
+def upsert_table(table_name, csv_file, db=None, df=None, sync_ids=True):
+    """CSV 파일을 MySQL 테이블에 업서트
+
+    df를 주면 CSV를 다시 읽지 않고 그대로 사용 (여러 DB에 같은 CSV를 적용할 때)
+    sync_ids=False면 concerts의 DB id를 CSV에 다시 쓰지 않음
+    """
     if db is None:
         db = get_db_manager()
 
-    if not db.connect_with_ssh():
+    # 이미 연결된 db(db_session/pooled_db)를 받으면 그대로 쓰고 연결 종료는 호출자에게 맡김
+    owns_connection = db.connection is None
+    if owns_connection:
+        if not db.connect_with_ssh():
+            return False
+    elif not db.ensure_connected():
+        # 앞 단계가 오래 걸려 MySQL 연결만 끊긴 경우 터널은 두고 재연결
         return False
 
-
     try:
-        csv_path = db.get_data_path(csv_file)
-        if not os.path.exists(csv_path):
-            print(f"⚠️ {csv_file} 파일이 없습니다.")
-            return True
-
-        backup_path = Config.create_backup(csv_file)
-        if backup_path:
-            print(f"🗄️ 백업 생성: {backup_path}")
-
-        df = pd.read_csv(csv_path, encoding='utf-8').fillna('')
+        if df is None:
+            df = read_table_csv(csv_file)
+            if df is None:
+                return True
+        else:
+            df = df.copy()
         print(f"📁 {csv_file} → {table_name} ({len(df)}개 레코드)")
         
         if table_name == "artists":
             return _upsert_artists(db, df)
         elif table_name == "concerts":
-            return _upsert_concerts(db, df)
+            return _upsert_concerts(db, df, sync_ids=sync_ids)
         elif table_name == "songs":
             return _upsert_songs(db, df)
         elif table_name == "setlists":
@@ -52,60 +78,155 @@ def upsert_table(table_name, csv_file, db=None):
             
     except Exception as e:
         print(f"❌ 업서트 실패: {e}")
+        db.rollback()
         return False
     finally:
-        db.disconnect()
-
-def _find_existing_artist(db, artist_name: str):
-    """이름 기반 아티스트 중복 검사 (공백·대소문자 무시). 있으면 (id, artist명) 반환, 없으면 None."""
-    # 1차: 완전 일치
-    db.cursor.execute("SELECT id, artist FROM artists WHERE artist = %s", (artist_name,))
-    row = db.cursor.fetchone()
-    if row:
-        return row
-
-    # 2차: 한국어명(괄호 안) 매칭
-    korean_match = re.search(r'\(([가-힣\s]+)\)', artist_name)
-    if korean_match:
-        korean_name = korean_match.group(1).strip()
-        korean_name_no_space = korean_name.replace(' ', '')
-
-        db.cursor.execute(
-            "SELECT id, artist FROM artists WHERE artist LIKE %s LIMIT 1",
-            (f'%({korean_name})%',)
+        if owns_connection:
+            db.disconnect()
+
+# 내용 비교(diff 모드)에서 제외하는 컬럼 (업서트할 때마다 바뀌는 값)
+_DIFF_IGNORED_COLUMNS = {"created_at", "updated_at"}
+
+
+def _hash_value(value) -> str:
+    """MySQL CAST(col AS CHAR)와 같은 문자열로 정규화 (다르게 나와도 '변경'으로만 처리되어 안전)"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+def _row_hash(values) -> str:
+    return hashlib.md5('\x1f'.join(_hash_value(v) for v in values).encode('utf-8')).hexdigest()
+
+
+class _BulkUpserter:
+    """여러 행을 모아 multi-row INSERT ... ON DUPLICATE KEY UPDATE 한 번으로 전송 (배치마다 커밋)
+
+    diff 모드(Config.UPSERT_DIFF)면 대상 테이블의 행별 내용 해시를 한 번에 읽어
+    신규 행과 실제로 바뀐 행만 전송하고, dry-run(Config.UPSERT_DRY_RUN)이면 집계만 함
+    update_only=True면 이미 있는 행만 키 기준 UPDATE ... WHERE (executemany)로 갱신
+    (INSERT 경로를 타지 않으므로 NOT NULL 컬럼 누락이나 다른 UNIQUE 키 충돌로 엉뚱한 행을 덮어쓰지 않음)
+    """
+
+    def __init__(self, db, table, columns, update_columns, batch_size=None, max_batch_bytes=None,
+                 key_columns=("id",), diff=None, dry_run=None, update_only=False):
+        self.db = db
+        self.table = table
+        self.columns = columns
+        self.batch_size = max(1, batch_size or Config.UPSERT_BATCH_SIZE)
+        self.max_batch_bytes = max_batch_bytes or Config.UPSERT_MAX_BATCH_BYTES
+        self.row_placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        self.update_clause = ",\n".join(f"{col} = VALUES({col})" for col in update_columns)
+        self.update_only = update_only
+        self.update_indexes = [columns.index(col) for col in update_columns]
+        self.update_query = (
+            f"UPDATE {table} SET {', '.join(f'{col} = %s' for col in update_columns)} "
+            f"WHERE {' AND '.join(f'{col} = %s' for col in key_columns)}"
         )
-        row = db.cursor.fetchone()
-        if row:
-            return row
-
-        if korean_name_no_space != korean_name:
-            db.cursor.execute(
-                "SELECT id, artist FROM artists WHERE REPLACE(artist, ' ', '') LIKE %s LIMIT 1",
-                (f'%({korean_name_no_space})%',)
-            )
-            row = db.cursor.fetchone()
-            if row:
-                return row
-
-    # 3차: 영문명만 공백·대소문자 무시
-    english_part = artist_name.split('(')[0].strip()
-    if english_part:
-        english_normalized = english_part.replace(' ', '').lower()
-        db.cursor.execute(
-            "SELECT id, artist FROM artists "
-            "WHERE LOWER(REPLACE(TRIM(SUBSTRING_INDEX(artist, '(', 1)), ' ', '')) = %s LIMIT 1",
-            (english_normalized,)
+        self.dry_run = Config.UPSERT_DRY_RUN if dry_run is None else dry_run
+        self.diff = (Config.UPSERT_DIFF if diff is None else diff) or self.dry_run
+
+        self.pending = []
+        self.pending_bytes = 0
+        self.rows = 0
+        self.batches = 0
+        self.started_at = time.perf_counter()
+
+        self.key_indexes = [columns.index(col) for col in key_columns]
+        # ON DUPLICATE KEY UPDATE로 실제 덮어쓰는 컬럼만 비교
+        self.hash_indexes = [columns.index(col) for col in update_columns
+                             if col not in _DIFF_IGNORED_COLUMNS]
+        self.existing_hashes = self._load_hashes(key_columns) if self.diff else {}
+        self.inserted = 0
+        self.changed = 0
+        self.unchanged = 0
+
+    def _load_hashes(self, key_columns):
+        """대상 테이블의 키 → 내용 해시 (큰 컬럼도 해시만 받아오도록 MySQL에서 계산)"""
+        hashed = ", ".join(
+            f"COALESCE(CAST({self.columns[i]} AS CHAR), '')" for i in self.hash_indexes
         )
-        row = db.cursor.fetchone()
-        if row:
-            return row
-
-    return None
+        self.db.cursor.execute(
+            f"SELECT {', '.join(key_columns)}, MD5(CONCAT_WS(CHAR(31 USING utf8mb4), {hashed})) "
+            f"FROM {self.table}"
+        )
+        return {tuple(row[:-1]): row[-1] for row in self.db.cursor.fetchall()}
+
+    def add(self, params):
+        if self.diff:
+            key = tuple(params[i] for i in self.key_indexes)
+            existing_hash = self.existing_hashes.get(key) if None not in key else None
+            if existing_hash is None:
+                self.inserted += 1
+            elif existing_hash == _row_hash(params[i] for i in self.hash_indexes):
+                self.unchanged += 1
+                return
+            else:
+                self.changed += 1
+            if self.dry_run:
+                return
+
+        self.pending.append(params)
+        self.pending_bytes += sum(len(v) for v in params if isinstance(v, str))
+        if len(self.pending) >= self.batch_size or self.pending_bytes >= self.max_batch_bytes:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        if self.update_only:
+            self.db.cursor.executemany(self.update_query, [
+                [params[i] for i in self.update_indexes] + [params[i] for i in self.key_indexes]
+                for params in self.pending
+            ])
+            self.db.commit()
+            self.rows += len(self.pending)
+            self.batches += 1
+            self.pending = []
+            self.pending_bytes = 0
+            return
+        query = (
+            f"INSERT INTO {self.table} ({', '.join(self.columns)})\n"
+            f"VALUES {', '.join([self.row_placeholder] * len(self.pending))}\n"
+            f"ON DUPLICATE KEY UPDATE\n{self.update_clause}"
+        )
+        self.db.cursor.execute(query, [value for params in self.pending for value in params])
+        self.db.commit()
+        self.rows += len(self.pending)
+        self.batches += 1
+        self.pending = []
+        self.pending_bytes = 0
+
+    def finish(self) -> str:
+        """남은 행 전송 후 처리량 요약 문자열 반환"""
+        self.flush()
+        elapsed = time.perf_counter() - self.started_at
+        rate = self.rows / elapsed if elapsed > 0 else 0
+        summary = f"{self.rows}행, 배치 {self.batches}회, {elapsed:.1f}초, {rate:,.0f} rows/s"
+        if self.diff:
+            diff_summary = f"신규 {self.inserted}, 변경 {self.changed}, 동일 {self.unchanged}"
+            summary = f"[dry-run] {diff_summary}" if self.dry_run else f"{diff_summary} → {summary}"
+        return summary
 
 
 def _upsert_artists(db, df):
     """아티스트 테이블 업서트"""
     matched = 0
+    upserter = _BulkUpserter(
+        db, "artists",
+        ["id", "artist", "category", "detail", "instagram_url", "twitter_url", "keywords",
+         "img_url", "debut_date", "created_at", "updated_at"],
+        ["category", "detail", "instagram_url", "twitter_url", "keywords", "img_url", "debut_date", "updated_at"]
+    )
+    resolver = ArtistResolver(db)
+    # 아직 전송하지 않은 신규 아티스트 (id 미정), 같은 아티스트가 다시 나오면 그때만 flush 후 id 반영
+    pending_new = ArtistResolver()
     for _, row in df.iterrows():
         artist_name = row.get('artist', '')
         artist_id = _parse_id(row.get('id', ''))
@@ -113,28 +234,22 @@ def _upsert_artists(db, df):
 
         # id 없는 아티스트는 이름 기반으로 기존 row를 찾아 그 id로 업서트 (신규 중복 생성 방지)
         if not artist_id:
-            existing = _find_existing_artist(db, artist_name)
+            existing = resolver.resolve(artist_name)
+            if not existing and pending_new.resolve(artist_name):
+                upserter.flush()
+                resolver.refresh()
+                pending_new = ArtistResolver()
+                existing = resolver.resolve(artist_name)
             if existing:
                 existing_id, existing_name = existing
                 if existing_name != artist_name:
                     print(f"  → 기존 아티스트 매칭: '{artist_name}' = DB의 '{existing_name}' (id={existing_id})")
                 artist_id = existing_id
                 matched += 1
+            else:
+                pending_new.add(None, artist_name)
 
-        query = """
-        INSERT INTO artists (id, artist, category, detail, instagram_url, twitter_url, keywords, img_url, debut_date, created_at, updated_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-        category = VALUES(category),
-        detail = VALUES(detail),
-        instagram_url = VALUES(instagram_url),
-        twitter_url = VALUES(twitter_url),
-        keywords = VALUES(keywords),
-        img_url = VALUES(img_url),
-        debut_date = VALUES(debut_date),
-        updated_at = VALUES(updated_at)
-        """
-        params = (
+        upserter.add((
             artist_id,
             artist_name,
             row.get('category', ''),
@@ -146,93 +261,148 @@ def _upsert_artists(db, df):
             row.get('debut_date', ''),
             current_time,
             current_time
-        )
-        db.cursor.execute(query, params)
+        ))
 
-    db.commit()
-    print(f"✅ artists 테이블 업데이트 완료 (기존 아티스트 매칭: {matched}개)")
+    summary = upserter.finish()
+    print(f"✅ artists 테이블 업데이트 완료 (기존 아티스트 매칭: {matched}개, {summary})")
     return True
 
-def _get_or_create_artist_id(db, artist_name):
-    if not artist_name:
-        return None
-    query = "SELECT id FROM artists WHERE artist = %s"
-    db.cursor.execute(query, (artist_name,))
-    result = db.cursor.fetchone()
-    if result:
-        return result[0]
-
-    insert_query = "INSERT INTO artists (artist) VALUES (%s)"
-    db.cursor.execute(insert_query, (artist_name,))
-    db.commit()
-    return db.cursor.lastrowid
-
-def _get_concert_id_by_title(db, concert_title):
-    if not concert_title:
-        return None
-    query = "SELECT id FROM concerts WHERE title = %s"
-    db.cursor.execute(query, (concert_title,))
-    result = db.cursor.fetchone()
-    return result[0] if result else None
+def _load_artist_ids(db, artist_names):
+    """artist명 → id 맵 구성 (CSV에 나온 이름만)
+
+    artists 전체를 한 번 읽어 정확히 같은 이름은 메모리에서 찾고, 나머지는 배치마다
+    WHERE artist IN (...) 한 번으로 조회해 컬럼 콜레이션(대소문자/후행 공백 무시 등) 매칭을 유지
+    그래도 없는 아티스트는 multi-row INSERT로 한꺼번에 추가하고 한 번만 커밋
+    """
+    db.cursor.execute("SELECT id, artist FROM artists ORDER BY id")
+    known = {}
+    for artist_id, artist_name in db.cursor.fetchall():
+        known.setdefault(artist_name, artist_id)
+
+    artist_ids = {}
+    missing = []
+    for name in dict.fromkeys(artist_names):
+        if not name or (isinstance(name, float) and pd.isna(name)):
+            continue
+        if name in known:
+            artist_ids[name] = known[name]
+        else:
+            missing.append(name)
+    if not missing:
+        return artist_ids
+
+    def lookup(names):
+        # IN 결과는 콜레이션 기준으로 돌아오므로 name_key로 요청한 이름에 다시 연결 (같은 키는 id가 작은 쪽)
+        found = {}
+        for i in range(0, len(names), Config.UPSERT_BATCH_SIZE):
+            chunk = names[i:i + Config.UPSERT_BATCH_SIZE]
+            db.cursor.execute(
+                f"SELECT id, artist FROM artists WHERE artist IN ({', '.join(['%s'] * len(chunk))}) ORDER BY id",
+                chunk
+            )
+            for artist_id, artist_name in db.cursor.fetchall():
+                found.setdefault(name_key(artist_name), artist_id)
+        return found
+
+    found = lookup(missing)
+    # 콜레이션상 같은 이름끼리는 처음 나온 이름 하나만 추가
+    new_by_key = {}
+    for name in missing:
+        if name_key(name) not in found:
+            new_by_key.setdefault(name_key(name), name)
+    new_names = list(new_by_key.values())
+
+    if new_names and not Config.UPSERT_DRY_RUN:
+        for i in range(0, len(new_names), Config.UPSERT_BATCH_SIZE):
+            chunk = new_names[i:i + Config.UPSERT_BATCH_SIZE]
+            db.cursor.execute(
+                f"INSERT INTO artists (artist) VALUES {', '.join(['(%s)'] * len(chunk))}", chunk
+            )
+        db.commit()
+        found.update(lookup(new_names))
+
+    for name in missing:
+        artist_id = found.get(name_key(name))
+        if artist_id:
+            artist_ids[name] = artist_id
+
+    if new_names:
+        prefix = "[dry-run] 신규 아티스트 {}명 추가 예정" if Config.UPSERT_DRY_RUN else "신규 아티스트 {}명 추가"
+        print(f"  - {prefix.format(len(new_names))}")
+    return artist_ids
 
 def _parse_id(raw):
     val = str(raw).strip()
     return int(float(val)) if val not in ('', 'nan', 'None') else None
 
-def _upsert_concerts(db, df):
+def _upsert_concerts(db, df, sync_ids=True):
     """콘서트 테이블 업서트 및 ID 동기화"""
     try:
         # Step 1: Upsert data to the database
         print("  - Upserting concert data to MySQL...")
+        artist_ids = _load_artist_ids(db, df['artist'].tolist() if 'artist' in df.columns else [])
+
+        # 기존 콘서트를 한 번에 읽어 (artist_id, start_date) → id 맵 구성
+        # id → code도 같이 보관해 마지막 id 동기화에 재사용 (이번 실행에서 바뀐 code만 덮어씀)
+        db.cursor.execute("SELECT id, artist_id, start_date, code FROM concerts ORDER BY id")
+        concert_by_key = {}
+        code_by_id = {}
+        for existing_id, artist_id, start_date, existing_code in db.cursor.fetchall():
+            code_by_id[existing_id] = existing_code
+            if artist_id and start_date:
+                concert_by_key.setdefault((artist_id, str(start_date)), existing_id)
+        preloaded_max_id = max(code_by_id, default=0)
+
+        # artist_id + start_date로 찾은 기존 콘서트는 id 기준 UPDATE로 덮어씀 (code가 다른 경우도 매칭)
+        updater = _BulkUpserter(
+            db, "concerts",
+            ["id", "code", "title", "artist", "venue", "end_date", "status", "poster",
+             "introduction", "label", "ticket_site", "ticket_url"],
+            ["code", "title", "artist", "venue", "end_date", "status", "poster",
+             "introduction", "label", "ticket_site", "ticket_url"],
+            update_only=True
+        )
+        inserter = _BulkUpserter(
+            db, "concerts",
+            ["id", "code", "title", "artist", "venue", "start_date", "end_date", "status", "poster",
+             "artist_id", "introduction", "label", "ticket_site", "ticket_url"],
+            ["title", "artist", "venue", "start_date", "end_date", "status", "poster",
+             "artist_id", "introduction", "label", "ticket_site", "ticket_url"]
+        )
+        # 아직 전송하지 않은 id 없는 신규 콘서트 키 (같은 공연이 CSV에 다시 나오면 그때만 flush)
+        pending_keys = set()
+
         for _, row in df.iterrows():
             artist_name = row.get('artist', '')
-            artist_id = _get_or_create_artist_id(db, artist_name)
+            artist_id = artist_ids.get(artist_name)
             concert_id = _parse_id(row.get('id', ''))
             code = row.get('code', '')
             start_date = row.get('start_date', '')
+            key = (artist_id, str(start_date)) if artist_id and start_date else None
 
-            # artist_id + start_date로 기존 콘서트 조회 (code가 다른 경우도 매칭)
-            if artist_id and start_date:
+            if key in pending_keys:
+                inserter.flush()
                 db.cursor.execute(
-                    "SELECT id FROM concerts WHERE artist_id = %s AND start_date = %s LIMIT 1",
-                    (artist_id, start_date)
+                    "SELECT id FROM concerts WHERE artist_id = %s AND start_date = %s ORDER BY id LIMIT 1", key
                 )
-                existing = db.cursor.fetchone()
-                if existing and existing[0] != concert_id:
-                    existing_id = existing[0]
-                    db.cursor.execute("""
-                        UPDATE concerts SET
-                            code = %s, title = %s, artist = %s, venue = %s, end_date = %s,
-                            status = %s, poster = %s, introduction = %s,
-                            label = %s, ticket_site = %s, ticket_url = %s
-                        WHERE id = %s
-                    """, (
-                        code, row.get('title', ''), artist_name, row.get('venue', ''),
-                        row.get('end_date', ''), row.get('status', ''),
-                        row.get('poster', ''), row.get('introduction', ''),
-                        row.get('label', ''), row.get('ticket_site', ''),
-                        row.get('ticket_url', ''), existing_id
-                    ))
-                    continue
-
-            query = """
-            INSERT INTO concerts (id, code, title, artist, venue, start_date, end_date, status, poster, artist_id, introduction, label, ticket_site, ticket_url)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-            title = VALUES(title),
-            artist = VALUES(artist),
-            venue = VALUES(venue),
-            start_date = VALUES(start_date),
-            end_date = VALUES(end_date),
-            status = VALUES(status),
-            poster = VALUES(poster),
-            artist_id = VALUES(artist_id),
-            introduction = VALUES(introduction),
-            label = VALUES(label),
-            ticket_site = VALUES(ticket_site),
-            ticket_url = VALUES(ticket_url)
-            """
-            db.cursor.execute(query, (
+                found = db.cursor.fetchone()
+                if found:
+                    concert_by_key[key] = found[0]
+                pending_keys.clear()
+
+            existing_id = concert_by_key.get(key) if key else None
+            if existing_id and existing_id != concert_id:
+                updater.add((
+                    existing_id, code, row.get('title', ''), artist_name, row.get('venue', ''),
+                    row.get('end_date', ''), row.get('status', ''),
+                    row.get('poster', ''), row.get('introduction', ''),
+                    row.get('label', ''), row.get('ticket_site', ''),
+                    row.get('ticket_url', '')
+                ))
+                code_by_id[existing_id] = code
+                continue
+
+            inserter.add((
                 concert_id,
                 code,
                 row.get('title', ''),
@@ -248,33 +418,44 @@ def _upsert_concerts(db, df):
                 row.get('ticket_site', ''),
                 row.get('ticket_url', '')
             ))
-        
-        db.commit()
-        print(f"  ✅ concerts 테이블 업데이트 완료")
+            if concert_id:
+                # 이미 있는 id면 ON DUPLICATE KEY UPDATE가 code를 바꾸지 않으므로 새 행만 반영
+                code_by_id.setdefault(concert_id, code)
+                if key:
+                    concert_by_key.setdefault(key, concert_id)
+            elif key:
+                pending_keys.add(key)
+
+        update_summary = updater.finish()
+        insert_summary = inserter.finish()
+        print(f"  ✅ concerts 테이블 업데이트 완료 (기존 매칭 {update_summary} / 업서트 {insert_summary})")
 
         # Step 2: Sync back IDs to the local CSV file
+        if Config.UPSERT_DRY_RUN or not sync_ids:
+            return True
         print("  - Syncing back concert IDs to local CSV file...")
         
-        codes = df['code'].dropna().unique().tolist()
-        if not codes:
-            print("  ℹ️ No codes found in the dataframe to sync.")
-            return True
+        # id 없이 INSERT된 행만 PK 범위로 읽어 맵에 추가
+        db.cursor.execute("SELECT id, code FROM concerts WHERE id > %s ORDER BY id", (preloaded_max_id,))
+        for concert_id, code in db.cursor.fetchall():
+            code_by_id[concert_id] = code
+
+        # 기존과 같이 code가 겹치면 id가 가장 큰(마지막) 행 사용
+        code_to_id_map = {}
+        for concert_id in sorted(code_by_id):
+            code_to_id_map[code_by_id[concert_id]] = concert_id
 
-        query_format = ','.join(['%s'] * len(codes))
-        db.cursor.execute(f"SELECT id, code FROM concerts WHERE code IN ({query_format})", codes)
-        
-        code_to_id_map = {code: id for id, code in db.cursor.fetchall()}
-        
         if not code_to_id_map:
             print("  ⚠️ Could not find any matching IDs in the database for the given codes.")
             return True
 
         df['id'] = pd.to_numeric(df['code'].map(code_to_id_map), errors='coerce').fillna(0).astype(int)
+        synced = int((df['id'] > 0).sum())
         
-        csv_path = db.get_data_path('concerts.csv')
+        csv_path = _csv_path('concerts.csv')
         df.to_csv(csv_path, index=False, encoding='utf-8-sig')
         
-        print(f"  ✅ Successfully synced back {len(code_to_id_map)} IDs to concerts.csv.")
+        print(f"  ✅ Successfully synced back {synced} IDs to concerts.csv.")
         return True
 
     except Exception as e:
@@ -284,6 +465,11 @@ def _upsert_concerts(db, df):
 
 def _upsert_schedule(db, df):
     """스케줄 테이블 업서트"""
+    upserter = _BulkUpserter(
+        db, "schedule",
+        ["id", "concert_id", "category", "scheduled_at", "type", "updated_at"],
+        ["category", "scheduled_at", "type", "updated_at"]
+    )
     for _, row in df.iterrows():
         concert_id = row.get('concert_id')
         if pd.isna(concert_id) or int(concert_id) == 0:
@@ -296,32 +482,41 @@ def _upsert_schedule(db, df):
             print(f"⚠️ 잘못된 날짜 형식, 스킵: {row.get('scheduled_at')}")
             continue
 
-        schedule_id = _parse_id(row.get('id', ''))
-
-        query = """
-        INSERT INTO schedule (id, concert_id, category, scheduled_at, type, updated_at)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-            category = VALUES(category),
-            scheduled_at = VALUES(scheduled_at),
-            type = VALUES(type),
-            updated_at = VALUES(updated_at)
-        """
-
-        db.cursor.execute(query, (
-            schedule_id,
+        upserter.add((
+            _parse_id(row.get('id', '')),
             int(concert_id),
             row.get('category', ''),
             scheduled_at_value,
             row.get('type', ''),
             row.get('updated_at')
         ))
-    db.commit()
-    print(f"✅ schedule 테이블 업데이트 완료")
+
+    summary = upserter.finish()
+    print(f"✅ schedule 테이블 업데이트 완료 ({summary})")
     return True
 
 def _upsert_concert_genres(db, df):
     """콘서트-장르 테이블 업서트"""
+    # concert_title → 현재 DB의 concert_id (DB마다 ID가 다를 수 있음)
+    # 정확히 같은 제목은 메모리에서, 나머지는 WHERE title = %s 로 조회해 컬럼 콜레이션 매칭 유지
+    db.cursor.execute("SELECT id, title FROM concerts ORDER BY id")
+    concert_ids = {}
+    for concert_id, title in db.cursor.fetchall():
+        concert_ids.setdefault(title, concert_id)
+
+    def find_concert_id(title):
+        if title not in concert_ids:
+            db.cursor.execute("SELECT id FROM concerts WHERE title = %s ORDER BY id LIMIT 1", (title,))
+            found = db.cursor.fetchone()
+            concert_ids[title] = found[0] if found else None
+        return concert_ids[title]
+
+    upserter = _BulkUpserter(
+        db, "concert_genres",
+        ["concert_id", "genre_id", "concert_title", "name"],
+        ["concert_title", "name"],
+        key_columns=("concert_id", "genre_id")
+    )
     skipped = 0
     for _, row in df.iterrows():
         concert_title = row.get('concert_title', '')
@@ -334,40 +529,27 @@ def _upsert_concert_genres(db, df):
             skipped += 1
             continue
 
-        # concert_title로 현재 DB의 concert_id 조회 (DB마다 ID가 다를 수 있음)
-        concert_id = _get_concert_id_by_title(db, concert_title)
+        concert_id = find_concert_id(concert_title) if concert_title else None
         if not concert_id:
             print(f"⚠️ concerts 테이블에서 찾을 수 없음, 스킵: {concert_title}")
             skipped += 1
             continue
 
-        query = """
-        INSERT INTO concert_genres (concert_id, genre_id, concert_title, name)
-        VALUES (%s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-        concert_title = VALUES(concert_title),
-        name = VALUES(name)
-        """
-        db.cursor.execute(query, (concert_id, genre_id, concert_title, row.get('name', '')))
-
-    db.commit()
-    print(f"✅ concert_genres 테이블 업데이트 완료 (스킵: {skipped}개)")
+        upserter.add((concert_id, genre_id, concert_title, row.get('name', '')))
+
+    summary = upserter.finish()
+    print(f"✅ concert_genres 테이블 업데이트 완료 (스킵: {skipped}개, {summary})")
     return True
 
 def _upsert_songs(db, df):
     """곡 테이블 업서트"""
+    upserter = _BulkUpserter(
+        db, "songs",
+        ["id", "title", "artist", "lyrics", "translation", "pronunciation"],
+        ["title", "artist", "lyrics", "translation", "pronunciation"]
+    )
     for _, row in df.iterrows():
-        query = """
-        INSERT INTO songs (id, title, artist, lyrics, translation, pronunciation)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-        title = VALUES(title),
-        artist = VALUES(artist),
-        lyrics = VALUES(lyrics),
-        translation = VALUES(translation),
-        pronunciation = VALUES(pronunciation)
-        """
-        db.cursor.execute(query, (
+        upserter.add((
             _parse_id(row.get('id', '')),
             row.get('title', ''),
             row.get('artist', ''),
@@ -375,30 +557,28 @@ def _upsert_songs(db, df):
             row.get('translation', ''),
             row.get('pronunciation', '')
         ))
-    
-    db.commit()
-    print(f"✅ songs 테이블 업데이트 완료")
+
+    summary = upserter.finish()
+    print(f"✅ songs 테이블 업데이트 완료 ({summary})")
     return True
 
 def _upsert_setlists(db, df):
     """세트리스트 테이블 업서트"""
+    upserter = _BulkUpserter(
+        db, "setlist_songs",
+        ["id", "song_order", "title", "artist"],
+        ["title", "artist"]
+    )
     for _, row in df.iterrows():
-        query = """
-        INSERT INTO setlist_songs (id, song_order, title, artist)
-        VALUES (%s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-        title = VALUES(title),
-        artist = VALUES(artist)
-        """
-        db.cursor.execute(query, (
+        upserter.add((
             _parse_id(row.get('id', '')),
             row.get('song_order', 0),
             row.get('title', ''),
             row.get('artist', '')
         ))
-    
-    db.commit()
-    print(f"✅ setlists songs 테이블 업데이트 완료")
+
+    summary = upserter.finish()
+    print(f"✅ setlists songs 테이블 업데이트 완료 ({summary})")
     return True
 
 ALL_TABLES = [
@@ -454,16 +634,103 @@ def main():
     if choice in ("2", "4"):
         targets.append(("프로덕션", get_db_manager))
 
-    for label, db_factory in targets:
-        print(f"\n🚀 [{label}] CSV → MySQL 업서트 시작")
+    return upsert_targets(targets, tables)
+
+
+def _upsert_target(label, db_factory, tables, frames, sync_ids, local_port=None):
+    """한 대상 DB에 선택한 테이블을 순서대로 업서트, 실패한 테이블명(성공이면 None) 반환"""
+    print(f"\n🚀 [{label}] CSV → MySQL 업서트 시작")
+
+    def open_db():
+        # 대상 DB마다 자기 터널을 열고 모든 테이블이 공유 (동시에 도는 워커끼리 로컬 포트가 겹치지 않게 지정)
+        db = db_factory()
+        if local_port:
+            db.local_port = local_port
+        return db
+
+    with db_session(open_db) as db:
+        if db is None:
+            print(f"❌ [{label}] DB 연결 실패")
+            return "DB 연결"
         for table_name, csv_file in tables:
-            if not upsert_table(table_name, csv_file, db=db_factory()):
+            if frames[csv_file] is None:
+                continue
+            if not upsert_table(table_name, csv_file, db=db, df=frames[csv_file], sync_ids=sync_ids):
                 print(f"❌ [{label}] {table_name} 업서트 실패")
-                return False
-        print(f"✅ [{label}] 모든 테이블 업서트 완료!")
+                return table_name
+    print(f"✅ [{label}] 모든 테이블 업서트 완료!")
+    return None
 
-    return True
+
+def _run_concurrently(jobs, frames, tables, results):
+    """(label, db_factory, sync_ids) 목록을 DB마다 워커 하나로 동시에 업서트하고 results에 기록"""
+    # dev/stage처럼 기본 로컬 포트가 같은 대상은 다음 빈 포트로 옮겨 각자 터널을 엶
+    used_ports = set()
+    ports = []
+    for _, db_factory, _ in jobs:
+        port = db_factory().local_port
+        while port in used_ports:
+            port += 1
+        used_ports.add(port)
+        ports.append(port)
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {
+            executor.submit(_upsert_target, label, db_factory, tables, frames,
+                            sync_ids=sync_ids, local_port=port): label
+            for (label, db_factory, sync_ids), port in zip(jobs, ports)
+        }
+        for future in as_completed(futures):
+            label = futures[future]
+            try:
+                results[label] = future.result()
+            except Exception as e:
+                print(f"❌ [{label}] 업서트 중 오류: {e}")
+                results[label] = str(e)
+
+
+def upsert_targets(targets, tables):
+    """CSV는 한 번만 읽고 선택한 DB에 업서트 (DB마다 워커 하나, 각자 터널)
+
+    프로덕션 외 대상(dev/stage)은 동시에 실행하고, 프로덕션은 그 대상들이 모두 성공한 뒤에만 실행
+    (기존처럼 앞 단계가 실패하면 프로덕션은 건드리지 않음)
+    concerts.csv의 id 동기화는 마지막 대상(프로덕션 포함 시 프로덕션) 한 곳 기준으로만 수행
+    """
+    frames = {csv_file: read_table_csv(csv_file) for _, csv_file in tables}
+
+    jobs = [(label, db_factory, i == len(targets) - 1) for i, (label, db_factory) in enumerate(targets)]
+    staging_jobs = [job for job in jobs if job[1] is not get_db_manager]
+    prod_jobs = [job for job in jobs if job[1] is get_db_manager]
+
+    started_at = time.perf_counter()
+    results = {}
+    if staging_jobs:
+        _run_concurrently(staging_jobs, frames, tables, results)
+    if prod_jobs:
+        if all(results.get(label) is None for label, _, _ in staging_jobs):
+            _run_concurrently(prod_jobs, frames, tables, results)
+        else:
+            print("\n⛔ 앞 단계 대상이 실패해 프로덕션 업서트를 건너뜁니다.")
+            for label, _, _ in prod_jobs:
+                results[label] = "앞 단계 실패로 건너뜀"
+
+    print(f"\n📊 대상별 결과 ({time.perf_counter() - started_at:.1f}초)")
+    for label, _ in targets:
+        failed = results.get(label)
+        print(f"  {'✅' if failed is None else '❌'} {label}" + (f" - 실패: {failed}" if failed else ""))
+    return all(results.get(label) is None for label, _ in targets)
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="CSV 파일을 MySQL에 업서트합니다.")
+    parser.add_argument("--diff", action="store_true",
+                        help="DB의 행별 내용 해시와 비교해 신규/변경 행만 전송")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="DB에 쓰지 않고 신규/변경/동일 행 수만 출력 (--diff 포함)")
+    args = parser.parse_args()
+    Config.UPSERT_DIFF = args.diff or Config.UPSERT_DIFF
+    Config.UPSERT_DRY_RUN = args.dry_run or Config.UPSERT_DRY_RUN
+
     main()
@@ -39,6 +39,8 @@ def main():
         print()
         print("  # 발음 변환만")
         print("  python3 tools/lyrics/translate_lyrics.py data/main_output/songs.csv pronunciation")
+        print()
+        print("중단된 경우 같은 명령으로 다시 실행하면 <CSV>.translation.journal 에 남은 결과를 반영하고 이어서 처리합니다.")
         sys.exit(1)
     
     csv_path = sys.argv[1]